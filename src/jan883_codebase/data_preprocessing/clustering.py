@@ -0,0 +1,233 @@
+"""
+Scalable KMeans diagnostics for the elbow, silhouette and intercluster views.
+
+kmeans_sweep fits one model per k in parallel (MiniBatchKMeans once the data is
+large) and scores each with a sampled silhouette. The fitted models are returned so
+that every view reuses them instead of refitting:
+
+    models, results_df = kmeans_sweep(X, k_range=(2, 12))
+    plot_elbow(results_df)
+    plot_silhouette(X, models[6])
+    plot_intercluster(X, models[6])
+
+Silhouettes are O(n²), so they are computed on a sample stratified by cluster;
+sklearn's silhouette_samples already works through the distance matrix in chunks,
+which keeps memory bounded for the sample itself.
+"""
+
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_samples
+from yellowbrick.cluster import InterclusterDistance, SilhouetteVisualizer
+from yellowbrick.utils.kneed import KneeLocator
+
+from .execution import parallel_context
+
+MINIBATCH_THRESHOLD = 20_000
+
+
+def make_kmeans(n_clusters, n_samples, random_state=None, batch_size=4096):
+    """
+    Returns KMeans for small data and MiniBatchKMeans above MINIBATCH_THRESHOLD rows.
+
+    Parameters:
+    - n_clusters: int. Number of clusters.
+    - n_samples: int. Number of rows the model will be fitted on.
+    - random_state: int, default=None. Random state of the model.
+    - batch_size: int, default=4096. Mini-batch size for MiniBatchKMeans.
+    """
+    if n_samples > MINIBATCH_THRESHOLD:
+        return MiniBatchKMeans(
+            n_clusters=n_clusters,
+            batch_size=batch_size,
+            n_init=3,
+            random_state=random_state,
+        )
+    return KMeans(n_clusters=n_clusters, random_state=random_state)
+
+
+def stratified_sample(labels, sample_size=10_000, random_state=None):
+    """
+    Returns row indices of a sample that keeps each cluster's share of the data.
+
+    Parameters:
+    - labels: array-like. Cluster label of every row.
+    - sample_size: int, default=10_000. Approximate number of rows to draw.
+    - random_state: int, default=None. Seed of the draw.
+
+    Returns:
+    - indices: ndarray of int. Sorted row indices (all rows when there are fewer than sample_size).
+    """
+    labels = np.asarray(labels)
+    if len(labels) <= sample_size:
+        return np.arange(len(labels))
+
+    rng = np.random.default_rng(random_state)
+    indices = []
+    for label in np.unique(labels):
+        rows = np.flatnonzero(labels == label)
+        # At least two rows per cluster so every cluster gets a silhouette
+        n = max(2, int(round(sample_size * len(rows) / len(labels))))
+        indices.append(rng.choice(rows, size=min(n, len(rows)), replace=False))
+    return np.sort(np.concatenate(indices))
+
+
+def sampled_silhouette(X, labels, sample_size=10_000, random_state=None):
+    """
+    Mean silhouette coefficient estimated on a cluster-stratified sample.
+
+    Parameters:
+    - X: DataFrame or array-like. The clustered data.
+    - labels: array-like. Cluster label of every row.
+    - sample_size: int, default=10_000. Number of rows used for the estimate.
+    - random_state: int, default=None. Seed of the sample.
+
+    Returns:
+    - score: float. The estimated silhouette score (nan with a single cluster).
+    """
+    labels = np.asarray(labels)
+    if len(np.unique(labels)) < 2:
+        return np.nan
+    rows = stratified_sample(labels, sample_size, random_state)
+    X_sample = X.iloc[rows] if hasattr(X, "iloc") else X[rows]
+    return float(silhouette_samples(X_sample, labels[rows]).mean())
+
+
+def _fit_one_k(X, k, random_state, sample_size, batch_size):
+    start = time.time()
+    model = make_kmeans(k, X.shape[0], random_state, batch_size).fit(X)
+    fit_time = time.time() - start
+    silhouette = sampled_silhouette(X, model.labels_, sample_size, random_state)
+    return model, {
+        "k": k,
+        "Inertia": model.inertia_,
+        "Silhouette": silhouette,
+        "Fit Time": fit_time,
+    }
+
+
+def kmeans_sweep(
+    X,
+    k_range=(4, 12),
+    random_state=None,
+    sample_size=10_000,
+    batch_size=4096,
+    n_jobs=-1,
+):
+    """
+    Fits one KMeans/MiniBatchKMeans per k in parallel and scores every fit.
+
+    Parameters:
+    - X: DataFrame or array-like. The scaled data to cluster.
+    - k_range: tuple, default=(4, 12). Range of k to try (end exclusive, as in yellowbrick).
+    - random_state: int, default=None. Random state of the models and silhouette samples.
+    - sample_size: int, default=10_000. Rows used for each silhouette estimate.
+    - batch_size: int, default=4096. Mini-batch size used above MINIBATCH_THRESHOLD rows.
+    - n_jobs: int, default=-1. Number of k fitted in parallel, unless an execution backend is configured.
+
+    Returns:
+    - models: dict. k -> fitted model, ready for plot_silhouette / plot_intercluster.
+    - results_df: DataFrame. Inertia, sampled silhouette and fit time per k.
+    """
+    ks = range(*k_range)
+    with parallel_context(n_jobs) as backend_n_jobs:
+        outputs = Parallel(n_jobs=backend_n_jobs)(
+            delayed(_fit_one_k)(X, k, random_state, sample_size, batch_size) for k in ks
+        )
+
+    models = {k: model for k, (model, _) in zip(ks, outputs)}
+    results_df = pd.DataFrame([record for _, record in outputs])
+    return models, results_df
+
+
+def find_elbow(results_df):
+    """
+    Returns the k at the elbow of the inertia curve, or None when there is no clear elbow.
+    """
+    locator = KneeLocator(
+        results_df["k"].tolist(),
+        results_df["Inertia"].tolist(),
+        curve_nature="convex",
+        curve_direction="decreasing",
+    )
+    return None if locator.knee is None else int(locator.knee)
+
+
+def plot_elbow(results_df, ax=None):
+    """
+    Plots inertia against k with the detected elbow, plus the sampled silhouette.
+
+    Parameters:
+    - results_df: DataFrame. The results_df returned by kmeans_sweep.
+    - ax: matplotlib Axes, default=None. Axes to draw on, a new figure is created when None.
+
+    Returns:
+    - ax: matplotlib Axes.
+    """
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8, 5))
+
+    ax.plot(results_df["k"], results_df["Inertia"], marker="D", color="#274562")
+    ax.set_xlabel("k")
+    ax.set_ylabel("Inertia", color="#274562")
+
+    silhouette_ax = ax.twinx()
+    silhouette_ax.plot(
+        results_df["k"],
+        results_df["Silhouette"],
+        marker=".",
+        linestyle=":",
+        color="#9a276b",
+    )
+    silhouette_ax.set_ylabel("Silhouette (sampled)", color="#9a276b")
+
+    elbow = find_elbow(results_df)
+    if elbow is not None:
+        ax.axvline(elbow, color="grey", linestyle="--", label=f"elbow at k = {elbow}")
+        ax.legend(loc="best")
+    ax.set_title("Elbow Method for KMeans Clustering")
+    return ax
+
+
+def plot_silhouette(
+    X, model, sample_size=10_000, random_state=None, colors="yellowbrick"
+):
+    """
+    Silhouette plot of a fitted model, drawn on a cluster-stratified sample.
+
+    Parameters:
+    - X: DataFrame or array-like. The data the model was fitted on.
+    - model: fitted KMeans/MiniBatchKMeans, e.g. from kmeans_sweep.
+    - sample_size: int, default=10_000. Number of rows drawn in the plot.
+    - random_state: int, default=None. Seed of the sample.
+    - colors: str or list, default='yellowbrick'. Yellowbrick color palette.
+
+    Returns:
+    - visualizer: SilhouetteVisualizer.
+    """
+    rows = stratified_sample(model.labels_, sample_size, random_state)
+    X_sample = X.iloc[rows] if hasattr(X, "iloc") else X[rows]
+    visualizer = SilhouetteVisualizer(model, colors=colors, is_fitted=True)
+    visualizer.fit(X_sample)
+    return visualizer
+
+
+def plot_intercluster(X, model):
+    """
+    Intercluster distance map of a fitted model, without refitting it.
+
+    Parameters:
+    - X: DataFrame or array-like. The data the model was fitted on.
+    - model: fitted KMeans/MiniBatchKMeans, e.g. from kmeans_sweep.
+
+    Returns:
+    - visualizer: InterclusterDistance.
+    """
+    visualizer = InterclusterDistance(model, is_fitted=True)
+    visualizer.fit(X)
+    return visualizer
@@ -77,11 +77,22 @@ from yellowbrick.cluster import SilhouetteVisualizer
 from yellowbrick.model_selection import learning_curve
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.model_selection import StratifiedKFold, KFold
-from yellowbrick.model_selection import rfecv
 from sklearn.impute import SimpleImputer
 import pickle
 from scipy.stats import pearsonr
-
+from sklearn.base import clone
+from joblib import Parallel, delayed
+
+from .execution import parallel_context
+from .clustering import (
+    kmeans_sweep,
+    make_kmeans,
+    plot_elbow,
+    plot_intercluster,
+    plot_silhouette,
+)
+from .feature_selection import fast_rfecv, plot_rfecv_curve
+from .splitting import split_indices, take_rows
 
 warnings.filterwarnings("ignore")
 
@@ -120,8 +131,8 @@ I conducted a correlation analysis to understand relationships between variables
 - <code>create_qq_plots(df, reference_col)</code> Create QQ plots of the features in a dataframe.<BR>
 - <code>volcano_plot(df, reference_col)</code> Create Volcano Plot with P-values.<BR>
 - <code>X, y = define_X_y(df, target)</code> Define X and y..<BR>
-- <code>X_train, X_test, y_train, y_test = train_test_split_custom(X, y, test_size=0.2, random_state=42)</code> Split train, test.<BR>
-- <code>X_train, X_val, X_test, y_train, y_val, y_test = train_val_test_split(X, y, val_size=0.2, test_size=0.2, random_state=42)</code> Split train, val, test.<BR>
+- <code>X_train, X_test, y_train, y_test = train_test_split_custom(X, y, test_size=0.2, random_state=42, stratify=None, groups=None)</code> Split train, test.<BR>
+- <code>X_train, X_val, X_test, y_train, y_val, y_test = train_val_test_split(X, y, val_size=0.2, test_size=0.2, random_state=42, stratify=None, groups=None)</code> Split train, val, test. Index-based, see data_preprocessing.splitting for split_indices / RowView.<BR>
 - <code>X_train_res, y_train_res = oversample_SMOTE(X_train, y_train, sampling_strategy="auto", k_neighbors=5, random_state=42)</code> Oversample minority class.<BR>
 - <code>scaled_X = scale_df(X, scaler='standard')</code> only scales X, does not scale X_test or X_val. <BR>
 - <code>scaled_X_train, scaled_X_test = scale_X_train_X_test(X_train, X_test, scaler="standard", save_scaler=False)</code> Standard, MinMax and Robust Scaler. X_train uses fit_transform, X_test uses transform.<BR>
@@ -140,14 +151,17 @@ def model():
 <b>Custom Functions</b><br>
 - <code>feature_importance_plot(model, X, y)</code> Plot Feature Importance using a single model.<BR>
 - <code>plot_learning_curve(X, y, problem_type='classification', scoring='accuracy')</code> Plot Learning Curve using a single model, classification or regression. <BR>
-- <code>plot_rfecv(X, y, problem_type='classification', cv_splits=5, scoring='f1_weighted')</code> Recursive Feature Elimination using a single model - RandomForestClassifer/Regressor.<BR>
+- <code>plot_rfecv(X, y, problem_type='classification', cv_splits=5, scoring='f1_weighted', step=1, surrogate=None)</code> Recursive Feature Elimination using a single model - RandomForestClassifer/Regressor. Use a fractional step (e.g. 0.1) and/or a cheap surrogate for wide data.<BR>
 - <code>evaluate_classification_model(model, X, y, cv=5)</code> Plot peformance metrics of single classification model.<BR>
 - <code>evaluate_regression_model(model, X, y)</code> Plot peformance metrics of single regression model.<BR>
 - <code>best_regression_models(X, y, test_size=0.2, random_state=None, scale_data=False)</code> Test Regression models.<BR>
 - <code>best_classification_models(X, y, test_size=0.2, random_state=None, scale_data=False)</code> Test Classification models.<BR>
-- <code>plot_elbow_method(scaled_df, k_range=(4, 12), random_state=None)</code> Plot Elbow Method to find optimal number of clusters.<BR>
-- <code>plot_intercluster_distance(X, n_clusters=6, random_state=None)</code> Plot Intercluster Distance to find optimal number of clusters.<BR>
-- <code>plot_silhouette_visualizer(X, n_clusters=4, random_state=42)</code> Plot Silhouette Visualizer to find optimal number of clusters.<br>
+- <code>best_classification_models(X, y, include_kan=True)</code> / <code>best_regression_models(X, y, include_kan=True)</code> Also test a KAN (machine_learning.kan_estimators.KANClassifier / KANRegressor, needs torch); compare throughput with <code>benchmark_throughput(classification_models(include_kan=True), X_train, y_train, X_test)</code> (machine_learning.kan_estimators).<BR>
+- <code>tuned_params = tune_models(X, y, problem_type='classification', n_trials=20, time_budget=None)</code> Successive-halving random search for every model, pass the result to best_*_models(tuned_params=...) (data_preprocessing.tuning).<BR>
+- <code>best_classification_models_incremental(path, target, chunksize=100_000)</code> / <code>best_regression_models_incremental(...)</code> Out-of-core model comparison streamed from CSV/Parquet (data_preprocessing.incremental).<BR>
+- <code>models, results_df = plot_elbow_method(scaled_df, k_range=(4, 12), random_state=None)</code> Plot Elbow Method to find optimal number of clusters, k fitted in parallel (MiniBatchKMeans on large data).<BR>
+- <code>plot_intercluster_distance(X, n_clusters=6, random_state=None, model=None)</code> Plot Intercluster Distance to find optimal number of clusters, pass model=models[k] to reuse a fit.<BR>
+- <code>plot_silhouette_visualizer(X, n_clusters=4, random_state=42, model=None, sample_size=10_000)</code> Plot Silhouette Visualizer on a stratified sample to find optimal number of clusters.<br>
 
 """
     html_message = f"""
@@ -712,18 +726,20 @@ def define_X_y(df, target):
     return X, y
 
 
-def train_val_test_split(X, y, val_size=0.2, test_size=0.2, random_state=42):
-    # Calculate intermediate size based on test_size
-    intermediate_size = 1 - test_size
-
-    # Calculate train_size from intermediate size and validation size
-    train_size = 1 - val_size / intermediate_size
-    X_train_val, X_test, y_train_val, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state
-    )
-    X_train, X_val, y_train, y_val = train_test_split(
-        X_train_val, y_train_val, train_size=train_size, random_state=random_state
+def train_val_test_split(
+    X, y, val_size=0.2, test_size=0.2, random_state=42, stratify=None, groups=None
+):
+    # Split the row indices only, then take each subset of X once
+    splits = split_indices(
+        X,
+        test_size=test_size,
+        val_size=val_size,
+        stratify=stratify,
+        groups=groups,
+        random_state=random_state,
     )
+    X_train, X_val, X_test = (take_rows(X, splits[s]) for s in ("train", "val", "test"))
+    y_train, y_val, y_test = (take_rows(y, splits[s]) for s in ("train", "val", "test"))
 
     print(f"✅ OUTPUT: X_train, X_val, X_test, y_train, y_val, y_test")
     print(f"Train Set:  X_train, y_train - {X_train.shape}, {y_train.shape}")
@@ -732,7 +748,9 @@ def train_val_test_split(X, y, val_size=0.2, test_size=0.2, random_state=42):
     return X_train, X_val, X_test, y_train, y_val, y_test
 
 
-def train_test_split_custom(X, y, test_size=0.2, random_state=42):
+def train_test_split_custom(
+    X, y, test_size=0.2, random_state=42, stratify=None, groups=None
+):
     """
     Splits the data into training and testing sets.
 
@@ -741,13 +759,21 @@ def train_test_split_custom(X, y, test_size=0.2, random_state=42):
     y (pd.Series or np.ndarray): Target variable.
     test_size (float): Proportion of the data to be used as the test set.
     random_state (int): Seed used by the random number generator.
+    stratify (array-like): Labels to stratify on, e.g. y. Default is None.
+    groups (array-like): Group labels; a group never spans train and test. Default is None.
 
     Returns:
     X_train, X_test, y_train, y_test: Training and testing datasets.
     """
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state
+    splits = split_indices(
+        X,
+        test_size=test_size,
+        stratify=stratify,
+        groups=groups,
+        random_state=random_state,
     )
+    X_train, X_test = take_rows(X, splits["train"]), take_rows(X, splits["test"])
+    y_train, y_test = take_rows(y, splits["train"]), take_rows(y, splits["test"])
 
     print(f"✅ OUTPUT: X_train, X_test, y_train, y_test")
     print(f"Train Set:  X_train, y_train - {X_train.shape}, {y_train.shape}")
@@ -993,25 +1019,34 @@ def evaluate_classification_model(model, X, y, cv=5):
         "f1_score": make_scorer(f1_score, average="macro"),
     }
 
-    scores = cross_validate(model, X, y, cv=cv, scoring=scoring, n_jobs=-1)
+    with parallel_context(-1) as n_jobs:
+        scores = cross_validate(model, X, y, cv=cv, scoring=scoring, n_jobs=n_jobs)
 
-    # Compute means and standard deviations for each metric, and collect in a dictionary
-    mean_std_scores = {
-        metric: (np.mean(score_array), np.std(score_array))
-        for metric, score_array in scores.items()
-    }
+        # Compute means and standard deviations for each metric, and collect in a dictionary
+        mean_std_scores = {
+            metric: (np.mean(score_array), np.std(score_array))
+            for metric, score_array in scores.items()
+        }
 
-    # Create a DataFrame from the mean and std dictionary and display as HTML
-    scores_df = pd.DataFrame(mean_std_scores, index=["Mean", "Standard Deviation"]).T
-    display(HTML(scores_df.to_html()))
+        # Create a DataFrame from the mean and std dictionary and display as HTML
+        scores_df = pd.DataFrame(
+            mean_std_scores, index=["Mean", "Standard Deviation"]
+        ).T
+        display(HTML(scores_df.to_html()))
 
-    # Learning curve
-    train_sizes = np.linspace(0.1, 1.0, 5)
-    train_sizes, train_scores, test_scores = learning_curve(
-        model, X, y, cv=cv, train_sizes=train_sizes
-    )
-    train_scores_mean = np.mean(train_scores, axis=1)
-    test_scores_mean = np.mean(test_scores, axis=1)
+        # Learning curve
+        train_sizes = np.linspace(0.1, 1.0, 5)
+        train_sizes, train_scores, test_scores = learning_curve(
+            model, X, y, cv=cv, train_sizes=train_sizes, n_jobs=n_jobs
+        )
+        train_scores_mean = np.mean(train_scores, axis=1)
+        test_scores_mean = np.mean(test_scores, axis=1)
+
+        # Fit one model per ROC fold in parallel
+        folds = list(StratifiedKFold(n_splits=cv).split(X, y))
+        fold_models = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_on_rows)(clone(model), X, y, train) for train, _ in folds
+        )
 
     # Define the figure and subplots
     fig, axs = plt.subplots(1, 2, figsize=(14, 6))
@@ -1032,16 +1067,14 @@ def evaluate_classification_model(model, X, y, cv=5):
     axs[0].set_title("Learning curve")
 
     # ROC curve
-    cv = StratifiedKFold(n_splits=cv)
     mean_fpr = np.linspace(0, 1, 100)
     tprs = []
     aucs = []
 
     if is_multiclass:
         y_bin = label_binarize(y, classes=np.unique(y))
-        for i, (train, test) in enumerate(cv.split(X, y)):
-            model.fit(X.iloc[train], y.iloc[train])
-            y_score = model.predict_proba(X.iloc[test])
+        for (train, test), fold_model in zip(folds, fold_models):
+            y_score = fold_model.predict_proba(X.iloc[test])
 
             for class_idx in range(n_classes):
                 fpr, tpr, _ = roc_curve(y_bin[test, class_idx], y_score[:, class_idx])
@@ -1049,10 +1082,9 @@ def evaluate_classification_model(model, X, y, cv=5):
                 tprs[-1][0] = 0.0
                 aucs.append(auc(fpr, tpr))
     else:
-        for i, (train, test) in enumerate(cv.split(X, y)):
-            model.fit(X.iloc[train], y.iloc[train])
+        for (train, test), fold_model in zip(folds, fold_models):
             viz = RocCurveDisplay.from_estimator(
-                model,
+                fold_model,
                 X.iloc[test],
                 y.iloc[test],
             )
@@ -1126,6 +1158,10 @@ def feature_importance_plot(model, X, y):
     plt.show()
 
 
+def _fit_on_rows(model, X, y, rows):
+    return model.fit(X.iloc[rows], y.iloc[rows])
+
+
 # Permutation feature importance
 def feature_importance_plot(model, X, y):
     """
@@ -1224,27 +1260,56 @@ def evaluate_regression_model(model, X, y):
     plt.show()
 
 
-def best_regression_models(X, y, test_size=0.2, random_state=None, scale_data=False):
+def _fit_and_predict(model, step_name, X_train, X_test, y_train, scale_data):
     """
-    Tests multiple regression models from sklearn on the given dataset.
-
-    Parameters:
-    - X: DataFrame or array-like. The feature set.
-    - y: Series or array-like. The target variable.
-    - test_size: float, default=0.2. The proportion of the dataset to include in the test split.
-    - random_state: int, default=None. Random state for reproducibility.
-    - scale_data: bool, default=False. Whether to scale the data using StandardScaler.
+    Fits one model of the zoo (optionally behind a StandardScaler) and predicts X_test.
 
     Returns:
-    - results_df: DataFrame. A DataFrame containing the model name, R² score, MSE, RMSE, and MAE for each model.
+    - (y_pred, y_proba): y_proba is None when the model has no predict_proba.
     """
+    # Create a pipeline if scaling is requested
+    if scale_data:
+        model = Pipeline([("scaler", StandardScaler()), (step_name, model)])
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    y_proba = model.predict_proba(X_test) if hasattr(model, "predict_proba") else None
+    return y_pred, y_proba
 
-    # Split the data into training and testing sets
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state
-    )
 
-    # Define a list of regression models to test
+def _apply_tuned_params(models, tuned_params):
+    """
+    Sets the tuned hyperparameters on the models of the zoo, rejecting unknown model names.
+    """
+    if not tuned_params:
+        return
+    unknown = [name for name in tuned_params if name not in models]
+    if unknown:
+        raise ValueError(
+            f"tuned_params has unknown models {unknown}; valid names are {list(models)}."
+        )
+    for name, params in tuned_params.items():
+        models[name].set_params(**params)
+
+
+def _kan_estimators():
+    # The KAN estimators need torch, so they are only imported on request
+    try:
+        from ..machine_learning import kan_estimators
+    except ImportError:
+        from machine_learning import kan_estimators
+    return kan_estimators
+
+
+def regression_models(include_kan=False):
+    """
+    Returns a fresh dictionary of the regression models used by best_regression_models.
+
+    Parameters:
+    - include_kan: bool, default=False. Add a KANRegressor (machine_learning.kan_estimators, needs torch).
+
+    Returns:
+    - models: dict. Model name -> unfitted estimator instance.
+    """
     models = {
         "Linear Regression": LinearRegression(),
         "Ridge Regression": Ridge(),
@@ -1259,23 +1324,94 @@ def best_regression_models(X, y, test_size=0.2, random_state=None, scale_data=Fa
         "MLP Regressor": MLPRegressor(max_iter=1000),
         "Gaussian Process": GaussianProcessRegressor(),
     }
+    if include_kan:
+        models["KAN Regressor"] = _kan_estimators().KANRegressor()
+    return models
+
+
+def classification_models(include_kan=False):
+    """
+    Returns a fresh dictionary of the classification models used by best_classification_models.
+
+    Parameters:
+    - include_kan: bool, default=False. Add a KANClassifier (machine_learning.kan_estimators, needs torch).
+
+    Returns:
+    - models: dict. Model name -> unfitted estimator instance.
+    """
+    models = {
+        "Logistic Regression": LogisticRegression(),
+        "Decision Tree": DecisionTreeClassifier(),
+        "Random Forest": RandomForestClassifier(),
+        "Gradient Boosting": GradientBoostingClassifier(),
+        "AdaBoost": AdaBoostClassifier(),
+        "Support Vector Classifier": SVC(probability=True),
+        "K-Nearest Neighbors": KNeighborsClassifier(),
+        "MLP Classifier": MLPClassifier(max_iter=1000),
+        "Naive Bayes": GaussianNB(),
+    }
+    if include_kan:
+        models["KAN Classifier"] = _kan_estimators().KANClassifier()
+    return models
+
+
+def best_regression_models(
+    X,
+    y,
+    test_size=0.2,
+    random_state=None,
+    scale_data=False,
+    tuned_params=None,
+    include_kan=False,
+):
+    """
+    Tests multiple regression models from sklearn on the given dataset.
+
+    Parameters:
+    - X: DataFrame or array-like. The feature set.
+    - y: Series or array-like. The target variable.
+    - test_size: float, default=0.2. The proportion of the dataset to include in the test split.
+    - random_state: int, default=None. Random state for reproducibility.
+    - scale_data: bool, default=False. Whether to scale the data using StandardScaler.
+    - tuned_params: dict, default=None. Model name -> hyperparameters (e.g. the output of tune_models) applied before fitting.
+    - include_kan: bool, default=False. Also test a Kolmogorov-Arnold network (needs torch).
+
+    Returns:
+    - results_df: DataFrame. A DataFrame containing the model name, R² score, MSE, RMSE, and MAE for each model.
+    """
+
+    # Split the data into training and testing sets
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state
+    )
+
+    # Define a list of regression models to test
+    models = regression_models(include_kan=include_kan)
+    _apply_tuned_params(models, tuned_params)
 
     # DataFrame to store results
     results = []
 
-    # Loop over models and evaluate each one with a progress bar
-    for name, model in tqdm(
-        models.items(), desc="Testing Regression Models", colour="#9a276b"
-    ):
-        # Create a pipeline if scaling is requested
-        if scale_data:
-            pipeline = Pipeline([("scaler", StandardScaler()), ("regressor", model)])
-            pipeline.fit(X_train, y_train)
-            y_pred = pipeline.predict(X_test)
-        else:
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
+    # Fit the models in parallel on the configured execution backend
+    with parallel_context(1) as n_jobs:
+        predictions = Parallel(n_jobs=n_jobs, return_as="generator")(
+            delayed(_fit_and_predict)(
+                model, "regressor", X_train, X_test, y_train, scale_data
+            )
+            for model in models.values()
+        )
+
+        # Collect the predictions with a progress bar
+        predictions = list(
+            tqdm(
+                predictions,
+                total=len(models),
+                desc="Testing Regression Models",
+                colour="#9a276b",
+            )
+        )
 
+    for name, (y_pred, _) in zip(models, predictions):
         # Calculate metrics
         r2 = r2_score(y_test, y_pred)
         mse = mean_squared_error(y_test, y_pred)
@@ -1286,6 +1422,8 @@ def best_regression_models(X, y, test_size=0.2, random_state=None, scale_data=Fa
         results.append(
             {"Model": name, "R² Score": r2, "MSE": mse, "RMSE": rmse, "MAE": mae}
         )
+        if tuned_params is not None:
+            results[-1]["Tuned"] = name in tuned_params
 
     # Convert the results list to a DataFrame
     results_df = pd.DataFrame(results)
@@ -1297,7 +1435,13 @@ def best_regression_models(X, y, test_size=0.2, random_state=None, scale_data=Fa
 
 
 def best_classification_models(
-    X, y, test_size=0.2, random_state=None, scale_data=False
+    X,
+    y,
+    test_size=0.2,
+    random_state=None,
+    scale_data=False,
+    tuned_params=None,
+    include_kan=False,
 ):
     """
     Tests multiple classification models from sklearn on the given dataset.
@@ -1308,6 +1452,8 @@ def best_classification_models(
     - test_size: float, default=0.2. The proportion of the dataset to include in the test split.
     - random_state: int, default=None. Random state for reproducibility.
     - scale_data: bool, default=False. Whether to scale the data using StandardScaler.
+    - tuned_params: dict, default=None. Model name -> hyperparameters (e.g. the output of tune_models) applied before fitting.
+    - include_kan: bool, default=False. Also test a Kolmogorov-Arnold network (needs torch).
 
     Returns:
     - results_df: DataFrame. A DataFrame containing the model name, accuracy, precision, recall, F1 score, and ROC-AUC score for each model.
@@ -1319,17 +1465,8 @@ def best_classification_models(
     )
 
     # Define a list of classification models to test
-    models = {
-        "Logistic Regression": LogisticRegression(),
-        "Decision Tree": DecisionTreeClassifier(),
-        "Random Forest": RandomForestClassifier(),
-        "Gradient Boosting": GradientBoostingClassifier(),
-        "AdaBoost": AdaBoostClassifier(),
-        "Support Vector Classifier": SVC(probability=True),
-        "K-Nearest Neighbors": KNeighborsClassifier(),
-        "MLP Classifier": MLPClassifier(max_iter=1000),
-        "Naive Bayes": GaussianNB(),
-    }
+    models = classification_models(include_kan=include_kan)
+    _apply_tuned_params(models, tuned_params)
 
     # Determine if the target is binary or multiclass
     if len(pd.Series(y).unique()) > 2:
@@ -1342,27 +1479,26 @@ def best_classification_models(
     # DataFrame to store results
     results = []
 
-    # Loop over models and evaluate each one with a progress bar
-    for name, model in tqdm(
-        models.items(), desc="Testing Classification Models", colour="#9a276b"
-    ):
-        # Create a pipeline if scaling is requested
-        if scale_data:
-            pipeline = Pipeline([("scaler", StandardScaler()), ("classifier", model)])
-            pipeline.fit(X_train, y_train)
-            y_pred = pipeline.predict(X_test)
-            y_proba = (
-                pipeline.predict_proba(X_test)
-                if hasattr(pipeline, "predict_proba")
-                else None
+    # Fit the models in parallel on the configured execution backend
+    with parallel_context(1) as n_jobs:
+        predictions = Parallel(n_jobs=n_jobs, return_as="generator")(
+            delayed(_fit_and_predict)(
+                model, "classifier", X_train, X_test, y_train, scale_data
             )
-        else:
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            y_proba = (
-                model.predict_proba(X_test) if hasattr(model, "predict_proba") else None
+            for model in models.values()
+        )
+
+        # Collect the predictions with a progress bar
+        predictions = list(
+            tqdm(
+                predictions,
+                total=len(models),
+                desc="Testing Classification Models",
+                colour="#9a276b",
             )
+        )
 
+    for name, (y_pred, y_proba) in zip(models, predictions):
         # Calculate metrics
         accuracy = accuracy_score(y_test, y_pred)
         precision = precision_score(y_test, y_pred, average=average_type)
@@ -1395,6 +1531,8 @@ def best_classification_models(
                 "ROC-AUC": roc_auc,
             }
         )
+        if tuned_params is not None:
+            results[-1]["Tuned"] = name in tuned_params
 
     # Convert the results list to a DataFrame
     results_df = pd.DataFrame(results)
@@ -1409,28 +1547,30 @@ def plot_elbow_method(scaled_df, k_range=(4, 12), random_state=None):
     """
     Plots the elbow method to find the optimal number of clusters for KMeans clustering.
 
+    The k are fitted in parallel (MiniBatchKMeans on large data) and the fitted models are
+    returned, so they can be passed on to plot_intercluster_distance / plot_silhouette_visualizer.
+
     Args:
     scaled_df (pd.DataFrame or np.ndarray): The scaled dataframe or array to fit the KMeans model on.
     k_range (tuple): A tuple specifying the range of clusters to try (default is (4, 12)).
     random_state (int, optional): The seed used by the random number generator (default is None).
 
     Returns:
-    None: The function displays a plot showing the elbow method.
+    tuple: (models, results_df) - the fitted model per k and the inertia / sampled silhouette per k.
     """
-    # Instantiate the KMeans model
-    model = KMeans(random_state=random_state)
-
-    # Instantiate the KElbowVisualizer with the KMeans model and the specified range for k
-    visualizer = KElbowVisualizer(model, k=k_range)
-
-    # Fit the data to the visualizer
-    visualizer.fit(scaled_df)
+    # Fit one model per k and reuse the fits for the plot
+    models, results_df = kmeans_sweep(
+        scaled_df, k_range=k_range, random_state=random_state
+    )
 
     # Finalize and render the figure
-    visualizer.show()
+    plot_elbow(results_df)
+    plt.show()
+
+    return models, results_df
 
 
-def plot_intercluster_distance(X, n_clusters=6, random_state=None):
+def plot_intercluster_distance(X, n_clusters=6, random_state=None, model=None):
     """
     Plots the inter-cluster distances for KMeans clustering.
 
@@ -1438,18 +1578,16 @@ def plot_intercluster_distance(X, n_clusters=6, random_state=None):
     X (pd.DataFrame or np.ndarray): The data to fit the KMeans model on.
     n_clusters (int): The number of clusters to use in KMeans (default is 6).
     random_state (int, optional): The seed used by the random number generator (default is None).
+    model (KMeans, optional): An already fitted model (e.g. from plot_elbow_method), used instead of refitting (default is None).
 
     Returns:
     None: The function displays a plot showing the inter-cluster distances.
     """
-    # Instantiate the KMeans model with the specified number of clusters
-    model = KMeans(n_clusters=n_clusters, random_state=random_state)
+    # Fit a KMeans model (MiniBatchKMeans on large data) unless one was given
+    if model is None:
+        model = make_kmeans(n_clusters, X.shape[0], random_state).fit(X)
 
-    # Instantiate the InterclusterDistance visualizer with the KMeans model
-    visualizer = InterclusterDistance(model)
-
-    # Fit the data to the visualizer
-    visualizer.fit(X)
+    visualizer = plot_intercluster(X, model)
 
     # Finalize and render the figure
     visualizer.show()
@@ -1458,11 +1596,15 @@ def plot_intercluster_distance(X, n_clusters=6, random_state=None):
 # Example usage
 # plot_intercluster_distance(X, n_clusters=6, random_state=42)
 
-from sklearn.cluster import KMeans
-from yellowbrick.cluster import SilhouetteVisualizer
-
 
-def plot_silhouette_visualizer(X, n_clusters=4, random_state=42, colors="yellowbrick"):
+def plot_silhouette_visualizer(
+    X,
+    n_clusters=4,
+    random_state=42,
+    colors="yellowbrick",
+    model=None,
+    sample_size=10_000,
+):
     """
     Plots the silhouette visualizer for KMeans clustering.
 
@@ -1471,18 +1613,19 @@ def plot_silhouette_visualizer(X, n_clusters=4, random_state=42, colors="yellowb
     n_clusters (int): The number of clusters to use in KMeans (default is 10).
     random_state (int, optional): The seed used by the random number generator (default is 42).
     colors (str or list, optional): The color palette used by Yellowbrick to display the clusters (default is 'yellowbrick').
+    model (KMeans, optional): An already fitted model (e.g. from plot_elbow_method), used instead of refitting (default is None).
+    sample_size (int, optional): Silhouettes are computed on a cluster-stratified sample of this many rows (default is 10_000).
 
     Returns:
     None: The function displays a plot showing the silhouette scores for each cluster.
     """
-    # Instantiate the KMeans model with the specified number of clusters and random state
-    model = KMeans(n_clusters=n_clusters, random_state=random_state)
-
-    # Instantiate the SilhouetteVisualizer with the KMeans model and specified colors
-    visualizer = SilhouetteVisualizer(model, colors=colors)
+    # Fit a KMeans model (MiniBatchKMeans on large data) unless one was given
+    if model is None:
+        model = make_kmeans(n_clusters, X.shape[0], random_state).fit(X)
 
-    # Fit the data to the visualizer
-    visualizer.fit(X)
+    visualizer = plot_silhouette(
+        X, model, sample_size=sample_size, random_state=random_state, colors=colors
+    )
 
     # Finalize and render the figure
     visualizer.show()
@@ -1528,20 +1671,35 @@ def plot_learning_curve(X, y, problem_type="classification", scoring="accuracy")
 # plot_learning_curve(X, y, problem_type='regression', scoring='r2')
 
 
-def plot_rfecv(X, y, problem_type="classification", cv_splits=5, scoring="f1_weighted"):
+def plot_rfecv(
+    X,
+    y,
+    problem_type="classification",
+    cv_splits=5,
+    scoring="f1_weighted",
+    step=1,
+    surrogate=None,
+    n_confirm=5,
+):
     """
     Plots the Recursive Feature Elimination with Cross-Validation (RFECV) for a model
     based on the type of problem (classification or regression).
 
+    The folds are fitted in parallel (see set_execution_backend) and every step fits
+    the forest once, both to score the current features and to rank them.
+
     Args:
     X (pd.DataFrame or np.ndarray): The feature data to fit the model on.
     y (pd.Series or np.ndarray): The target variable.
     problem_type (str): The type of problem ('classification' or 'regression'). Default is 'classification'.
     cv_splits (int): Number of cross-validation splits. Default is 5.
     scoring (str): The scoring metric to use for RFECV. Default is 'f1_weighted' for classification.
+    step (int or float): Features removed per step, or the share of the remaining features when 0 < step < 1. Default is 1.
+    surrogate (estimator): Cheaper model used to rank the features; the forest then only confirms the n_confirm best feature counts. Default is None.
+    n_confirm (int): Number of feature counts confirmed with the forest when a surrogate is used. Default is 5.
 
     Returns:
-    None: The function displays an RFECV plot.
+    tuple: (support, ranking, results_df) as returned by fast_rfecv. The function also displays an RFECV plot.
     """
 
     # Choose the model and CV strategy based on the problem type
@@ -1560,14 +1718,23 @@ def plot_rfecv(X, y, problem_type="classification", cv_splits=5, scoring="f1_wei
             "Invalid problem_type. Choose either 'classification' or 'regression'."
         )
 
-    # Instantiate the RFECV visualizer with the chosen model, CV strategy, and scoring
-    visualizer = rfecv(model, X=X, y=y, cv=cv, scoring=scoring)
-
-    # Fit the visualizer
-    visualizer.fit(X, y)
+    support, ranking, results_df = fast_rfecv(
+        X,
+        y,
+        estimator=model,
+        problem_type=problem_type,
+        step=step,
+        cv=cv,
+        scoring=scoring,
+        surrogate=surrogate,
+        n_confirm=n_confirm,
+    )
 
     # Finalize and render the figure
-    visualizer.show()
+    plot_rfecv_curve(results_df, title=f"RFECV for {type(model).__name__}")
+    plt.show()
+
+    return support, ranking, results_df
 
 
 # Example usage
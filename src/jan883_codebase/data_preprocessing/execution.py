@@ -0,0 +1,146 @@
+"""
+Pluggable joblib execution backend shared by the model-selection functions.
+
+Every entry point (best_classification_models, best_regression_models,
+evaluate_classification_model, plot_rfecv, tune_model, ...) runs its parallel work
+inside parallel_context(), so model fits, CV folds and RFECV steps follow whatever
+backend was configured here:
+
+- "loky" (default), "threading" or "multiprocessing": the local machine.
+- "dask": a dask.distributed cluster. Pass the scheduler address of a cluster
+  spanning several machines, or n_workers to start a LocalCluster of worker
+  processes (handy for testing the distributed path on one box).
+- "ray": a Ray cluster, started with ray.init(address=address).
+
+Example:
+    set_execution_backend("dask", address="tcp://10.0.0.5:8786")
+    best_classification_models(X, y)
+    shutdown_execution_backend()
+"""
+
+from contextlib import contextmanager
+
+import joblib
+
+_LOCAL_BACKENDS = ("loky", "threading", "multiprocessing")
+
+_state = {"backend": None, "n_jobs": None, "client": None, "cluster": None}
+
+
+def set_execution_backend(backend="loky", n_jobs=-1, address=None, n_workers=None):
+    """
+    Selects the joblib backend used by all model-selection entry points.
+
+    Parameters:
+    - backend: str, default="loky". One of 'loky', 'threading', 'multiprocessing', 'dask' or 'ray'.
+    - n_jobs: int, default=-1. Number of parallel jobs (-1 uses every worker the backend offers).
+    - address: str, default=None. Scheduler address for 'dask' or cluster address for 'ray'.
+    - n_workers: int, default=None. For 'dask' without an address, start a LocalCluster with this many worker processes.
+
+    Returns:
+    - client: The dask Client when backend='dask', otherwise None.
+    """
+    shutdown_execution_backend()
+
+    if backend == "dask":
+        try:
+            from dask.distributed import Client, LocalCluster
+        except ImportError as e:
+            raise ImportError(
+                "The 'dask' backend requires dask[distributed]: pip install 'dask[distributed]'"
+            ) from e
+        if address is not None:
+            _state["client"] = Client(address)
+        else:
+            _state["cluster"] = LocalCluster(
+                n_workers=n_workers or 2, threads_per_worker=1, processes=True
+            )
+            _state["client"] = Client(_state["cluster"])
+    elif backend == "ray":
+        try:
+            import ray
+            from ray.util.joblib import register_ray
+        except ImportError as e:
+            raise ImportError(
+                "The 'ray' backend requires ray: pip install 'ray[default]'"
+            ) from e
+        ray.init(address=address, ignore_reinit_error=True)
+        register_ray()
+    elif backend not in _LOCAL_BACKENDS:
+        raise ValueError(
+            f"Invalid backend '{backend}'. Choose one of {_LOCAL_BACKENDS + ('dask', 'ray')}."
+        )
+
+    _state["backend"] = backend
+    _state["n_jobs"] = n_jobs
+    print(f"✅ Execution backend: {backend} (n_jobs={n_jobs})")
+    return _state["client"]
+
+
+def shutdown_execution_backend():
+    """
+    Closes any cluster connection and falls back to the functions' local defaults.
+    """
+    if _state["client"] is not None:
+        _state["client"].close()
+    if _state["cluster"] is not None:
+        _state["cluster"].close()
+    if _state["backend"] == "ray":
+        import ray
+
+        ray.shutdown()
+    _state.update(backend=None, n_jobs=None, client=None, cluster=None)
+
+
+def get_execution_backend():
+    """
+    Returns the configured backend name, or None when the local defaults are in use.
+    """
+    return _state["backend"]
+
+
+def get_n_jobs(default=None):
+    """
+    Returns the configured n_jobs, or the caller's own default when no backend was set.
+
+    Parameters:
+    - default: int, default=None. The n_jobs the calling function used before backends existed.
+    """
+    return default if _state["backend"] is None else _state["n_jobs"]
+
+
+@contextmanager
+def parallel_context(n_jobs=None):
+    """
+    Runs the enclosed joblib work (including sklearn's internal n_jobs) on the configured backend.
+
+    Parameters:
+    - n_jobs: int, default=None. The caller's default n_jobs, used when no backend was configured.
+
+    Yields:
+    - n_jobs: int. The n_jobs the caller should pass to Parallel / sklearn.
+    """
+    n_jobs = get_n_jobs(n_jobs)
+    if _state["backend"] is None:
+        yield n_jobs
+    else:
+        with joblib.parallel_config(backend=_state["backend"], n_jobs=n_jobs):
+            yield n_jobs
+
+
+@contextmanager
+def execution_backend(backend="loky", n_jobs=-1, address=None, n_workers=None):
+    """
+    Context manager version of set_execution_backend that shuts the backend down on exit.
+
+    Example:
+        with execution_backend("dask", n_workers=4):
+            plot_rfecv(X, y)
+    """
+    client = set_execution_backend(
+        backend, n_jobs=n_jobs, address=address, n_workers=n_workers
+    )
+    try:
+        yield client
+    finally:
+        shutdown_execution_backend()
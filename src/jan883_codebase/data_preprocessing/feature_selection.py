@@ -0,0 +1,267 @@
+"""
+Fast recursive feature elimination with cross-validation.
+
+yellowbrick's rfecv scores every feature count with a separate RFE, so a forest is
+refitted for every feature removed, for every count, in every fold. Here each fold
+walks one elimination path instead: a single fit per step is scored on the fold's
+test rows and its importances decide which features to drop next. Steps can be
+fractional (drop a share of the remaining features), folds run in parallel on the
+configured execution backend, and a cheap surrogate model can rank the features
+while the expensive model only confirms the most promising feature counts.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone, is_classifier
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import check_cv
+
+from .execution import parallel_context
+
+
+def _feature_importances(estimator):
+    """
+    Importances of a fitted estimator (or the last step of a pipeline).
+    """
+    if hasattr(estimator, "steps"):
+        estimator = estimator.steps[-1][1]
+    if hasattr(estimator, "feature_importances_"):
+        return np.asarray(estimator.feature_importances_)
+    if hasattr(estimator, "coef_"):
+        coef = np.abs(np.asarray(estimator.coef_))
+        return coef.sum(axis=0) if coef.ndim > 1 else coef
+    raise ValueError(
+        f"{type(estimator).__name__} exposes neither feature_importances_ nor coef_."
+    )
+
+
+def _n_to_remove(n_remaining, step, min_features_to_select):
+    # A fractional step drops that share of the remaining features, at least one
+    n = max(1, int(step * n_remaining)) if 0 < step < 1 else int(step)
+    return min(n, n_remaining - min_features_to_select)
+
+
+def feature_count_schedule(n_features, step=1, min_features_to_select=1):
+    """
+    Returns the feature counts visited by the elimination path, largest first.
+
+    Parameters:
+    - n_features: int. Number of features to start from.
+    - step: int or float, default=1. Features removed per step (int) or share of the remaining features (0 < step < 1).
+    - min_features_to_select: int, default=1. Smallest feature count to evaluate.
+    """
+    if step <= 0:
+        raise ValueError("step must be a positive int or a float in (0, 1).")
+    counts = [n_features]
+    while counts[-1] > min_features_to_select:
+        counts.append(
+            counts[-1] - _n_to_remove(counts[-1], step, min_features_to_select)
+        )
+    return counts
+
+
+def _subset_columns(X, columns):
+    return X.iloc[:, columns] if hasattr(X, "iloc") else X[:, columns]
+
+
+def _subset_rows(data, rows):
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
+
+
+def _elimination_path(estimator, X, y, train, test, scorer, counts):
+    """
+    Walks one fold down the feature counts. Each step fits once, scores the fit on the
+    test rows (when given) and uses its importances to pick the features to keep next.
+
+    Returns the score and the selected column indices at every count.
+    """
+    X_train, y_train = _subset_rows(X, train), _subset_rows(y, train)
+    features = np.arange(counts[0])
+    scores, subsets = [], []
+
+    for i, count in enumerate(counts):
+        model = clone(estimator).fit(_subset_columns(X_train, features), y_train)
+        subsets.append(features)
+        if test is None:
+            scores.append(np.nan)
+        else:
+            scores.append(
+                scorer(
+                    model,
+                    _subset_columns(_subset_rows(X, test), features),
+                    _subset_rows(y, test),
+                )
+            )
+        if i + 1 < len(counts):
+            # Keep the most important features, in their original column order
+            keep = np.argsort(_feature_importances(model))[::-1][: counts[i + 1]]
+            features = np.sort(features[keep])
+
+    return scores, subsets
+
+
+def _fit_and_score_subset(estimator, X, y, train, test, scorer, features):
+    model = clone(estimator).fit(
+        _subset_columns(_subset_rows(X, train), features), _subset_rows(y, train)
+    )
+    return scorer(
+        model, _subset_columns(_subset_rows(X, test), features), _subset_rows(y, test)
+    )
+
+
+def fast_rfecv(
+    X,
+    y,
+    estimator=None,
+    problem_type="classification",
+    step=1,
+    min_features_to_select=1,
+    cv=5,
+    scoring=None,
+    surrogate=None,
+    n_confirm=5,
+    n_jobs=-1,
+):
+    """
+    Recursive feature elimination with cross-validation, one fit per step and fold.
+
+    Parameters:
+    - X: DataFrame or array-like. The feature set.
+    - y: Series or array-like. The target variable.
+    - estimator: estimator, default=None. Model with feature_importances_ or coef_, defaults to a random forest.
+    - problem_type: str, default="classification". Either 'classification' or 'regression' (used for the default estimator and scoring).
+    - step: int or float, default=1. Features removed per step (int) or share of the remaining features (0 < step < 1).
+    - min_features_to_select: int, default=1. Smallest feature count to evaluate.
+    - cv: int or CV splitter, default=5. Cross-validation strategy.
+    - scoring: str, default=None. sklearn scorer name, defaults to 'f1_weighted' or 'r2'.
+    - surrogate: estimator, default=None. Cheaper model used to rank the features and draw the curve; the estimator then only re-scores the n_confirm best feature counts.
+    - n_confirm: int, default=5. Number of feature counts confirmed with the estimator when a surrogate is used.
+    - n_jobs: int, default=-1. Number of folds fitted in parallel, unless an execution backend is configured.
+
+    Returns:
+    - support: ndarray of bool. Mask of the selected features.
+    - ranking: ndarray of int. 1 for selected features, higher values were eliminated earlier.
+    - results_df: DataFrame. Mean and std CV score per feature count ('Confirmed Score' holds the estimator's scores when a surrogate is used).
+    """
+    if problem_type == "classification":
+        default_estimator, default_scoring = RandomForestClassifier(), "f1_weighted"
+    elif problem_type == "regression":
+        default_estimator, default_scoring = RandomForestRegressor(), "r2"
+    else:
+        raise ValueError(
+            "Invalid problem_type. Choose either 'classification' or 'regression'."
+        )
+    estimator = default_estimator if estimator is None else estimator
+    scorer = get_scorer(default_scoring if scoring in (None, "default") else scoring)
+    ranker = estimator if surrogate is None else surrogate
+
+    counts = feature_count_schedule(X.shape[1], step, min_features_to_select)
+    splits = list(check_cv(cv, y, classifier=is_classifier(estimator)).split(X, y))
+    all_rows = np.arange(X.shape[0])
+
+    with parallel_context(n_jobs) as backend_n_jobs:
+        # The folds and the final full-data path run side by side
+        paths = Parallel(n_jobs=backend_n_jobs)(
+            delayed(_elimination_path)(ranker, X, y, train, test, scorer, counts)
+            for train, test in splits + [(all_rows, None)]
+        )
+        fold_paths, (_, full_subsets) = paths[:-1], paths[-1]
+        fold_scores = np.array([scores for scores, _ in fold_paths])
+
+        results_df = pd.DataFrame(
+            {
+                "Features": counts,
+                "Mean Score": fold_scores.mean(axis=0),
+                "Std Score": fold_scores.std(axis=0),
+            }
+        )
+
+        if surrogate is None:
+            # On ties prefer the smaller feature set, like sklearn's RFECV
+            best = int(results_df["Mean Score"][::-1].idxmax())
+        else:
+            # Confirm the surrogate's best feature counts with the expensive model
+            candidates = (
+                results_df["Mean Score"].nlargest(min(n_confirm, len(counts))).index
+            )
+            tasks = [(c, f) for c in candidates for f in range(len(splits))]
+            confirmed = Parallel(n_jobs=backend_n_jobs)(
+                delayed(_fit_and_score_subset)(
+                    estimator,
+                    X,
+                    y,
+                    splits[f][0],
+                    splits[f][1],
+                    scorer,
+                    fold_paths[f][1][c],
+                )
+                for c, f in tasks
+            )
+            confirmed = pd.Series(confirmed).groupby([c for c, _ in tasks]).mean()
+            results_df["Confirmed Score"] = confirmed
+            best = int(confirmed.sort_index(ascending=False).idxmax())
+
+    n_selected = counts[best]
+    support = np.zeros(X.shape[1], dtype=bool)
+    support[full_subsets[best]] = True
+
+    # Rank 1 for the selection; features dropped earlier get higher ranks
+    ranking = np.ones(X.shape[1], dtype=int)
+    for i in range(best, 0, -1):
+        dropped = np.setdiff1d(full_subsets[i - 1], full_subsets[i])
+        ranking[dropped] = best - i + 2
+
+    print(f"✅ Optimal number of features: {n_selected}")
+    return support, ranking, results_df
+
+
+def plot_rfecv_curve(results_df, title="RFECV", ax=None):
+    """
+    Plots the cross-validated score against the number of features.
+
+    Parameters:
+    - results_df: DataFrame. The results_df returned by fast_rfecv.
+    - title: str, default="RFECV". Plot title.
+    - ax: matplotlib Axes, default=None. Axes to draw on, a new figure is created when None.
+
+    Returns:
+    - ax: matplotlib Axes.
+    """
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8, 5))
+
+    counts = results_df["Features"]
+    mean, std = results_df["Mean Score"], results_df["Std Score"]
+    label = "Surrogate Score" if "Confirmed Score" in results_df else "Score"
+    ax.plot(counts, mean, marker=".", color="#9a276b", label=label)
+    ax.fill_between(counts, mean - std, mean + std, color="#9a276b", alpha=0.2)
+
+    if "Confirmed Score" in results_df:
+        confirmed = results_df.dropna(subset=["Confirmed Score"])
+        ax.scatter(
+            confirmed["Features"],
+            confirmed["Confirmed Score"],
+            color="#274562",
+            zorder=3,
+            label="Confirmed Score",
+        )
+        best = confirmed.loc[confirmed["Confirmed Score"][::-1].idxmax()]
+        best_score = best["Confirmed Score"]
+    else:
+        best = results_df.loc[mean[::-1].idxmax()]
+        best_score = best["Mean Score"]
+
+    ax.axvline(
+        best["Features"],
+        color="grey",
+        linestyle="--",
+        label=f"n_features = {int(best['Features'])}, score = {best_score:.3f}",
+    )
+    ax.set_title(title)
+    ax.set_xlabel("Number of Features Selected")
+    ax.set_ylabel("Score")
+    ax.legend(loc="best")
+    return ax
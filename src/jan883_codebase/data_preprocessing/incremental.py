@@ -0,0 +1,436 @@
+"""
+Out-of-core versions of best_classification_models and best_regression_models.
+
+The data is streamed from CSV or Parquet files in chunks, so X and y never have to
+fit in memory. Every model in the zoo supports partial_fit and is trained chunk by
+chunk; rows are assigned to a held-out validation stream with a fixed per-chunk
+random draw, so each pass over the files sees exactly the same split. With a separate
+validation file, each pass only reads the files it needs. Metrics are
+accumulated over the validation stream and reported in the same comparison table as
+the in-memory functions.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import (
+    PassiveAggressiveClassifier,
+    PassiveAggressiveRegressor,
+    SGDClassifier,
+    SGDRegressor,
+)
+from sklearn.naive_bayes import BernoulliNB, GaussianNB
+from sklearn.neural_network import MLPClassifier, MLPRegressor
+from sklearn.preprocessing import StandardScaler
+from tqdm import tqdm
+
+N_AUC_BINS = 8000
+LOGIT_RANGE = 36.0
+
+
+def incremental_classification_models():
+    """
+    Returns a fresh dictionary of classification models that support partial_fit.
+    """
+    return {
+        "SGD Classifier": SGDClassifier(loss="log_loss"),
+        "Passive Aggressive": PassiveAggressiveClassifier(),
+        "Gaussian Naive Bayes": GaussianNB(),
+        "Bernoulli Naive Bayes": BernoulliNB(),
+        "MLP Classifier": MLPClassifier(),
+    }
+
+
+def incremental_regression_models():
+    """
+    Returns a fresh dictionary of regression models that support partial_fit.
+    """
+    return {
+        "SGD Regressor": SGDRegressor(),
+        "Passive Aggressive": PassiveAggressiveRegressor(),
+        "MLP Regressor": MLPRegressor(),
+    }
+
+
+def iter_chunks(path, chunksize=100_000, columns=None):
+    """
+    Streams a CSV or Parquet file (or a list of them) as DataFrame chunks.
+
+    Parameters:
+    - path: str or list of str. File path(s); files ending in .parquet/.pq are read with pyarrow.
+    - chunksize: int, default=100_000. Number of rows per chunk.
+    - columns: list of str, default=None. Only read these columns.
+
+    Yields:
+    - chunk: DataFrame.
+    """
+    paths = [path] if isinstance(path, str) else list(path)
+    for file_path in paths:
+        if file_path.endswith((".parquet", ".pq")):
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(file_path)
+            for batch in parquet_file.iter_batches(
+                batch_size=chunksize, columns=columns
+            ):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(file_path, chunksize=chunksize, usecols=columns)
+
+
+def _split_chunks(
+    path, target, chunksize, test_size, random_state, validation_path, validation=False
+):
+    """
+    Yields (X, y) per chunk of the training stream, or of the validation stream with validation=True.
+
+    With validation_path each stream only reads its own files. Otherwise both read the
+    training files and split every chunk with a validation mask that only depends on
+    (random_state, i), so repeated passes over the same files produce the same split.
+    """
+    if validation_path is not None and validation:
+        path = validation_path
+    seed = 0 if random_state is None else random_state
+    for i, chunk in enumerate(iter_chunks(path, chunksize)):
+        X = chunk.drop(columns=target).to_numpy(dtype=np.float64)
+        y = chunk[target].to_numpy()
+        if validation_path is not None:
+            yield X, y
+            continue
+        is_val = np.random.default_rng([seed, i]).random(len(chunk)) < test_size
+        keep = is_val if validation else ~is_val
+        yield X[keep], y[keep]
+
+
+def _prepare_pass(
+    path,
+    target,
+    chunksize,
+    test_size,
+    random_state,
+    validation_path,
+    scale_data,
+    collect_classes,
+):
+    """
+    First pass over the training stream: fits the scaler and collects the class labels.
+
+    Labels are also collected from the target column of a separate validation file, so
+    a class that only occurs there still gets a row in the confusion matrix.
+    """
+    scaler = StandardScaler() if scale_data else None
+    classes = set()
+    if not scale_data and not collect_classes:
+        return scaler, None
+
+    for X_train, y_train in tqdm(
+        _split_chunks(
+            path, target, chunksize, test_size, random_state, validation_path
+        ),
+        desc="Preparing Stream",
+        colour="#9a276b",
+    ):
+        if len(X_train) == 0:
+            continue
+        if scale_data:
+            scaler.partial_fit(X_train)
+        if collect_classes:
+            classes.update(np.unique(y_train).tolist())
+
+    if collect_classes and validation_path is not None:
+        for chunk in iter_chunks(validation_path, chunksize, columns=[target]):
+            classes.update(np.unique(chunk[target].to_numpy()).tolist())
+
+    return scaler, np.array(sorted(classes)) if collect_classes else None
+
+
+def _train(
+    models,
+    path,
+    target,
+    chunksize,
+    test_size,
+    random_state,
+    validation_path,
+    scaler,
+    n_epochs,
+    classes,
+):
+    for epoch in range(n_epochs):
+        for X_train, y_train in tqdm(
+            _split_chunks(
+                path, target, chunksize, test_size, random_state, validation_path
+            ),
+            desc=f"Training Epoch {epoch + 1}/{n_epochs}",
+            colour="#9a276b",
+        ):
+            if len(X_train) == 0:
+                continue
+            if scaler is not None:
+                X_train = scaler.transform(X_train)
+            for model in models.values():
+                if classes is None:
+                    model.partial_fit(X_train, y_train)
+                else:
+                    model.partial_fit(X_train, y_train, classes=classes)
+
+
+def _validation_stream(
+    path, target, chunksize, test_size, random_state, validation_path, scaler
+):
+    for X_val, y_val in _split_chunks(
+        path,
+        target,
+        chunksize,
+        test_size,
+        random_state,
+        validation_path,
+        validation=True,
+    ):
+        if len(X_val) == 0:
+            continue
+        if scaler is not None:
+            X_val = scaler.transform(X_val)
+        yield X_val, y_val
+
+
+def _score_bins(proba):
+    """
+    Maps probabilities to histogram bins that are uniform in log-odds, so confident
+    models (scores near 0 or 1) do not collapse into a handful of tied bins.
+    """
+    proba = np.clip(proba, 1e-16, 1 - 1e-16)
+    logits = np.clip(np.log(proba / (1 - proba)), -LOGIT_RANGE, LOGIT_RANGE)
+    bins = ((logits + LOGIT_RANGE) / (2 * LOGIT_RANGE) * N_AUC_BINS).astype(int)
+    return np.minimum(bins, N_AUC_BINS - 1)
+
+
+def _roc_auc_from_histograms(pos_hist, neg_hist):
+    """
+    ROC-AUC from score histograms of the positive and negative rows (ties count half).
+    """
+    n_pos, n_neg = pos_hist.sum(), neg_hist.sum()
+    if n_pos == 0 or n_neg == 0:
+        return np.nan
+    # Negatives scored strictly below each bin, plus half of the ties within the bin
+    neg_below = np.cumsum(neg_hist) - neg_hist
+    return float((pos_hist * (neg_below + neg_hist / 2)).sum() / (n_pos * n_neg))
+
+
+def _classification_metrics(confusion, pos_hists, neg_hists, average_type):
+    """
+    Accuracy, precision, recall and F1 from an accumulated confusion matrix (rows = true class).
+    """
+    true_positives = np.diag(confusion).astype(float)
+    support = confusion.sum(axis=1)
+    predicted = confusion.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.nan_to_num(true_positives / predicted)
+        recall = np.nan_to_num(true_positives / support)
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    aucs = np.array(
+        [_roc_auc_from_histograms(p, n) for p, n in zip(pos_hists, neg_hists)]
+    )
+    if average_type == "binary":
+        # The positive class is the last (largest) label, as in sklearn
+        precision, recall, f1, roc_auc = precision[-1], recall[-1], f1[-1], aucs[-1]
+    else:
+        weights = support / support.sum()
+        precision, recall, f1 = (
+            (precision * weights).sum(),
+            (recall * weights).sum(),
+            (f1 * weights).sum(),
+        )
+        roc_auc = np.nansum(aucs * weights)
+
+    return {
+        "Accuracy": true_positives.sum() / confusion.sum(),
+        "Precision": precision,
+        "Recall": recall,
+        "F1 Score": f1,
+        "ROC-AUC": roc_auc,
+    }
+
+
+def best_classification_models_incremental(
+    path,
+    target,
+    chunksize=100_000,
+    test_size=0.2,
+    random_state=None,
+    scale_data=True,
+    n_epochs=1,
+    classes=None,
+    validation_path=None,
+    models=None,
+):
+    """
+    Streams CSV/Parquet data through partial_fit classifiers and compares them on a held-out stream.
+
+    Parameters:
+    - path: str or list of str. Training file(s), CSV or Parquet.
+    - target: str. Name of the target column.
+    - chunksize: int, default=100_000. Number of rows read per chunk.
+    - test_size: float, default=0.2. Fraction of rows held out for validation (ignored with validation_path).
+    - random_state: int, default=None. Seed of the per-chunk validation split.
+    - scale_data: bool, default=True. Fit a StandardScaler with partial_fit in a first pass and scale every chunk.
+    - n_epochs: int, default=1. Number of passes over the training stream.
+    - classes: array-like, default=None. All class labels; collected in the first pass when not given.
+    - validation_path: str or list of str, default=None. Separate validation file(s) instead of a row split.
+    - models: dict, default=None. Model name -> estimator with partial_fit, defaults to incremental_classification_models().
+
+    Returns:
+    - results_df: DataFrame. Model name, accuracy, precision, recall, F1 score and ROC-AUC (from log-odds score histograms) for each model.
+    """
+    models = incremental_classification_models() if models is None else models
+    stream = (path, target, chunksize, test_size, random_state, validation_path)
+
+    scaler, found_classes = _prepare_pass(
+        *stream, scale_data=scale_data, collect_classes=classes is None
+    )
+    classes = np.asarray(classes) if classes is not None else found_classes
+    class_index = {label: i for i, label in enumerate(classes.tolist())}
+    n_classes = len(classes)
+
+    # Determine if the target is binary or multiclass
+    average_type = "weighted" if n_classes > 2 else "binary"
+
+    _train(models, *stream, scaler=scaler, n_epochs=n_epochs, classes=classes)
+
+    confusion = {
+        name: np.zeros((n_classes, n_classes), dtype=np.int64) for name in models
+    }
+    pos_hists = {name: np.zeros((n_classes, N_AUC_BINS)) for name in models}
+    neg_hists = {name: np.zeros((n_classes, N_AUC_BINS)) for name in models}
+    n_unknown = 0
+
+    for X_val, y_val in tqdm(
+        _validation_stream(*stream, scaler=scaler),
+        desc="Validating Classification Models",
+        colour="#9a276b",
+    ):
+        # Labels outside the given classes cannot be scored, so they are skipped and reported
+        known = np.array([label in class_index for label in y_val.tolist()], dtype=bool)
+        if not known.all():
+            n_unknown += int((~known).sum())
+            X_val, y_val = X_val[known], y_val[known]
+            if len(y_val) == 0:
+                continue
+        true_idx = np.array([class_index[label] for label in y_val.tolist()])
+        for name, model in models.items():
+            pred_idx = np.searchsorted(classes, model.predict(X_val))
+            np.add.at(confusion[name], (true_idx, pred_idx), 1)
+            if hasattr(model, "predict_proba"):
+                bins = _score_bins(model.predict_proba(X_val))
+                for c in range(n_classes):
+                    is_pos = true_idx == c
+                    pos_hists[name][c] += np.bincount(
+                        bins[is_pos, c], minlength=N_AUC_BINS
+                    )
+                    neg_hists[name][c] += np.bincount(
+                        bins[~is_pos, c], minlength=N_AUC_BINS
+                    )
+
+    if n_unknown:
+        warnings.warn(
+            f"Skipped {n_unknown} validation rows with labels missing from classes."
+        )
+    if not any(matrix.sum() for matrix in confusion.values()):
+        raise ValueError("The validation stream has no rows to score.")
+
+    results = []
+    for name, model in models.items():
+        metrics = _classification_metrics(
+            confusion[name], pos_hists[name], neg_hists[name], average_type
+        )
+        if not hasattr(model, "predict_proba"):
+            metrics["ROC-AUC"] = None
+        results.append({"Model": name, **metrics})
+
+    # Convert the results list to a DataFrame
+    results_df = pd.DataFrame(results)
+    results_df = results_df.sort_values(by="Accuracy", ascending=False).reset_index(
+        drop=True
+    )
+
+    return results_df
+
+
+def best_regression_models_incremental(
+    path,
+    target,
+    chunksize=100_000,
+    test_size=0.2,
+    random_state=None,
+    scale_data=True,
+    n_epochs=1,
+    validation_path=None,
+    models=None,
+):
+    """
+    Streams CSV/Parquet data through partial_fit regressors and compares them on a held-out stream.
+
+    Parameters:
+    - path: str or list of str. Training file(s), CSV or Parquet.
+    - target: str. Name of the target column.
+    - chunksize: int, default=100_000. Number of rows read per chunk.
+    - test_size: float, default=0.2. Fraction of rows held out for validation (ignored with validation_path).
+    - random_state: int, default=None. Seed of the per-chunk validation split.
+    - scale_data: bool, default=True. Fit a StandardScaler with partial_fit in a first pass and scale every chunk.
+    - n_epochs: int, default=1. Number of passes over the training stream.
+    - validation_path: str or list of str, default=None. Separate validation file(s) instead of a row split.
+    - models: dict, default=None. Model name -> estimator with partial_fit, defaults to incremental_regression_models().
+
+    Returns:
+    - results_df: DataFrame. A DataFrame containing the model name, R² score, MSE, RMSE, and MAE for each model.
+    """
+    models = incremental_regression_models() if models is None else models
+    stream = (path, target, chunksize, test_size, random_state, validation_path)
+
+    scaler, _ = _prepare_pass(*stream, scale_data=scale_data, collect_classes=False)
+    _train(models, *stream, scaler=scaler, n_epochs=n_epochs, classes=None)
+
+    # Running sums are enough for exact R², MSE and MAE
+    n, sum_y, sum_y2 = 0, 0.0, 0.0
+    sse = {name: 0.0 for name in models}
+    sae = {name: 0.0 for name in models}
+
+    for X_val, y_val in tqdm(
+        _validation_stream(*stream, scaler=scaler),
+        desc="Validating Regression Models",
+        colour="#9a276b",
+    ):
+        y_val = y_val.astype(np.float64)
+        n += len(y_val)
+        sum_y += y_val.sum()
+        sum_y2 += (y_val**2).sum()
+        for name, model in models.items():
+            residuals = y_val - model.predict(X_val)
+            sse[name] += (residuals**2).sum()
+            sae[name] += np.abs(residuals).sum()
+
+    if n == 0:
+        raise ValueError("The validation stream has no rows to score.")
+    total_sum_of_squares = sum_y2 - sum_y**2 / n
+    results = []
+    for name in models:
+        mse = sse[name] / n
+        results.append(
+            {
+                "Model": name,
+                "R² Score": 1 - sse[name] / total_sum_of_squares,
+                "MSE": mse,
+                "RMSE": np.sqrt(mse),
+                "MAE": sae[name] / n,
+            }
+        )
+
+    # Convert the results list to a DataFrame
+    results_df = pd.DataFrame(results)
+    results_df = results_df.sort_values(by="R² Score", ascending=False).reset_index(
+        drop=True
+    )
+
+    return results_df
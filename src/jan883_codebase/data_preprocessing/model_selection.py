@@ -61,6 +61,8 @@ from sklearn.naive_bayes import GaussianNB
 from tqdm import tqdm
 from IPython.display import HTML, Markdown, display
 
+from .execution import parallel_context
+
 warnings.filterwarnings("ignore")
 
 
@@ -158,7 +160,8 @@ def evaluate_classification_model(model, X, y, cv=5):
         "f1_score": make_scorer(f1_score, average="macro"),
     }
 
-    scores = cross_validate(model, X, y, cv=cv, scoring=scoring, n_jobs=-1)
+    with parallel_context(-1) as n_jobs:
+        scores = cross_validate(model, X, y, cv=cv, scoring=scoring, n_jobs=n_jobs)
 
     # Compute means and standard deviations for each metric, and collect in a dictionary
     mean_std_scores = {
@@ -0,0 +1,239 @@
+"""
+Index-based train/validation/test splits.
+
+The splits are computed on row indices only, so X is never copied while splitting.
+The rows are taken once per subset, or they are wrapped in a RowView that keeps
+pointing at the shared array, DataFrame or memmap until an estimator asks for the
+data. The index arrays can be saved and reloaded, so a split or a set of CV folds
+can be reproduced exactly.
+
+Example:
+    splits = split_indices(y, test_size=0.2, val_size=0.2, stratify=y)
+    save_split_indices("splits.npz", splits)
+    X_train = RowView(X, splits["train"])   # no copy yet
+    model.fit(X_train, y[splits["train"]])  # materialised here
+"""
+
+import numpy as np
+from sklearn.model_selection import (
+    GroupKFold,
+    GroupShuffleSplit,
+    KFold,
+    StratifiedGroupKFold,
+    StratifiedKFold,
+    train_test_split,
+)
+
+
+def _n_samples(data):
+    return data if isinstance(data, (int, np.integer)) else len(data)
+
+
+def _take_labels(labels, indices):
+    if labels is None:
+        return None
+    return (
+        labels.iloc[indices] if hasattr(labels, "iloc") else np.asarray(labels)[indices]
+    )
+
+
+def _split_once(indices, stratify, groups, random_state, **sizes):
+    """
+    Splits an index array in two, returning (keep, held_out).
+    """
+    if groups is None:
+        # Same permutation as train_test_split(X, ...) with the same random_state
+        return train_test_split(
+            indices,
+            random_state=random_state,
+            stratify=_take_labels(stratify, indices),
+            **sizes,
+        )
+    groups = _take_labels(groups, indices)
+    if stratify is not None:
+        # One fold of a stratified group k-fold, with k = 1 / held-out share (rounded)
+        held_out_size = sizes.get("test_size", 1 - sizes.get("train_size", 0))
+        splitter = StratifiedGroupKFold(
+            max(2, round(1 / held_out_size)), shuffle=True, random_state=random_state
+        )
+        keep, held_out = next(
+            splitter.split(indices, _take_labels(stratify, indices), groups)
+        )
+        return indices[keep], indices[held_out]
+    splitter = GroupShuffleSplit(n_splits=1, random_state=random_state, **sizes)
+    keep, held_out = next(splitter.split(indices, groups=groups))
+    return indices[keep], indices[held_out]
+
+
+def split_indices(
+    data, test_size=0.2, val_size=0.0, stratify=None, groups=None, random_state=42
+):
+    """
+    Computes train/validation/test row indices without touching X.
+
+    Parameters:
+    - data: int or array-like. The number of rows, or anything with a length (X or y).
+    - test_size: float, default=0.2. Share of all rows in the test set.
+    - val_size: float, default=0.0. Share of all rows in the validation set (0 for a train/test split).
+    - stratify: array-like, default=None. Labels to stratify on, e.g. y.
+    - groups: array-like, default=None. Group labels; a group never spans two subsets. With stratify as
+      well, each subset is one fold of a StratifiedGroupKFold, so its share is rounded to 1/k.
+    - random_state: int, default=42. Seed used by the random number generator.
+
+    Returns:
+    - splits: dict. 'train' and 'test' (and 'val' when val_size > 0) -> integer row indices.
+    """
+    indices = np.arange(_n_samples(data))
+    train_val, test = _split_once(
+        indices, stratify, groups, random_state, test_size=test_size
+    )
+    splits = {"train": train_val, "test": test}
+
+    if val_size:
+        # val_size is a share of all rows, so rescale it to the remaining rows
+        train, val = _split_once(
+            train_val,
+            stratify,
+            groups,
+            random_state,
+            train_size=1 - val_size / (1 - test_size),
+        )
+        splits = {"train": train, "val": val, "test": test}
+
+    return splits
+
+
+def fold_indices(data, n_splits=5, stratify=None, groups=None, random_state=None):
+    """
+    Computes cross-validation folds as (train, test) index arrays.
+
+    Parameters:
+    - data: int or array-like. The number of rows, or anything with a length (X or y).
+    - n_splits: int, default=5. Number of folds.
+    - stratify: array-like, default=None. Labels to stratify on, e.g. y.
+    - groups: array-like, default=None. Group labels; a group never spans train and test.
+    - random_state: int, default=None. Shuffle seed (no shuffling when None).
+
+    Returns:
+    - folds: list of (train, test) tuples of integer row indices.
+    """
+    indices = np.arange(_n_samples(data))
+    shuffle = random_state is not None
+    if groups is not None and stratify is not None:
+        splitter = StratifiedGroupKFold(
+            n_splits, shuffle=shuffle, random_state=random_state
+        )
+    elif groups is not None:
+        splitter = GroupKFold(n_splits)
+    elif stratify is not None:
+        splitter = StratifiedKFold(n_splits, shuffle=shuffle, random_state=random_state)
+    else:
+        splitter = KFold(n_splits, shuffle=shuffle, random_state=random_state)
+    return list(splitter.split(indices, stratify, groups))
+
+
+def save_split_indices(path, splits):
+    """
+    Saves a split dict (from split_indices) or a fold list (from fold_indices) to an .npz file.
+    """
+    if isinstance(splits, dict):
+        arrays = dict(splits)
+    else:
+        arrays = {}
+        for i, (train, test) in enumerate(splits):
+            arrays[f"fold{i}_train"] = train
+            arrays[f"fold{i}_test"] = test
+    np.savez(path, **arrays)
+    print(f"✅ Split indices saved to {path}")
+
+
+def load_split_indices(path):
+    """
+    Loads indices saved by save_split_indices, returning the same dict or fold list.
+    """
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+    if not all(key.startswith("fold") for key in arrays):
+        return arrays
+    n_folds = len(arrays) // 2
+    return [(arrays[f"fold{i}_train"], arrays[f"fold{i}_test"]) for i in range(n_folds)]
+
+
+def save_memmap(X, path):
+    """
+    Writes X once to a .npy file and returns it reopened as a read-only memmap.
+    """
+    np.save(path, np.asarray(X))
+    return np.load(path, mmap_mode="r")
+
+
+def take_rows(data, indices):
+    """
+    Returns the given rows of a DataFrame, Series, array or memmap (one copy of those rows).
+    """
+    if isinstance(data, RowView):
+        return data.base_rows(indices)
+    return data.iloc[indices] if hasattr(data, "iloc") else data[indices]
+
+
+class RowView:
+    """
+    A lazy row subset of a shared array, DataFrame or memmap.
+
+    Nothing is copied until the view is materialised, either explicitly with
+    materialize() or implicitly when numpy/sklearn calls np.asarray() on it.
+    Views of views compose their indices instead of copying.
+
+    Parameters:
+    - base: DataFrame, array or memmap. The shared data.
+    - indices: array-like of int. Rows of base that belong to the view.
+    """
+
+    def __init__(self, base, indices):
+        if isinstance(base, RowView):
+            indices = base.indices[np.asarray(indices)]
+            base = base.base
+        self.base = base
+        self.indices = np.asarray(indices)
+
+    @property
+    def shape(self):
+        return (len(self.indices),) + tuple(self.base.shape[1:])
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def dtype(self):
+        if hasattr(self.base, "iloc"):
+            return np.asarray(self.base.iloc[:0]).dtype
+        return self.base.dtype
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, rows):
+        return RowView(self, np.arange(len(self.indices))[rows])
+
+    def base_rows(self, indices):
+        return take_rows(self.base, self.indices[np.asarray(indices)])
+
+    def materialize(self):
+        """
+        Copies the rows of the view into a new DataFrame or array.
+        """
+        return take_rows(self.base, self.indices)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.materialize(), dtype=dtype)
+
+    def iter_batches(self, batch_size=10_000):
+        """
+        Yields the view in materialised row batches, for partial_fit or prediction.
+        """
+        for start in range(0, len(self.indices), batch_size):
+            yield take_rows(self.base, self.indices[start : start + batch_size])
+
+    def __repr__(self):
+        return f"RowView({type(self.base).__name__}, shape={self.shape})"
@@ -0,0 +1,366 @@
+"""
+Budgeted hyperparameter search for the models used by best_classification_models
+and best_regression_models.
+
+Candidates are drawn at random from a per-model search space and raced with
+successive halving: every rung evaluates the surviving candidates on a larger
+resource (more training rows, or more trees for warm-startable ensembles) and keeps
+the best 1/eta of them. The search stops when the trial budget is used up or the
+time budget runs out, whichever comes first.
+"""
+
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.stats import loguniform, randint, uniform
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterSampler, check_cv
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from tqdm import tqdm
+
+from .eda import classification_models, regression_models
+from .execution import parallel_context
+
+_DEPTHS = [None, 3, 5, 8, 12, 20]
+
+CLASSIFICATION_SEARCH_SPACES = {
+    "Logistic Regression": {
+        "C": loguniform(1e-3, 1e2),
+        "max_iter": [1000],
+    },
+    "Decision Tree": {
+        "max_depth": _DEPTHS,
+        "min_samples_leaf": randint(1, 20),
+        "criterion": ["gini", "entropy"],
+    },
+    "Random Forest": {
+        "max_depth": _DEPTHS,
+        "min_samples_leaf": randint(1, 10),
+        "max_features": ["sqrt", "log2", 0.5, None],
+    },
+    "Gradient Boosting": {
+        "learning_rate": loguniform(1e-2, 3e-1),
+        "max_depth": randint(2, 6),
+        "subsample": uniform(0.6, 0.4),
+    },
+    "AdaBoost": {
+        "learning_rate": loguniform(1e-2, 2.0),
+        "n_estimators": randint(25, 200),
+    },
+    "Support Vector Classifier": {
+        "C": loguniform(1e-2, 1e2),
+        "gamma": loguniform(1e-4, 1.0),
+    },
+    "K-Nearest Neighbors": {
+        "n_neighbors": randint(3, 50),
+        "weights": ["uniform", "distance"],
+        "p": [1, 2],
+    },
+    "MLP Classifier": {
+        "hidden_layer_sizes": [(50,), (100,), (100, 50)],
+        "alpha": loguniform(1e-5, 1e-1),
+        "learning_rate_init": loguniform(1e-4, 1e-2),
+    },
+    "Naive Bayes": {
+        "var_smoothing": loguniform(1e-12, 1e-6),
+    },
+}
+
+REGRESSION_SEARCH_SPACES = {
+    "Linear Regression": {
+        "fit_intercept": [True, False],
+    },
+    "Ridge Regression": {
+        "alpha": loguniform(1e-3, 1e3),
+    },
+    "Lasso Regression": {
+        "alpha": loguniform(1e-4, 1e1),
+        "max_iter": [5000],
+    },
+    "ElasticNet Regression": {
+        "alpha": loguniform(1e-4, 1e1),
+        "l1_ratio": uniform(0.05, 0.9),
+        "max_iter": [5000],
+    },
+    "Decision Tree": {
+        "max_depth": _DEPTHS,
+        "min_samples_leaf": randint(1, 20),
+    },
+    "Random Forest": {
+        "max_depth": _DEPTHS,
+        "min_samples_leaf": randint(1, 10),
+        "max_features": ["sqrt", "log2", 0.5, 1.0],
+    },
+    "Gradient Boosting": {
+        "learning_rate": loguniform(1e-2, 3e-1),
+        "max_depth": randint(2, 6),
+        "subsample": uniform(0.6, 0.4),
+    },
+    "AdaBoost": {
+        "learning_rate": loguniform(1e-2, 2.0),
+        "n_estimators": randint(25, 200),
+        "loss": ["linear", "square", "exponential"],
+    },
+    "Support Vector Regressor": {
+        "C": loguniform(1e-2, 1e2),
+        "gamma": loguniform(1e-4, 1.0),
+        "epsilon": loguniform(1e-3, 1.0),
+    },
+    "K-Nearest Neighbors": {
+        "n_neighbors": randint(3, 50),
+        "weights": ["uniform", "distance"],
+        "p": [1, 2],
+    },
+    "MLP Regressor": {
+        "hidden_layer_sizes": [(50,), (100,), (100, 50)],
+        "alpha": loguniform(1e-5, 1e-1),
+        "learning_rate_init": loguniform(1e-4, 1e-2),
+    },
+    "Gaussian Process": {
+        "alpha": loguniform(1e-10, 1e-1),
+    },
+}
+
+
+def _model_zoo(problem_type):
+    if problem_type == "classification":
+        return classification_models(), CLASSIFICATION_SEARCH_SPACES, "accuracy"
+    elif problem_type == "regression":
+        return regression_models(), REGRESSION_SEARCH_SPACES, "r2"
+    raise ValueError(
+        "Invalid problem_type. Choose either 'classification' or 'regression'."
+    )
+
+
+def _supports_warm_start(estimator):
+    params = estimator.get_params()
+    return "warm_start" in params and "n_estimators" in params
+
+
+def _n_rungs(n_candidates, eta):
+    # 1 + floor(log_eta(n_candidates)) in exact arithmetic; math.log(243, 3) is 4.999...
+    n_rungs = 1
+    while eta**n_rungs <= n_candidates:
+        n_rungs += 1
+    return n_rungs
+
+
+def _subset(data, indices):
+    return data.iloc[indices] if hasattr(data, "iloc") else data[indices]
+
+
+def _fit_and_score(estimator, X, y, train, test, scorer, n_samples, warm_params):
+    """
+    Fits one (candidate, fold) pair on the given resource and scores it on the fold's test rows.
+
+    With warm_params set the estimator is warm-started, so only the extra trees are
+    grown; with n_samples set the fold's training rows are truncated to that size.
+    Returns the score and the fitted estimator so the next rung can continue from it.
+    """
+    if warm_params is not None:
+        estimator.set_params(**warm_params)
+    if n_samples is not None:
+        train = train[:n_samples]
+    estimator.fit(_subset(X, train), _subset(y, train))
+    score = scorer(estimator, _subset(X, test), _subset(y, test))
+    return score, estimator
+
+
+def tune_model(
+    name,
+    X,
+    y,
+    problem_type="classification",
+    n_trials=20,
+    time_budget=None,
+    eta=3,
+    cv=3,
+    scoring=None,
+    scale_data=False,
+    n_jobs=-1,
+    random_state=None,
+):
+    """
+    Tunes one model of the best_*_models zoo with successive-halving random search.
+
+    Parameters:
+    - name: str. The model name as used in classification_models() / regression_models(), e.g. "Random Forest".
+    - X: DataFrame or array-like. The feature set.
+    - y: Series or array-like. The target variable.
+    - problem_type: str, default="classification". Either 'classification' or 'regression'.
+    - n_trials: int, default=20. Number of random candidates to start the first rung with.
+    - time_budget: float, default=None. Wall-clock budget in seconds. The search stops after the rung that exceeds it.
+    - eta: int, default=3. Halving rate; only the best 1/eta of the candidates survive each rung.
+    - cv: int or CV splitter, default=3. Cross-validation strategy used to score every rung.
+    - scoring: str, default=None. sklearn scorer name, defaults to 'accuracy' or 'r2'.
+    - scale_data: bool, default=False. Whether to tune the model inside a StandardScaler pipeline.
+    - n_jobs: int, default=-1. Number of parallel workers for the (candidate, fold) fits, unless an execution backend is configured.
+    - random_state: int, default=None. Random state for candidate sampling.
+
+    Returns:
+    - best_estimator: estimator. The best candidate refitted on all of X, y.
+    - best_params: dict. The winning hyperparameters (without pipeline prefixes).
+    - results_df: DataFrame. One row per evaluated candidate and rung.
+    """
+    models, search_spaces, default_scoring = _model_zoo(problem_type)
+    if name not in models:
+        raise ValueError(f"Unknown model '{name}'. Choose one of {list(models)}.")
+    base_model = models[name]
+    scorer = get_scorer(scoring or default_scoring)
+    warm_start = _supports_warm_start(base_model)
+
+    # Tune inside a pipeline when scaling is requested, so the scaler is fitted per fold
+    if scale_data:
+        base_estimator = Pipeline([("scaler", StandardScaler()), ("model", base_model)])
+        prefix = "model__"
+    else:
+        base_estimator = base_model
+        prefix = ""
+
+    candidates = list(
+        ParameterSampler(
+            search_spaces.get(name, {}), n_iter=n_trials, random_state=random_state
+        )
+    )
+    splits = list(check_cv(cv, y, classifier=is_classifier(base_model)).split(X, y))
+    n_folds = len(splits)
+
+    # Resource schedule: the last rung always uses the full resource
+    n_rungs = _n_rungs(len(candidates), eta)
+    if warm_start:
+        max_resource = base_model.get_params()["n_estimators"]
+        min_resource = 10
+    else:
+        max_resource = min(len(train) for train, _ in splits)
+        n_classes = len(np.unique(y)) if problem_type == "classification" else 1
+        min_resource = min(20 * n_classes, max_resource)
+    resources = [
+        int(max(min_resource, max_resource / eta ** (n_rungs - 1 - rung)))
+        for rung in range(n_rungs)
+    ]
+
+    # Shuffle training rows once so that truncated folds are random subsamples
+    rng = np.random.RandomState(random_state)
+    splits = [(rng.permutation(train), test) for train, test in splits]
+
+    fitted = {
+        i: [
+            clone(base_estimator).set_params(
+                **{prefix + key: value for key, value in params.items()}
+            )
+            for _ in range(n_folds)
+        ]
+        for i, params in enumerate(candidates)
+    }
+    survivors = list(range(len(candidates)))
+    records = []
+    start_time = time.time()
+
+    for rung, resource in enumerate(
+        tqdm(resources, desc=f"Tuning {name}", colour="#9a276b")
+    ):
+        tasks = [(i, fold) for i in survivors for fold in range(n_folds)]
+        with parallel_context(n_jobs) as backend_n_jobs:
+            outputs = Parallel(n_jobs=backend_n_jobs)(
+                delayed(_fit_and_score)(
+                    fitted[i][fold],
+                    X,
+                    y,
+                    splits[fold][0],
+                    splits[fold][1],
+                    scorer,
+                    None if warm_start else resource,
+                    (
+                        {prefix + "warm_start": True, prefix + "n_estimators": resource}
+                        if warm_start
+                        else None
+                    ),
+                )
+                for i, fold in tasks
+            )
+
+        fold_scores = {i: [] for i in survivors}
+        for (i, fold), (score, estimator) in zip(tasks, outputs):
+            fold_scores[i].append(score)
+            # Keep the fitted estimator so warm-startable models continue growing
+            fitted[i][fold] = estimator
+
+        for i in survivors:
+            records.append(
+                {
+                    "Model": name,
+                    "Rung": rung,
+                    "Resource": resource,
+                    "Params": candidates[i],
+                    "Mean Score": np.mean(fold_scores[i]),
+                    "Std Score": np.std(fold_scores[i]),
+                }
+            )
+
+        ranked = sorted(survivors, key=lambda i: np.mean(fold_scores[i]), reverse=True)
+        survivors = ranked[: max(1, math.ceil(len(ranked) / eta))]
+
+        if time_budget is not None and time.time() - start_time > time_budget:
+            break
+
+    best_params = candidates[survivors[0]]
+    best_estimator = clone(base_estimator).set_params(
+        **{prefix + key: value for key, value in best_params.items()}
+    )
+    best_estimator.fit(X, y)
+
+    results_df = pd.DataFrame(records)
+    results_df = results_df.sort_values(
+        by=["Rung", "Mean Score"], ascending=[False, False]
+    ).reset_index(drop=True)
+
+    return best_estimator, best_params, results_df
+
+
+def tune_models(
+    X,
+    y,
+    problem_type="classification",
+    models=None,
+    n_trials=20,
+    time_budget=None,
+    **kwargs,
+):
+    """
+    Tunes every model of the best_*_models zoo and returns their best hyperparameters.
+
+    Parameters:
+    - X: DataFrame or array-like. The feature set.
+    - y: Series or array-like. The target variable.
+    - problem_type: str, default="classification". Either 'classification' or 'regression'.
+    - models: list of str, default=None. Subset of model names to tune, defaults to all of them.
+    - n_trials: int, default=20. Number of random candidates per model.
+    - time_budget: float, default=None. Total wall-clock budget in seconds, shared equally between the models.
+    - **kwargs: Passed on to tune_model (eta, cv, scoring, scale_data, n_jobs, random_state).
+
+    Returns:
+    - tuned_params: dict. Model name -> best hyperparameters, ready for best_*_models(tuned_params=...).
+    """
+    zoo, _, _ = _model_zoo(problem_type)
+    names = list(zoo) if models is None else list(models)
+    per_model_budget = None if time_budget is None else time_budget / len(names)
+
+    tuned_params = {}
+    for name in names:
+        _, best_params, _ = tune_model(
+            name,
+            X,
+            y,
+            problem_type=problem_type,
+            n_trials=n_trials,
+            time_budget=per_model_budget,
+            **kwargs,
+        )
+        tuned_params[name] = best_params
+
+    return tuned_params
@@ -1,10 +1,42 @@
+import copy
 import math
+import threading
+import warnings
 
 import torch
 import torch.nn.functional as F
+from torch.utils.checkpoint import checkpoint as checkpoint_fn
+
+
+class _BSplineBases(torch.autograd.Function):
+    """
+    B-spline bases with the analytic derivative with respect to x.
+    """
+
+    @staticmethod
+    def forward(ctx, x, layer, features):
+        bases, previous = layer._cox_de_boor(x, keep_previous=True, features=features)
+        ctx.save_for_backward(
+            previous, getattr(layer, f"grid_inverse_{layer.spline_order}")[features]
+        )
+        ctx.spline_order = layer.spline_order
+        return bases
+
+    @staticmethod
+    @torch.autograd.function.once_differentiable
+    def backward(ctx, grad_output):
+        previous, inverse = ctx.saved_tensors  # (batch, in, coeff + 1), (in, coeff + 1)
+        scaled = previous * inverse
+        # sum_j grad_j * (scaled_j - scaled_{j+1}) = sum_j scaled_j * (grad_j - grad_{j-1})
+        grad_diff = F.pad(grad_output, (0, 1)) - F.pad(grad_output, (1, 0))
+        grad_x = ctx.spline_order * (scaled * grad_diff).sum(-1)
+        return grad_x, None, None
 
 
 class KANLinear(torch.nn.Module):
+    # Rows of reusable b_splines scratch buffers kept per thread when batch_chunk_size is unset
+    max_workspace_rows = 4096
+
     def __init__(
         self,
         in_features,
@@ -18,6 +50,9 @@ class KANLinear(torch.nn.Module):
         base_activation=torch.nn.SiLU,
         grid_eps=0.02,
         grid_range=[-1, 1],
+        batch_chunk_size=None,
+        feature_chunk_size=None,
+        checkpoint=False,
     ):
         super(KANLinear, self).__init__()
         self.in_features = in_features
@@ -35,6 +70,8 @@ class KANLinear(torch.nn.Module):
             .contiguous()
         )
         self.register_buffer("grid", grid)
+        self._workspace = threading.local()
+        self._refresh_grid_cache()
 
         self.base_weight = torch.nn.Parameter(torch.Tensor(out_features, in_features))
         self.spline_weight = torch.nn.Parameter(
@@ -51,6 +88,10 @@ class KANLinear(torch.nn.Module):
         self.enable_standalone_scale_spline = enable_standalone_scale_spline
         self.base_activation = base_activation()
         self.grid_eps = grid_eps
+        self.set_chunking(batch_chunk_size, feature_chunk_size, checkpoint)
+        # Set by quantize_dynamic for int8 inference
+        self.base_linear = None
+        self.spline_linear = None
 
         self.reset_parameters()
 
@@ -80,10 +121,133 @@ class KANLinear(torch.nn.Module):
                     self.spline_scaler, a=math.sqrt(5) * self.scale_spline
                 )
 
+    @torch.no_grad()
+    def _refresh_grid_cache(self):
+        """
+        Precompute the reciprocal knot spans 1 / (grid[j + k] - grid[j]) of every spline order.
+
+        They only depend on the grid, so they are cached as non-persistent buffers (moved
+        along with .to()) and must be refreshed whenever the grid changes: after
+        update_grid and after load_state_dict.
+        """
+        for k in range(1, self.spline_order + 1):
+            inverse = 1.0 / (self.grid[:, k:] - self.grid[:, :-k])
+            if hasattr(self, f"grid_inverse_{k}"):
+                getattr(self, f"grid_inverse_{k}").copy_(inverse)
+            else:
+                self.register_buffer(f"grid_inverse_{k}", inverse, persistent=False)
+
+    def _load_from_state_dict(self, *args, **kwargs):
+        super()._load_from_state_dict(*args, **kwargs)
+        self._refresh_grid_cache()
+
+    def __getstate__(self):
+        # The scratch buffers are per thread and can be far larger than the weights,
+        # so pickles and deep copies leave them out
+        state = super().__getstate__().copy()
+        state.pop("_workspace", None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._workspace = threading.local()
+
+    def _get_workspace(self, batch_size, n_features, dtype, device):
+        # Scratch buffers reused across calls of the same thread, at most one chunk
+        # (batch_chunk_size or max_workspace_rows rows, feature_chunk_size features)
+        # large; larger calls get temporary buffers that are freed afterwards
+        n_bases = self.grid.size(1) - 1
+        max_rows = self.batch_chunk_size or self.max_workspace_rows
+        max_features = self.feature_chunk_size or self.in_features
+        if batch_size > max_rows or n_features > max_features:
+            shape = (batch_size, n_features, n_bases)
+            return torch.empty(shape, dtype=dtype, device=device), [
+                torch.empty(shape, dtype=dtype, device=device) for _ in range(2)
+            ]
+
+        workspace = self._workspace.__dict__
+        if (
+            workspace.get("batch_size", 0) < batch_size
+            or workspace["n_features"] < n_features
+            or workspace["dtype"] != dtype
+            or workspace["device"] != device
+        ):
+            batch_size = max(batch_size, workspace.get("batch_size", 0))
+            n_features = max(n_features, workspace.get("n_features", 0))
+            shape = (batch_size, n_features, n_bases)
+            workspace.update(
+                batch_size=batch_size,
+                n_features=n_features,
+                dtype=dtype,
+                device=device,
+                alpha=torch.empty(shape, dtype=dtype, device=device),
+                bases=[
+                    torch.empty(shape, dtype=dtype, device=device) for _ in range(2)
+                ],
+            )
+        return (
+            workspace["alpha"][:batch_size, :n_features],
+            [bases[:batch_size, :n_features] for bases in workspace["bases"]],
+        )
+
+    def release_workspace(self):
+        """
+        Release the scratch buffers used by b_splines in every thread.
+        """
+        self._workspace = threading.local()
+
+    @torch.no_grad()
+    def _cox_de_boor(self, x: torch.Tensor, keep_previous=False, features=slice(None)):
+        """
+        Fused, in-place Cox-de Boor recursion on reusable scratch buffers.
+
+        x holds the input columns selected by the features slice. Returns the order-k
+        bases and, with keep_previous, the order-(k - 1) bases that the analytic
+        derivative needs (both freshly allocated, never scratch).
+        """
+        grid = self.grid[features]
+        x = x.unsqueeze(-1)
+        bases = ((x >= grid[:, :-1]) & (x < grid[:, 1:])).to(x.dtype)
+        previous = None
+
+        alpha_buffer, buffers = self._get_workspace(
+            x.size(0), x.size(1), x.dtype, x.device
+        )
+        for k in range(1, self.spline_order + 1):
+            n = bases.size(-1)
+            alpha = alpha_buffer[:, :, :n]
+            torch.sub(x, grid[:, :-k], out=alpha)
+            alpha.mul_(getattr(self, f"grid_inverse_{k}")[features])
+            if k == self.spline_order:
+                out = x.new_empty(x.size(0), x.size(1), n - 1)
+                previous = bases.clone() if keep_previous and k > 1 else bases
+            else:
+                out = buffers[k % 2][:, :, : n - 1]
+            torch.mul(alpha[:, :, :-1], bases[:, :, :-1], out=out)
+            # alpha_{j+1} -> 1 - alpha_{j+1}, after alpha_j was used above
+            alpha[:, :, 1:].neg_().add_(1)
+            out.addcmul_(alpha[:, :, 1:], bases[:, :, 1:])
+            bases = out
+
+        return bases, previous
+
     def b_splines(self, x: torch.Tensor):
         """
         Compute the B-spline bases for the given input tensor.
 
+        Uses the fused Cox-de Boor recursion
+
+            alpha_j = (x - grid_j) / (grid_{j+k} - grid_j)
+            B_{j,k} = alpha_j * B_{j,k-1} + (1 - alpha_{j+1}) * B_{j+1,k-1}
+
+        with cached reciprocal knot spans, run in place in per-thread scratch buffers so
+        only the returned tensor is allocated. When x requires grad, the derivative is
+        applied analytically in the backward pass,
+
+            dB_{j,k}/dx = k * (B_{j,k-1} / (grid_{j+k} - grid_j) - B_{j+1,k-1} / (grid_{j+k+1} - grid_{j+1})),
+
+        instead of back-propagating through every recursion level.
+
         Args:
             x (torch.Tensor): Input tensor of shape (batch_size, in_features).
 
@@ -92,21 +256,10 @@ class KANLinear(torch.nn.Module):
         """
         assert x.dim() == 2 and x.size(1) == self.in_features
 
-        grid: torch.Tensor = (
-            self.grid
-        )  # (in_features, grid_size + 2 * spline_order + 1)
-        x = x.unsqueeze(-1)
-        bases = ((x >= grid[:, :-1]) & (x < grid[:, 1:])).to(x.dtype)
-        for k in range(1, self.spline_order + 1):
-            bases = (
-                (x - grid[:, : -(k + 1)])
-                / (grid[:, k:-1] - grid[:, : -(k + 1)])
-                * bases[:, :, :-1]
-            ) + (
-                (grid[:, k + 1 :] - x)
-                / (grid[:, k + 1 :] - grid[:, 1:(-k)])
-                * bases[:, :, 1:]
-            )
+        if x.requires_grad and torch.is_grad_enabled() and self.spline_order > 0:
+            bases = _BSplineBases.apply(x, self, slice(None))
+        else:
+            bases, _ = self._cox_de_boor(x)
 
         assert bases.size() == (
             x.size(0),
@@ -155,35 +308,136 @@ class KANLinear(torch.nn.Module):
             else 1.0
         )
 
+    def set_chunking(
+        self, batch_chunk_size=None, feature_chunk_size=None, checkpoint=False
+    ):
+        """
+        Configure the memory-bounded forward pass.
+
+        The spline term needs a (batch, in_features, grid_size + spline_order) basis tensor,
+        i.e. grid_size + spline_order times the input. With chunking, the bases are built
+        for at most batch_chunk_size rows and feature_chunk_size input features at a time
+        and their contributions are accumulated into the output, so the basis tensor never
+        exceeds one chunk. During training autograd still keeps every chunk's bases for
+        the backward pass unless checkpoint is set; the bases are then recomputed chunk by
+        chunk in the backward pass instead of stored (about one extra forward pass).
+
+        Args:
+            batch_chunk_size (int, optional): Rows per chunk. None processes the whole batch at once.
+            feature_chunk_size (int, optional): Input features per chunk. None uses all features at once.
+            checkpoint (bool): Recompute the spline bases in the backward pass instead of storing them.
+        """
+        self.batch_chunk_size = batch_chunk_size
+        self.feature_chunk_size = feature_chunk_size
+        self.checkpoint = checkpoint
+        # The scratch buffers are sized by the chunk, so drop any larger ones
+        self.release_workspace()
+
+    def _spline_output(self, x: torch.Tensor):
+        """
+        Spline term of the layer for a batch chunk, accumulated over feature chunks.
+        """
+        # Under bfloat16 autocast the previous layer returns bfloat16; the B-splines are
+        # still evaluated at the grid's precision and only the matmul runs in bfloat16
+        x = x.to(self.grid.dtype)
+        step = self.feature_chunk_size or self.in_features
+        if self.spline_linear is not None:
+            return self.spline_linear(self.b_splines(x).view(x.size(0), -1))
+        if step >= self.in_features:
+            return F.linear(
+                self.b_splines(x).view(x.size(0), -1),
+                self.scaled_spline_weight.view(self.out_features, -1),
+            )
+
+        spline_weight = self.scaled_spline_weight
+        output = None
+        for start in range(0, self.in_features, step):
+            features = slice(start, start + step)
+            x_chunk = x[:, features]
+            if x_chunk.requires_grad and torch.is_grad_enabled():
+                bases = _BSplineBases.apply(x_chunk, self, features)
+            else:
+                bases, _ = self._cox_de_boor(x_chunk, features=features)
+            chunk_output = F.linear(
+                bases.view(x.size(0), -1),
+                spline_weight[:, features].reshape(self.out_features, -1),
+            )
+            output = chunk_output if output is None else output + chunk_output
+        return output
+
     def forward(self, x: torch.Tensor):
         assert x.size(-1) == self.in_features
         original_shape = x.shape
         x = x.view(-1, self.in_features)
 
-        base_output = F.linear(self.base_activation(x), self.base_weight)
-        spline_output = F.linear(
-            self.b_splines(x).view(x.size(0), -1),
-            self.scaled_spline_weight.view(self.out_features, -1),
+        if self.base_linear is not None:
+            base_output = self.base_linear(self.base_activation(x))
+        else:
+            base_output = F.linear(self.base_activation(x), self.base_weight)
+        use_checkpoint = self.checkpoint and torch.is_grad_enabled() and self.training
+
+        step = self.batch_chunk_size or x.size(0)
+        spline_outputs = []
+        for start in range(0, x.size(0), step):
+            x_chunk = x[start : start + step]
+            if use_checkpoint:
+                spline_outputs.append(
+                    checkpoint_fn(self._spline_output, x_chunk, use_reentrant=False)
+                )
+            else:
+                spline_outputs.append(self._spline_output(x_chunk))
+        spline_output = (
+            spline_outputs[0]
+            if len(spline_outputs) == 1
+            else torch.cat(spline_outputs, dim=0)
         )
         output = base_output + spline_output
 
         output = output.view(*original_shape[:-1], self.out_features)
         return output
 
+    def estimate_peak_memory(self, batch_size, training=False, dtype=torch.float32):
+        """
+        Estimate the peak memory of a forward pass in bytes, given the chunk settings.
+
+        Counts the tensors that scale with the batch: the basis tensor and its scratch
+        buffers for one chunk, the activations and, when training, what autograd keeps
+        for the backward pass. Parameters and allocator overhead are not included.
+
+        Args:
+            batch_size (int): Number of rows passed to forward.
+            training (bool): Include the tensors saved for the backward pass.
+            dtype (torch.dtype): Dtype of the input.
+
+        Returns:
+            int: Estimated peak bytes.
+        """
+        item_size = torch.empty(0, dtype=dtype).element_size()
+        n_coeff = self.grid_size + self.spline_order
+        n_bases = self.grid_size + 2 * self.spline_order
+        rows = min(self.batch_chunk_size or batch_size, batch_size)
+        features = min(self.feature_chunk_size or self.in_features, self.in_features)
+
+        # Input activation and output, base and spline terms
+        elements = batch_size * (2 * self.in_features + 3 * self.out_features)
+        # One chunk of bases plus the scratch buffers of the recursion
+        chunk = rows * features * (n_coeff + 3 * n_bases)
+        if training:
+            # The bases and the order-(k - 1) bases of every chunk are saved for backward
+            saved = batch_size * self.in_features * (2 * n_coeff + 1)
+            # With checkpointing only one chunk's worth is alive, during its recomputation
+            elements += chunk + (
+                rows * features * (2 * n_coeff + 1) if self.checkpoint else saved
+            )
+        else:
+            elements += chunk
+        return elements * item_size
+
     @torch.no_grad()
     def update_grid(self, x: torch.Tensor, margin=0.01):
         assert x.dim() == 2 and x.size(1) == self.in_features
         batch = x.size(0)
 
-        splines = self.b_splines(x)  # (batch, in, coeff)
-        splines = splines.permute(1, 0, 2)  # (in, batch, coeff)
-        orig_coeff = self.scaled_spline_weight  # (out, in, coeff)
-        orig_coeff = orig_coeff.permute(1, 2, 0)  # (in, coeff, out)
-        unreduced_spline_output = torch.bmm(splines, orig_coeff)  # (in, batch, out)
-        unreduced_spline_output = unreduced_spline_output.permute(
-            1, 0, 2
-        )  # (batch, in, out)
-
         # sort each channel individually to collect data distribution
         x_sorted = torch.sort(x, dim=0)[0]
         grid_adaptive = x_sorted[
@@ -191,14 +445,39 @@ class KANLinear(torch.nn.Module):
                 0, batch - 1, self.grid_size + 1, dtype=torch.int64, device=x.device
             )
         ]
+        self.set_grid(grid_adaptive, x_sorted[0], x_sorted[-1], x, margin)
+
+    @torch.no_grad()
+    def set_grid(self, grid_adaptive, x_min, x_max, x_fit, margin=0.01):
+        """
+        Replace the grid and refit the spline coefficients so the layer keeps its function.
 
-        uniform_step = (x_sorted[-1] - x_sorted[0] + 2 * margin) / self.grid_size
+        update_grid takes the knots from one sorted batch; a streaming update
+        (see kan_grid.StreamingGridUpdater) passes quantiles from a sketch instead.
+
+        Args:
+            grid_adaptive (torch.Tensor): Per-feature quantiles at grid_size + 1 evenly spaced ranks, shape (grid_size + 1, in_features).
+            x_min (torch.Tensor): Per-feature minimum, shape (in_features,).
+            x_max (torch.Tensor): Per-feature maximum, shape (in_features,).
+            x_fit (torch.Tensor): Inputs the coefficients are refit on, shape (batch_size, in_features).
+            margin (float): Margin added around [x_min, x_max] for the uniform grid.
+        """
+        splines = self.b_splines(x_fit)  # (batch, in, coeff)
+        splines = splines.permute(1, 0, 2)  # (in, batch, coeff)
+        orig_coeff = self.scaled_spline_weight  # (out, in, coeff)
+        orig_coeff = orig_coeff.permute(1, 2, 0)  # (in, coeff, out)
+        unreduced_spline_output = torch.bmm(splines, orig_coeff)  # (in, batch, out)
+        unreduced_spline_output = unreduced_spline_output.permute(
+            1, 0, 2
+        )  # (batch, in, out)
+
+        uniform_step = (x_max - x_min + 2 * margin) / self.grid_size
         grid_uniform = (
             torch.arange(
-                self.grid_size + 1, dtype=torch.float32, device=x.device
+                self.grid_size + 1, dtype=self.grid.dtype, device=x_fit.device
             ).unsqueeze(1)
             * uniform_step
-            + x_sorted[0]
+            + x_min
             - margin
         )
 
@@ -207,17 +486,117 @@ class KANLinear(torch.nn.Module):
             [
                 grid[:1]
                 - uniform_step
-                * torch.arange(self.spline_order, 0, -1, device=x.device).unsqueeze(1),
+                * torch.arange(self.spline_order, 0, -1, device=x_fit.device).unsqueeze(
+                    1
+                ),
                 grid,
                 grid[-1:]
                 + uniform_step
-                * torch.arange(1, self.spline_order + 1, device=x.device).unsqueeze(1),
+                * torch.arange(1, self.spline_order + 1, device=x_fit.device).unsqueeze(
+                    1
+                ),
             ],
             dim=0,
         )
 
         self.grid.copy_(grid.T)
-        self.spline_weight.data.copy_(self.curve2coeff(x, unreduced_spline_output))
+        self._refresh_grid_cache()
+        self.spline_weight.data.copy_(self.curve2coeff(x_fit, unreduced_spline_output))
+        self.release_workspace()
+
+    @torch.no_grad()
+    def quantize_dynamic(self, spline=False):
+        """
+        Switch the base matmul (and optionally the spline matmul) to dynamic int8 quantization.
+
+        The weights are quantized to int8 once and the activations per batch, via
+        torch.ao.quantization.quantize_dynamic. The layer becomes inference-only: the
+        quantized matmuls have no backward pass and ignore later weight updates.
+
+        Args:
+            spline (bool): Also quantize the spline matmul; its inputs are B-spline bases in
+                [0, 1], so this is faster but less accurate than quantizing the base path only.
+
+        Returns:
+            KANLinear: self.
+        """
+
+        def quantized_linear(weight):
+            linear = torch.nn.Linear(weight.size(1), weight.size(0), bias=False)
+            linear.weight.data.copy_(weight.float())
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                return torch.ao.quantization.quantize_dynamic(
+                    torch.nn.Sequential(linear), {torch.nn.Linear}, dtype=torch.qint8
+                )[0]
+
+        self.base_linear = quantized_linear(self.base_weight)
+        if spline:
+            self.spline_linear = quantized_linear(
+                self.scaled_spline_weight.reshape(self.out_features, -1)
+            )
+        return self
+
+    @torch.no_grad()
+    def edge_scores(self, x: torch.Tensor, batch_size=1024):
+        """
+        Compute the L1 activation magnitude of every edge on sample inputs.
+
+        The score of edge (o, i) is the mean over x of |base_weight[o, i] * silu(x_i) +
+        spline_{o, i}(x_i)|, i.e. the sample-based L1 norm that regularization_loss
+        approximates with the spline weights.
+
+        Args:
+            x (torch.Tensor): Sample inputs of shape (batch_size, in_features).
+            batch_size (int): Rows per chunk of the (batch, in_features, out_features) intermediate.
+
+        Returns:
+            torch.Tensor: Scores of shape (out_features, in_features).
+        """
+        assert x.dim() == 2 and x.size(1) == self.in_features
+        scores = x.new_zeros(self.in_features, self.out_features)
+        spline_weight = self.scaled_spline_weight
+        for x_chunk in x.split(batch_size):
+            activation = torch.einsum(
+                "bic,oic->bio", self.b_splines(x_chunk), spline_weight
+            )
+            activation += self.base_activation(x_chunk).unsqueeze(
+                -1
+            ) * self.base_weight.T.unsqueeze(0)
+            scores += activation.abs().sum(0)
+        return (scores / x.size(0)).T
+
+    @torch.no_grad()
+    def select(self, in_index, out_index):
+        """
+        Return a smaller KANLinear with only the given input and output features.
+
+        Args:
+            in_index (torch.Tensor): Input features to keep.
+            out_index (torch.Tensor): Output features to keep.
+
+        Returns:
+            KANLinear: A new layer with the grid and weights of the kept edges.
+        """
+        layer = KANLinear(
+            len(in_index),
+            len(out_index),
+            grid_size=self.grid_size,
+            spline_order=self.spline_order,
+            scale_noise=self.scale_noise,
+            scale_base=self.scale_base,
+            scale_spline=self.scale_spline,
+            enable_standalone_scale_spline=self.enable_standalone_scale_spline,
+            base_activation=type(self.base_activation),
+            grid_eps=self.grid_eps,
+        ).to(self.grid.device)
+        layer.grid.copy_(self.grid[in_index])
+        layer._refresh_grid_cache()
+        layer.base_weight.copy_(self.base_weight[out_index][:, in_index])
+        layer.spline_weight.copy_(self.spline_weight[out_index][:, in_index])
+        if self.enable_standalone_scale_spline:
+            layer.spline_scaler.copy_(self.spline_scaler[out_index][:, in_index])
+        return layer
 
     def regularization_loss(self, regularize_activation=1.0, regularize_entropy=1.0):
         """
@@ -254,6 +633,9 @@ class KAN(torch.nn.Module):
         base_activation=torch.nn.SiLU,
         grid_eps=0.02,
         grid_range=[-1, 1],
+        batch_chunk_size=None,
+        feature_chunk_size=None,
+        checkpoint=False,
     ):
         super(KAN, self).__init__()
         self.grid_size = grid_size
@@ -273,6 +655,9 @@ class KAN(torch.nn.Module):
                     base_activation=base_activation,
                     grid_eps=grid_eps,
                     grid_range=grid_range,
+                    batch_chunk_size=batch_chunk_size,
+                    feature_chunk_size=feature_chunk_size,
+                    checkpoint=checkpoint,
                 )
             )
 
@@ -283,8 +668,293 @@ class KAN(torch.nn.Module):
             x = layer(x)
         return x
 
+    def set_chunking(
+        self,
+        batch_chunk_size=None,
+        feature_chunk_size=None,
+        checkpoint=False,
+        max_memory_mb=None,
+        batch_size=None,
+        training=False,
+    ):
+        """
+        Configure the memory-bounded forward pass of every layer (see KANLinear.set_chunking).
+
+        With max_memory_mb and batch_size, each layer gets the largest batch_chunk_size
+        whose estimated peak memory (estimate_peak_memory) stays within the budget.
+
+        Args:
+            batch_chunk_size (int, optional): Rows per chunk.
+            feature_chunk_size (int, optional): Input features per chunk.
+            checkpoint (bool): Recompute the spline bases in the backward pass instead of storing them.
+            max_memory_mb (float, optional): Per-layer memory budget used to pick batch_chunk_size.
+            batch_size (int, optional): Batch size the budget is planned for; required with max_memory_mb.
+            training (bool): Plan the budget for training (forward + backward) instead of inference.
+        """
+        for layer in self.layers:
+            layer.set_chunking(batch_chunk_size, feature_chunk_size, checkpoint)
+            if max_memory_mb is None:
+                continue
+            assert batch_size is not None, "batch_size is required with max_memory_mb"
+            budget = max_memory_mb * 2**20
+            low, high = 1, batch_size
+            while low < high:
+                middle = (low + high + 1) // 2
+                layer.batch_chunk_size = middle
+                if layer.estimate_peak_memory(batch_size, training) <= budget:
+                    low = middle
+                else:
+                    high = middle - 1
+            layer.batch_chunk_size = low
+
+    def update_grid_streaming(
+        self, data, sketch_size=1024, reservoir_size=10_000, margin=0.01, seed=None
+    ):
+        """
+        Adapt the grids of all layers to a dataset larger than one batch.
+
+        Streams data once through the model to build per-feature quantile sketches of
+        every layer input and a bounded reservoir sample of the rows, then refits the
+        layers in order (see kan_grid.StreamingGridUpdater).
+
+        Args:
+            data (iterable): Batches of inputs, e.g. a DataLoader yielding tensors or (x, y) tuples.
+            sketch_size (int): Points kept per feature by each quantile sketch.
+            reservoir_size (int): Rows kept to refit the spline coefficients on.
+            margin (float): Margin of the uniform part of the grid.
+            seed (int, optional): Seed of the reservoir sampling.
+
+        Returns:
+            StreamingGridUpdater: The updater, with the sketches it used.
+        """
+        from .kan_grid import StreamingGridUpdater
+
+        updater = StreamingGridUpdater(
+            self, sketch_size, reservoir_size, margin=margin, seed=seed
+        )
+        updater.fit(data)
+        return updater
+
+    def quantize_dynamic(self, spline=False):
+        """
+        Return an inference-only copy with dynamic int8 matmuls (see KANLinear.quantize_dynamic).
+        """
+        quantized = copy.deepcopy(self).cpu().eval()
+        for layer in quantized.layers:
+            layer.quantize_dynamic(spline=spline)
+        return quantized
+
+    def prune(self, x, threshold=1e-2, sparse="auto", benchmark=True):
+        """
+        Remove the edges and neurons whose L1 activation magnitude on x is below threshold.
+
+        See kan_pruning.prune_kan.
+
+        Returns:
+            tuple: The pruned KAN and a report of the parameter, FLOP and latency reduction.
+        """
+        from .kan_pruning import prune_kan
+
+        return prune_kan(self, x, threshold, sparse=sparse, benchmark=benchmark)
+
+    def estimate_peak_memory(self, batch_size, training=False, dtype=torch.float32):
+        """
+        Estimate the peak memory of a forward pass in bytes.
+
+        Without training the layers run one after the other, so the peak is the largest
+        layer; when training the saved tensors of all layers add up.
+        """
+        estimates = [
+            layer.estimate_peak_memory(batch_size, training, dtype)
+            for layer in self.layers
+        ]
+        return sum(estimates) if training else max(estimates)
+
+    def release_workspace(self):
+        """
+        Release the b_splines scratch buffers of every layer (see KANLinear.release_workspace).
+        """
+        for layer in self.layers:
+            layer.release_workspace()
+
     def regularization_loss(self, regularize_activation=1.0, regularize_entropy=1.0):
         return sum(
             layer.regularization_loss(regularize_activation, regularize_entropy)
             for layer in self.layers
         )
+
+    @torch.no_grad()
+    def compile_for_inference(
+        self,
+        tolerance=1e-3,
+        x=None,
+        max_table_size=1024,
+        benchmark=True,
+        batch_size=1024,
+    ):
+        """
+        Compile the trained model into lookup-table layers for fast inference.
+
+        The spline part of every layer is tabulated per input feature (see KANLinearLUT),
+        so inference is a gather plus linear interpolation instead of the B-spline
+        recursion; the SiLU base term stays an exact matrix product. Each table is refined
+        until its interpolation error is within tolerance, and the end-to-end deviation
+        from this model is measured on x.
+
+        Args:
+            tolerance (float): Maximum interpolation error allowed per layer output.
+            x (torch.Tensor, optional): Inputs to measure the deviation and speedup on. Defaults to
+                batch_size uniform samples over the first layer's grid range.
+            max_table_size (int): Upper bound on the table points per input feature.
+            benchmark (bool): Time both models on x and report the speedup.
+            batch_size (int): Number of sampled inputs when x is None.
+
+        Returns:
+            tuple: The compiled KANLUT and a report dict with 'max_abs_deviation', 'table_sizes' and,
+                when benchmark is set, 'original_ms', 'compiled_ms' and 'speedup'.
+        """
+        compiled = KANLUT(
+            [
+                KANLinearLUT.from_layer(layer, tolerance, max_table_size)
+                for layer in self.layers
+            ]
+        )
+        if x is None:
+            grid = self.layers[0].grid
+            low = grid[:, self.spline_order]
+            high = grid[:, -self.spline_order - 1]
+            x = low + (high - low) * torch.rand(
+                batch_size, grid.size(0), device=grid.device
+            )
+
+        was_training = self.training
+        self.eval()
+        report = {
+            "max_abs_deviation": (self(x) - compiled(x)).abs().max().item(),
+            "table_sizes": [layer.table_size for layer in compiled.layers],
+        }
+        if benchmark:
+            from .kan_benchmarks import time_call
+
+            report["original_ms"] = time_call(lambda: self(x))
+            report["compiled_ms"] = time_call(lambda: compiled(x))
+            report["speedup"] = report["original_ms"] / report["compiled_ms"]
+        self.train(was_training)
+        self.release_workspace()
+        return compiled, report
+
+
+class KANLinearLUT(torch.nn.Module):
+    """
+    Inference-only KANLinear with every spline tabulated on a uniform grid.
+
+    For each input feature i the table holds the summed spline contributions
+    sum_c spline_weight[:, i, c] * B_c(x) of all outputs at table_size equally spaced
+    points over the feature's knot range. A forward pass looks up the two neighbouring
+    points of every input and interpolates linearly, which F.embedding_bag does as one
+    weighted gather-and-sum over all input features. Outside the knot range the spline
+    is zero, like in KANLinear.
+    """
+
+    def __init__(self, base_weight, base_activation, low, step, table):
+        super(KANLinearLUT, self).__init__()
+        self.in_features = low.numel()
+        self.out_features = base_weight.size(0)
+        self.table_size = table.size(0) // self.in_features
+        self.base_activation = base_activation
+        self.register_buffer("base_weight", base_weight)
+        self.register_buffer("low", low)
+        self.register_buffer("inverse_step", 1.0 / step)
+        self.register_buffer(
+            "offsets",
+            torch.arange(self.in_features, device=low.device) * self.table_size,
+        )
+        self.register_buffer("table", table)  # (in_features * table_size, out_features)
+
+    @staticmethod
+    def _tabulate(layer: KANLinear, table_size):
+        low, high = layer.grid[:, 0], layer.grid[:, -1]
+        step = (high - low) / (table_size - 1)
+        points = low + step * torch.arange(table_size, device=low.device).unsqueeze(1)
+        # (table_size, in, coeff) x (out, in, coeff) -> (in, table_size, out)
+        table = torch.einsum(
+            "tic,oic->ito", layer.b_splines(points), layer.scaled_spline_weight
+        )
+        return low, step, table
+
+    @classmethod
+    @torch.no_grad()
+    def from_layer(cls, layer: KANLinear, tolerance=1e-3, max_table_size=1024):
+        """
+        Tabulate a trained KANLinear, doubling the table until the interpolation error is within tolerance.
+
+        The error is checked halfway between the table points, where linear interpolation
+        is least accurate, and summed over the input features as a bound on the error of
+        each output.
+        """
+        if not isinstance(layer, KANLinear):
+            raise TypeError(
+                f"Only KANLinear layers can be tabulated, got {type(layer).__name__}; "
+                f"compile the model before pruning it."
+            )
+        table_size = min(
+            4 * (layer.grid_size + 2 * layer.spline_order) + 1, max_table_size
+        )
+        while True:
+            low, step, table = cls._tabulate(layer, table_size)
+            fine_low, fine_step, fine_table = cls._tabulate(layer, 2 * table_size - 1)
+            # Odd points of the fine table are the midpoints of the coarse one
+            midpoints = (table[:, :-1] + table[:, 1:]) / 2
+            error = (midpoints - fine_table[:, 1::2]).abs().amax(dim=1).sum(dim=0).max()
+            if error <= tolerance or table_size >= max_table_size:
+                break
+            table_size = min(2 * table_size - 1, max_table_size)
+
+        if error > tolerance:
+            print(
+                f"⚠️ Interpolation error {error:.2e} above tolerance {tolerance:.0e} "
+                f"at max_table_size={max_table_size}"
+            )
+        return cls(
+            layer.base_weight.detach().clone(),
+            layer.base_activation,
+            low.clone(),
+            step.clone(),
+            table.reshape(-1, layer.out_features).contiguous(),
+        )
+
+    def forward(self, x: torch.Tensor):
+        assert x.size(-1) == self.in_features
+        original_shape = x.shape
+        x = x.reshape(-1, self.in_features)
+
+        position = ((x - self.low) * self.inverse_step).clamp(0, self.table_size - 1)
+        index = position.floor().clamp(max=self.table_size - 2)
+        fraction = position - index
+        index = index.long() + self.offsets
+        spline_output = F.embedding_bag(
+            torch.cat([index, index + 1], dim=1),
+            self.table,
+            per_sample_weights=torch.cat([1 - fraction, fraction], dim=1).to(
+                self.table.dtype
+            ),
+            mode="sum",
+        )
+        output = F.linear(self.base_activation(x), self.base_weight) + spline_output
+        return output.view(*original_shape[:-1], self.out_features)
+
+
+class KANLUT(torch.nn.Module):
+    """
+    Stack of KANLinearLUT layers returned by KAN.compile_for_inference.
+    """
+
+    def __init__(self, layers):
+        super(KANLUT, self).__init__()
+        self.layers = torch.nn.ModuleList(layers)
+
+    @torch.no_grad()
+    def forward(self, x: torch.Tensor):
+        for layer in self.layers:
+            x = layer(x)
+        return x
@@ -0,0 +1,312 @@
+"""
+Microbenchmarks for the KAN layers in kan.py.
+
+Each benchmark times the current implementation against a reference and returns a
+DataFrame, e.g.
+
+    from machine_learning.kan_benchmarks import benchmark_b_splines
+    print(benchmark_b_splines(batch_sizes=(64, 1024), widths=(32, 128)))
+    print(benchmark_chunked_forward(layers_hidden=(64, 256, 1), batch_size=16_384))
+    print(benchmark_precision(layers_hidden=(64, 256, 1), batch_size=4096))
+"""
+
+import time
+
+import pandas as pd
+import torch
+
+from .kan import KAN, KANLinear
+
+
+def reference_b_splines(layer: KANLinear, x: torch.Tensor):
+    """
+    The original Cox-de Boor evaluation: knot-span denominators recomputed at every
+    order and a fresh (batch, in, coeff) tensor allocated per recursion level.
+    """
+    grid = layer.grid
+    x = x.unsqueeze(-1)
+    bases = ((x >= grid[:, :-1]) & (x < grid[:, 1:])).to(x.dtype)
+    for k in range(1, layer.spline_order + 1):
+        bases = (
+            (x - grid[:, : -(k + 1)])
+            / (grid[:, k:-1] - grid[:, : -(k + 1)])
+            * bases[:, :, :-1]
+        ) + (
+            (grid[:, k + 1 :] - x)
+            / (grid[:, k + 1 :] - grid[:, 1:(-k)])
+            * bases[:, :, 1:]
+        )
+    return bases.contiguous()
+
+
+def time_call(fn, n_repeats=20, n_warmup=3, device="cpu"):
+    """
+    Median wall-clock time of fn() in milliseconds.
+    """
+    for _ in range(n_warmup):
+        fn()
+    times = []
+    for _ in range(n_repeats):
+        if device == "cuda":
+            torch.cuda.synchronize()
+        start = time.perf_counter()
+        fn()
+        if device == "cuda":
+            torch.cuda.synchronize()
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2] * 1000
+
+
+def benchmark_b_splines(
+    batch_sizes=(64, 512, 4096),
+    widths=(16, 64, 256),
+    grid_size=5,
+    spline_order=3,
+    n_repeats=20,
+    device="cpu",
+):
+    """
+    Times the B-spline basis forward (inference) and forward + backward (training) passes.
+
+    Parameters:
+    - batch_sizes: tuple of int, default=(64, 512, 4096). Batch sizes to time.
+    - widths: tuple of int, default=(16, 64, 256). Layer widths (in_features = out_features).
+    - grid_size: int, default=5. Grid size of the layer.
+    - spline_order: int, default=3. Spline order of the layer.
+    - n_repeats: int, default=20. Timed repetitions per cell.
+    - device: str, default='cpu'. Torch device.
+
+    Returns:
+    - results_df: DataFrame. Reference and cached timings (ms) and the speedup per pass, batch size and width.
+    """
+    records = []
+    for width in widths:
+        layer = KANLinear(
+            width, width, grid_size=grid_size, spline_order=spline_order
+        ).to(device)
+        for batch_size in batch_sizes:
+            x = torch.rand(batch_size, width, device=device) * 2 - 1
+            x_grad = x.clone().requires_grad_(True)
+
+            def inference(fn):
+                def step():
+                    with torch.no_grad():
+                        fn(layer, x)
+
+                return step
+
+            def training(fn):
+                def step():
+                    x_grad.grad = None
+                    fn(layer, x_grad).sum().backward()
+
+                return step
+
+            cases = {
+                "forward (no_grad)": inference,
+                "forward + backward": training,
+            }
+            for pass_name, make in cases.items():
+                reference_ms = time_call(
+                    make(reference_b_splines), n_repeats, device=device
+                )
+                cached_ms = time_call(
+                    make(KANLinear.b_splines), n_repeats, device=device
+                )
+                records.append(
+                    {
+                        "Pass": pass_name,
+                        "Width": width,
+                        "Batch Size": batch_size,
+                        "Reference (ms)": reference_ms,
+                        "Cached (ms)": cached_ms,
+                        "Speedup": reference_ms / cached_ms,
+                    }
+                )
+    return pd.DataFrame(records)
+
+
+def measure_peak_memory(fn, device="cpu"):
+    """
+    Runs fn() and returns the peak memory of the tensors it allocated, in MB.
+
+    On CUDA this is torch's own peak allocation counter. On CPU the allocations and
+    frees are recorded with the torch profiler (profile_memory=True) and the peak of
+    their running total is returned, which unlike the process RSS is not hidden by
+    memory the allocator keeps from earlier calls.
+    """
+    if device == "cuda":
+        torch.cuda.synchronize()
+        torch.cuda.reset_peak_memory_stats()
+        baseline = torch.cuda.memory_allocated()
+        fn()
+        torch.cuda.synchronize()
+        return (torch.cuda.max_memory_allocated() - baseline) / 2**20
+
+    from torch.profiler import ProfilerActivity, profile
+
+    with profile(activities=[ProfilerActivity.CPU], profile_memory=True) as prof:
+        fn()
+    events = sorted(
+        (event.start_ns(), event.nbytes())
+        for event in prof.profiler.kineto_results.events()
+        if event.name() == "[memory]"
+    )
+    total = peak = 0
+    for _, nbytes in events:
+        total += nbytes
+        peak = max(peak, total)
+    return peak / 2**20
+
+
+def benchmark_chunked_forward(
+    layers_hidden=(64, 256, 1),
+    batch_size=16_384,
+    configs=None,
+    n_repeats=3,
+    device="cpu",
+):
+    """
+    Compares the full-batch and chunked KAN forward passes on time and peak memory.
+
+    Parameters:
+    - layers_hidden: tuple of int, default=(64, 256, 1). Layer widths of the KAN.
+    - batch_size: int, default=16_384. Rows per forward pass.
+    - configs: dict, default=None. Name -> set_chunking kwargs; a few batch / feature / checkpoint settings when None.
+    - n_repeats: int, default=3. Timed repetitions per configuration.
+    - device: str, default='cpu'. Torch device.
+
+    Returns:
+    - results_df: DataFrame. Time (ms), estimated and measured peak memory (MB) per pass and configuration.
+    """
+    if configs is None:
+        configs = {
+            "full batch": {},
+            "batch chunks": {"batch_chunk_size": batch_size // 8},
+            "batch + feature chunks": {
+                "batch_chunk_size": batch_size // 8,
+                "feature_chunk_size": max(layers_hidden[0] // 4, 1),
+            },
+            "batch chunks + checkpoint": {
+                "batch_chunk_size": batch_size // 8,
+                "checkpoint": True,
+            },
+        }
+
+    model = KAN(list(layers_hidden)).to(device)
+    x = torch.rand(batch_size, layers_hidden[0], device=device) * 2 - 1
+
+    def inference():
+        with torch.no_grad():
+            model(x)
+
+    def training():
+        model.zero_grad(set_to_none=True)
+        model(x).sum().backward()
+
+    records = []
+    for name, config in configs.items():
+        model.set_chunking(**config)
+        for pass_name, step, is_training in [
+            ("forward (no_grad)", inference, False),
+            ("forward + backward", training, True),
+        ]:
+            step()  # warm-up
+            time_ms = time_call(step, n_repeats, n_warmup=0, device=device)
+            # Drop the scratch buffers so the measured peak includes them, like the estimate
+            for layer in model.layers:
+                layer.release_workspace()
+            records.append(
+                {
+                    "Config": name,
+                    "Pass": pass_name,
+                    "Time (ms)": time_ms,
+                    "Estimated Peak (MB)": model.estimate_peak_memory(
+                        batch_size, training=is_training
+                    )
+                    / 2**20,
+                    "Measured Peak (MB)": measure_peak_memory(step, device=device),
+                }
+            )
+    model.set_chunking()
+    return pd.DataFrame(records)
+
+
+def benchmark_precision(
+    layers_hidden=(64, 256, 1), batch_size=4096, n_repeats=10, device="cpu"
+):
+    """
+    Compares float32, bfloat16 autocast and dynamic int8 KAN inference and training.
+
+    Parameters:
+    - layers_hidden: tuple of int, default=(64, 256, 1). Layer widths of the KAN.
+    - batch_size: int, default=4096. Rows per pass.
+    - n_repeats: int, default=10. Timed repetitions per mode.
+    - device: str, default='cpu'. Torch device (int8 runs on CPU only).
+
+    Returns:
+    - results_df: DataFrame. Time (ms), samples/s, speedup over float32 and the maximum
+      absolute deviation of the outputs from float32 per pass and precision mode.
+    """
+    model = KAN(list(layers_hidden)).to(device)
+    x = torch.rand(batch_size, layers_hidden[0], device=device) * 2 - 1
+    with torch.no_grad():
+        reference = model.eval()(x)
+
+    def autocast(enabled):
+        return torch.autocast(
+            torch.device(device).type, dtype=torch.bfloat16, enabled=enabled
+        )
+
+    def inference(module, bfloat16=False):
+        def step():
+            with torch.no_grad(), autocast(bfloat16):
+                return module(x).float()
+
+        return step
+
+    def training(bfloat16=False):
+        def step():
+            model.zero_grad(set_to_none=True)
+            with autocast(bfloat16):
+                output = model(x)
+            output.float().pow(2).mean().backward()
+            return output.detach().float()
+
+        return step
+
+    cases = [
+        ("inference", "float32", inference(model)),
+        ("inference", "bfloat16 autocast", inference(model, bfloat16=True)),
+    ]
+    if device == "cpu":
+        cases += [
+            ("inference", "int8 base", inference(model.quantize_dynamic())),
+            (
+                "inference",
+                "int8 base + spline",
+                inference(model.quantize_dynamic(spline=True)),
+            ),
+        ]
+    cases += [
+        ("training", "float32", training()),
+        ("training", "bfloat16 autocast", training(bfloat16=True)),
+    ]
+
+    records = []
+    for pass_name, mode, step in cases:
+        model.train(pass_name == "training")
+        time_ms = time_call(step, n_repeats, device=device)
+        records.append(
+            {
+                "Pass": pass_name,
+                "Precision": mode,
+                "Time (ms)": time_ms,
+                "Samples/s": batch_size / time_ms * 1000,
+                "Max Abs Deviation": (step() - reference).abs().max().item(),
+            }
+        )
+    results_df = pd.DataFrame(records)
+    baseline = results_df.groupby("Pass")["Time (ms)"].transform("first")
+    results_df["Speedup"] = baseline / results_df["Time (ms)"]
+    return results_df
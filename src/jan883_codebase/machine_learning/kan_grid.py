@@ -0,0 +1,233 @@
+"""
+Streaming grid updates for the KAN layers in kan.py.
+
+KANLinear.update_grid places the knots at the quantiles of one sorted batch and refits
+the coefficients on that same batch, so the grid only ever sees what fits in memory at
+once. StreamingGridUpdater instead streams any number of batches through the model,
+keeping a fixed-size quantile sketch of every layer input and a bounded reservoir
+sample of the rows, and then refits each layer once:
+
+    updater = StreamingGridUpdater(model, sketch_size=1024, reservoir_size=10_000)
+    for x, _ in loader:
+        updater.update(x)
+    updater.apply()
+
+or simply model.update_grid_streaming(loader).
+"""
+
+import torch
+
+
+class QuantileSketch:
+    """
+    Mergeable per-feature quantile sketch of fixed size.
+
+    Keeps at most `size` sorted points per feature, all with the same weight. While
+    fewer rows than `size` have been seen the sketch is exact; after that, merging
+    a batch re-sorts the points with their weights and keeps the values at `size`
+    evenly spaced weighted ranks, so a rank is off by at most about total / size per
+    merge. The exact minimum and maximum are tracked separately.
+
+    Parameters:
+    - n_features: int. Number of features (columns) sketched.
+    - size: int, default=1024. Points kept per feature.
+    """
+
+    def __init__(self, n_features, size=1024):
+        self.n_features = n_features
+        self.size = size
+        self.values = None  # (n_features, n_points), sorted per feature
+        self.point_weight = 1.0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def _combine(self, values, point_weight, count, x_min, x_max):
+        if self.values is None:
+            self.values, self.point_weight = values, point_weight
+            self.count, self.min, self.max = count, x_min, x_max
+        else:
+            self.min = torch.minimum(self.min, x_min)
+            self.max = torch.maximum(self.max, x_max)
+            self.count += count
+            if self.point_weight == point_weight:
+                self.values = torch.sort(torch.cat([self.values, values], dim=1))[0]
+            else:
+                self.values = self._compress(
+                    [self.values, values], [self.point_weight, point_weight]
+                )
+                self.point_weight = self.count / self.values.size(1)
+        if self.values.size(1) > self.size:
+            self.values = self._compress([self.values], [self.point_weight])
+            self.point_weight = self.count / self.size
+
+    def _compress(self, values, point_weights):
+        """
+        Resample weighted points to `size` equal-weight points per feature.
+        """
+        weights = torch.cat(
+            [
+                torch.full((v.size(1),), w, dtype=torch.float64, device=v.device)
+                for v, w in zip(values, point_weights)
+            ]
+        )
+        values, order = torch.sort(torch.cat(values, dim=1), dim=1)
+        cumulative = torch.cumsum(weights[order], dim=1)
+        n_points = min(self.size, values.size(1))
+        total = cumulative[:, -1:]
+        ranks = (torch.arange(n_points, device=values.device) + 0.5) / n_points * total
+        index = torch.searchsorted(cumulative, ranks).clamp(max=values.size(1) - 1)
+        return torch.gather(values, 1, index)
+
+    @torch.no_grad()
+    def add(self, x: torch.Tensor):
+        """
+        Add a batch of rows, shape (batch_size, n_features).
+        """
+        assert x.dim() == 2 and x.size(1) == self.n_features
+        x = x.detach()
+        self._combine(
+            torch.sort(x.T, dim=1)[0], 1.0, x.size(0), x.min(0)[0], x.max(0)[0]
+        )
+
+    def merge(self, other):
+        """
+        Merge another sketch of the same features, e.g. from another worker.
+        """
+        if other.values is not None:
+            self._combine(
+                other.values, other.point_weight, other.count, other.min, other.max
+            )
+        return self
+
+    def quantiles(self, q: torch.Tensor):
+        """
+        Per-feature quantiles at the ranks q (in [0, 1]), shape (len(q), n_features).
+
+        Matches update_grid's x_sorted[floor(q * (n - 1))] while the sketch is exact;
+        q = 0 and q = 1 return the exact minimum and maximum.
+        """
+        q = q.to(self.values.device)
+        n_points = self.values.size(1)
+        index = (q * (n_points - 1)).to(torch.int64)
+        result = self.values[:, index].T.clone()
+        result[q <= 0] = self.min
+        result[q >= 1] = self.max
+        return result
+
+
+class Reservoir:
+    """
+    Uniform sample of at most `size` rows from a stream of batches (reservoir sampling).
+
+    Parameters:
+    - size: int, default=10_000. Maximum number of rows kept.
+    - seed: int, default=None. Seed of the sampling.
+    """
+
+    def __init__(self, size=10_000, seed=None):
+        self.size = size
+        self.rows = None
+        self.n_seen = 0
+        self.generator = torch.Generator()
+        if seed is not None:
+            self.generator.manual_seed(seed)
+
+    @torch.no_grad()
+    def add(self, x: torch.Tensor):
+        """
+        Offer a batch of rows, shape (batch_size, n_features).
+        """
+        x = x.detach()
+        if self.rows is None:
+            self.rows = x.new_empty(0, x.size(1))
+
+        n_fill = min(self.size - self.rows.size(0), x.size(0))
+        if n_fill > 0:
+            self.rows = torch.cat([self.rows, x[:n_fill]])
+            self.n_seen += n_fill
+            x = x[n_fill:]
+        if x.size(0) == 0:
+            return
+
+        # Row t (0-based, over the whole stream) replaces a random slot with probability size / (t + 1)
+        seen = self.n_seen + torch.arange(x.size(0), dtype=torch.float64)
+        slots = (
+            torch.rand(x.size(0), generator=self.generator, dtype=torch.float64)
+            * (seen + 1)
+        ).to(torch.int64)
+        accepted = torch.nonzero(slots < self.size).squeeze(1)
+        # When several rows of this batch pick the same slot, the last one wins
+        winner = torch.full((self.size,), -1, dtype=torch.int64)
+        winner.scatter_reduce_(0, slots[accepted], accepted, reduce="amax")
+        replaced = torch.nonzero(winner >= 0).squeeze(1)
+        self.rows[replaced.to(self.rows.device)] = x[winner[replaced].to(x.device)]
+        self.n_seen += x.size(0)
+
+
+class StreamingGridUpdater:
+    """
+    Adapts the grids of a KAN (or a single KANLinear) to a stream of batches.
+
+    update() runs a batch through the model without gradients, adding every layer's
+    input to that layer's QuantileSketch and the raw rows to a Reservoir. apply() then
+    refits the layers in order: each gets its knots from its sketch and refits its
+    coefficients on the reservoir rows, propagated through the already refitted
+    layers before it. Because a grid update refits the coefficients to preserve the
+    layer's function, the sketches of the later layers' inputs, taken before the
+    update, stay representative.
+
+    Parameters:
+    - model: KAN or KANLinear.
+    - sketch_size: int, default=1024. Points kept per feature by each quantile sketch.
+    - reservoir_size: int, default=10_000. Rows kept to refit the spline coefficients on.
+    - margin: float, default=0.01. Margin of the uniform part of the grid.
+    - seed: int, default=None. Seed of the reservoir sampling.
+    """
+
+    def __init__(
+        self, model, sketch_size=1024, reservoir_size=10_000, margin=0.01, seed=None
+    ):
+        self.model = model
+        self.layers = list(model.layers) if hasattr(model, "layers") else [model]
+        self.margin = margin
+        self.sketches = [
+            QuantileSketch(layer.in_features, sketch_size) for layer in self.layers
+        ]
+        self.reservoir = Reservoir(reservoir_size, seed)
+
+    @torch.no_grad()
+    def update(self, x: torch.Tensor):
+        """
+        Add one batch of model inputs.
+        """
+        x = x.reshape(-1, self.layers[0].in_features)
+        self.reservoir.add(x)
+        for i, (layer, sketch) in enumerate(zip(self.layers, self.sketches)):
+            sketch.add(x)
+            if i < len(self.layers) - 1:
+                x = layer(x)
+
+    @torch.no_grad()
+    def apply(self):
+        """
+        Refit the grid and coefficients of every layer from the accumulated statistics.
+        """
+        assert self.reservoir.rows is not None, "No batches were added"
+        x = self.reservoir.rows
+        for i, (layer, sketch) in enumerate(zip(self.layers, self.sketches)):
+            q = torch.linspace(0, 1, layer.grid_size + 1, dtype=torch.float64)
+            layer.set_grid(sketch.quantiles(q), sketch.min, sketch.max, x, self.margin)
+            if i < len(self.layers) - 1:
+                x = layer(x)
+        return self.model
+
+    def fit(self, data):
+        """
+        Stream all batches of data (tensors or (x, y) tuples), then apply the update.
+        """
+        for batch in data:
+            if isinstance(batch, (tuple, list)):
+                batch = batch[0]
+            self.update(batch)
+        return self.apply()
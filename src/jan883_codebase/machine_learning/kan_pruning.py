@@ -0,0 +1,322 @@
+"""
+Pruning of trained KAN models.
+
+regularization_loss pushes most edges of a KAN towards zero, but a KANLinear still
+evaluates every edge. prune_kan scores each edge by its L1 activation magnitude on
+sample inputs (KANLinear.edge_scores), drops the edges below a threshold and every
+hidden neuron left without outgoing edges, and rebuilds each layer at its new size.
+Input features without edges are skipped before the B-spline evaluation, and a layer
+whose remaining edges are sparse enough can switch to a sparse CSR weight when that
+is measured to be faster:
+
+    pruned, report = model.prune(x_sample, threshold=1e-2)
+"""
+
+import copy
+
+import torch
+
+from .kan_benchmarks import time_call
+
+
+def layer_flops(n_inputs, n_edges, grid_size, spline_order):
+    """
+    Approximate floating point operations per row of a KANLinear forward pass.
+
+    Counts the B-spline recursion and SiLU of the evaluated inputs and two operations
+    per weight of the evaluated edges (base weight and grid_size + spline_order spline
+    coefficients).
+    """
+    n_bases = grid_size + 2 * spline_order
+    bases = n_inputs * n_bases * (1 + 5 * spline_order)
+    return bases + 4 * n_inputs + 2 * n_edges * (grid_size + spline_order + 1)
+
+
+class PrunedKANLinear(torch.nn.Module):
+    """
+    A pruned KANLinear: only the input features with edges are evaluated.
+
+    The layer is inference-only. Its weights are frozen, because further training would
+    revive the pruned edges and leave the sparse CSR weight behind, and the grid
+    updates and quantization of KANLinear raise RuntimeError; run those on the
+    model before pruning it. set_chunking and estimate_peak_memory apply to the
+    compacted layer.
+
+    Parameters:
+    - layer: KANLinear. The compacted layer, holding the kept inputs and outputs.
+    - input_index: torch.Tensor. Columns of the original input that the layer uses.
+    - in_features: int. Number of input features of the original layer.
+    - edge_mask: torch.Tensor. Kept edges of the compacted layer, shape (out, in).
+    - sparse: bool, default=False. Multiply with a sparse CSR weight instead of the dense layer.
+    """
+
+    def __init__(self, layer, input_index, in_features, edge_mask, sparse=False):
+        super(PrunedKANLinear, self).__init__()
+        self.layer = layer
+        self.in_features = in_features
+        self.out_features = layer.out_features
+        self.register_buffer("input_index", input_index)
+        self.register_buffer("edge_mask", edge_mask)
+        self.layer.requires_grad_(False)
+        self.set_sparse(sparse)
+
+    def __getstate__(self):
+        # CSR tensors cannot be pickled or deep-copied; the weight is rebuilt on load
+        state = super().__getstate__().copy()
+        state["sparse_weight"] = None
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.set_sparse(self.sparse)
+
+    @torch.no_grad()
+    def set_sparse(self, sparse=True):
+        """
+        Switch between the dense layer and a CSR weight built from its current values.
+        """
+        self.sparse = sparse
+        self.sparse_weight = None
+        if sparse:
+            # Columns are (base, spline coefficients...) per input feature
+            weight = torch.cat(
+                [
+                    self.layer.base_weight.unsqueeze(-1),
+                    self.layer.scaled_spline_weight,
+                ],
+                dim=-1,
+            )
+            weight = weight * self.edge_mask.unsqueeze(-1)
+            self.sparse_weight = weight.view(self.out_features, -1).to_sparse_csr()
+
+    def n_edges(self):
+        return int(self.edge_mask.sum())
+
+    def n_parameters(self):
+        """
+        Number of stored weight values.
+        """
+        n_coeff = self.layer.grid_size + self.layer.spline_order
+        if self.sparse:
+            return self.n_edges() * (n_coeff + 1)
+        return sum(p.numel() for p in self.layer.parameters())
+
+    def flops(self):
+        """
+        Approximate floating point operations per row (see layer_flops).
+        """
+        n_edges = (
+            self.n_edges()
+            if self.sparse
+            else self.layer.in_features * self.layer.out_features
+        )
+        return layer_flops(
+            self.layer.in_features,
+            n_edges,
+            self.layer.grid_size,
+            self.layer.spline_order,
+        )
+
+    def _sparse_output(self, x: torch.Tensor):
+        features = torch.cat(
+            [self.layer.base_activation(x).unsqueeze(-1), self.layer.b_splines(x)],
+            dim=-1,
+        ).view(x.size(0), -1)
+        return torch.sparse.mm(self.sparse_weight, features.T).T
+
+    def forward(self, x: torch.Tensor):
+        assert x.size(-1) == self.in_features
+        original_shape = x.shape
+        x = x.reshape(-1, self.in_features)
+        if self.input_index.numel() < self.in_features:
+            x = x[:, self.input_index]
+
+        if self.sparse:
+            step = self.layer.batch_chunk_size or x.size(0)
+            output = torch.cat(
+                [self._sparse_output(x_chunk) for x_chunk in x.split(step)]
+            )
+        else:
+            output = self.layer(x)
+        return output.reshape(*original_shape[:-1], self.out_features)
+
+    def set_chunking(
+        self, batch_chunk_size=None, feature_chunk_size=None, checkpoint=False
+    ):
+        """
+        Configure the memory-bounded forward pass of the compacted layer (see KANLinear.set_chunking).
+
+        The sparse representation only chunks the batch.
+        """
+        self.layer.set_chunking(batch_chunk_size, feature_chunk_size, checkpoint)
+
+    @property
+    def batch_chunk_size(self):
+        return self.layer.batch_chunk_size
+
+    @batch_chunk_size.setter
+    def batch_chunk_size(self, value):
+        self.layer.batch_chunk_size = value
+
+    def estimate_peak_memory(self, batch_size, training=False, dtype=torch.float32):
+        """
+        Estimate the peak memory of a forward pass of the compacted layer in bytes.
+        """
+        return self.layer.estimate_peak_memory(batch_size, training, dtype)
+
+    def release_workspace(self):
+        self.layer.release_workspace()
+
+    def _inference_only(self, method):
+        raise RuntimeError(
+            f"{method} is not supported on a pruned KAN layer, which is inference-only; "
+            f"call it on the model before prune_kan."
+        )
+
+    def update_grid(self, x: torch.Tensor, margin=0.01):
+        self._inference_only("update_grid")
+
+    def set_grid(self, grid_adaptive, x_min, x_max, x_fit, margin=0.01):
+        self._inference_only("set_grid")
+
+    def quantize_dynamic(self, spline=False):
+        self._inference_only("quantize_dynamic")
+
+    def regularization_loss(self, regularize_activation=1.0, regularize_entropy=1.0):
+        return self.layer.regularization_loss(regularize_activation, regularize_entropy)
+
+
+def _dense_layer_stats(layer):
+    n_parameters = sum(p.numel() for p in layer.parameters())
+    flops = layer_flops(
+        layer.in_features,
+        layer.in_features * layer.out_features,
+        layer.grid_size,
+        layer.spline_order,
+    )
+    return n_parameters, flops
+
+
+@torch.no_grad()
+def prune_kan(model, x, threshold=1e-2, sparse="auto", max_density=0.5, benchmark=True):
+    """
+    Prunes the edges and neurons of a trained KAN and shrinks its layers.
+
+    An edge is pruned when its mean absolute activation on x is below threshold. A
+    hidden neuron is pruned when none of its outgoing edges is left (working back from
+    the output layer), which also removes its incoming edges. Model inputs and
+    outputs are never removed, but inputs without edges are no longer evaluated.
+
+    Parameters:
+    - model: KAN. The trained model; it is not modified.
+    - x: torch.Tensor. Representative inputs, shape (n_samples, in_features).
+    - threshold: float, default=1e-2. Minimum mean absolute activation of a kept edge.
+    - sparse: bool or 'auto', default='auto'. Use sparse CSR weights; 'auto' times both
+      representations for layers with density <= max_density and keeps the faster one.
+    - max_density: float, default=0.5. Highest share of kept edges for which 'auto' tries the sparse form.
+    - benchmark: bool, default=True. Time both models on x.
+
+    Returns:
+    - pruned: KAN. An inference-only copy of the model with PrunedKANLinear layers.
+    - report: dict. Parameters, FLOPs per row and (with benchmark) latency before and after,
+      the maximum deviation on x and a per-layer summary.
+    """
+    was_training = model.training
+    model.eval()
+
+    inputs = []
+    h = x
+    for layer in model.layers:
+        inputs.append(h)
+        h = layer(h)
+    masks = [
+        layer.edge_scores(layer_input) > threshold
+        for layer, layer_input in zip(model.layers, inputs)
+    ]
+
+    # Work back from the outputs: a hidden neuron survives only with an outgoing edge
+    n_layers = len(model.layers)
+    out_indices = [None] * n_layers
+    in_indices = [None] * n_layers
+    out_index = torch.arange(model.layers[-1].out_features, device=x.device)
+    for i in reversed(range(n_layers)):
+        out_indices[i] = out_index
+        in_indices[i] = torch.nonzero(masks[i][out_index].any(0)).squeeze(1)
+        if in_indices[i].numel() == 0:
+            raise ValueError(
+                f"threshold={threshold} removes every edge of layer {i}; lower it."
+            )
+        out_index = in_indices[i]
+
+    pruned_layers = []
+    layer_reports = []
+    for i, layer in enumerate(model.layers):
+        # Hidden layers keep exactly the neurons the previous layer still produces
+        in_index = (
+            in_indices[i]
+            if i == 0
+            else torch.searchsorted(out_indices[i - 1], in_indices[i])
+        )
+        compact = layer.select(in_indices[i], out_indices[i])
+        edge_mask = masks[i][out_indices[i]][:, in_indices[i]]
+        compact.base_weight.mul_(edge_mask)
+        compact.spline_weight.mul_(edge_mask.unsqueeze(-1))
+        pruned_layer = PrunedKANLinear(
+            compact,
+            in_index,
+            layer.in_features if i == 0 else len(out_indices[i - 1]),
+            edge_mask,
+        )
+
+        density = edge_mask.float().mean().item()
+        use_sparse = sparse is True or (sparse == "auto" and density <= max_density)
+        if use_sparse and sparse == "auto":
+            layer_input = inputs[i][:1024]
+            if i > 0:
+                layer_input = layer_input[:, out_indices[i - 1]]
+            dense_ms = time_call(lambda: pruned_layer(layer_input), n_repeats=5)
+            pruned_layer.set_sparse(True)
+            sparse_ms = time_call(lambda: pruned_layer(layer_input), n_repeats=5)
+            use_sparse = sparse_ms < dense_ms
+        pruned_layer.set_sparse(use_sparse)
+        pruned_layers.append(pruned_layer)
+
+        n_parameters, flops = _dense_layer_stats(layer)
+        layer_reports.append(
+            {
+                "shape_before": (layer.in_features, layer.out_features),
+                "shape_after": (compact.in_features, compact.out_features),
+                "edges_kept": pruned_layer.n_edges(),
+                "density": density,
+                "representation": "sparse" if use_sparse else "dense",
+                "parameters_before": n_parameters,
+                "parameters_after": pruned_layer.n_parameters(),
+                "flops_before": flops,
+                "flops_after": pruned_layer.flops(),
+            }
+        )
+
+    pruned = copy.deepcopy(model)
+    pruned.layers = torch.nn.ModuleList(pruned_layers)
+    pruned.eval()
+
+    report = {
+        key: sum(layer_report[key] for layer_report in layer_reports)
+        for key in [
+            "parameters_before",
+            "parameters_after",
+            "flops_before",
+            "flops_after",
+        ]
+    }
+    report["flop_reduction"] = report["flops_before"] / report["flops_after"]
+    report["max_abs_deviation"] = (model(x) - pruned(x)).abs().max().item()
+    if benchmark:
+        report["latency_before_ms"] = time_call(lambda: model(x))
+        report["latency_after_ms"] = time_call(lambda: pruned(x))
+        report["speedup"] = report["latency_before_ms"] / report["latency_after_ms"]
+    report["layers"] = layer_reports
+
+    model.train(was_training)
+    pruned.train(was_training)
+    return pruned, report
@@ -1,15 +1,24 @@
 """
 This module provides functionality to embed texts using the Cohere API.
 It includes an EmbeddingFunction class for asynchronous embedding and a sync_embed function for synchronous embedding.
+sync_embed runs on one long-lived background event loop with one shared client, so synchronous callers reuse warm
+connections and can call it from notebooks and async servers that already run an event loop.
+Embeddings can be cached (see embedding_cache.py), so only texts that were never embedded reach the API,
+and the remaining batches are sent with bounded concurrency, rate limits and retries (see embedding_scheduler.py).
 """
 
 import asyncio
 import os
-from typing import List, Optional, Union
+import threading
+from typing import Any, Coroutine, List, Optional, Union
 
 import cohere
+import numpy as np
 from dotenv import load_dotenv
 
+from .embedding_cache import EmbeddingCache
+from .embedding_scheduler import EmbeddingScheduler
+
 load_dotenv()
 
 TextType = Union[str, List[str]]
@@ -25,6 +34,13 @@ class EmbeddingFunction:
         api_key: Optional[str] = None,
         batch_size: int = 50,
         model: str = "embed-english-v3.0",
+        cache: Optional[EmbeddingCache] = None,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_batch_tokens: Optional[int] = None,
+        max_retries: int = 5,
+        show_progress: bool = False,
     ):
         """
         Initialize the EmbeddingFunction.
@@ -32,11 +48,28 @@ class EmbeddingFunction:
         Args: api_key (Optional[str]): The API key for the Cohere API. If not provided, it will be fetched from the
         environment variable `CO_API_KEY`. batch_size (int): The number of texts to process in a single batch.
         Default is 50. model (str): The model to use for embedding. Default is "embed-english-v3.0".
+        cache (Optional[EmbeddingCache]): The embedding cache to read from and write to. Default is None (no cache).
+        max_concurrency (int): The maximum number of requests in flight. Default is 8. requests_per_minute
+        (Optional[float]) and tokens_per_minute (Optional[float]): Rate limits of the API key. Default is None (no
+        limit). max_batch_tokens (Optional[int]): The maximum estimated tokens per request. Default is None (no
+        limit). max_retries (int): Retries of a failed batch on 429/5xx. Default is 5. show_progress (bool): Show a
+        progress bar while embedding. Default is False.
         """
         self.api_key = api_key if api_key is not None else os.getenv("CO_API_KEY")
         self.client = cohere.AsyncClient(api_key=self.api_key)
         self.batch_size = batch_size
         self.embedding_model = model
+        self.cache = cache
+        self.scheduler = EmbeddingScheduler(
+            self.embed_batch,
+            max_concurrency=max_concurrency,
+            max_batch_size=batch_size,
+            max_batch_tokens=max_batch_tokens,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_retries=max_retries,
+            show_progress=show_progress,
+        )
 
     async def embed_batch(
         self, texts: TextType, input_type: str = "search_document"
@@ -64,7 +97,9 @@ class EmbeddingFunction:
         self, texts: TextType, input_type: str = "search_document"
     ) -> List[float]:
         """
-        Embed multiple texts, handling batching.
+        Embed multiple texts, handling batching and caching.
+
+        With a cache, only the distinct texts that are not cached yet are sent to the API.
 
         Args: texts (TextType): A single string or a list of strings to embed. input_type (str): The type of input,
         either "search_document" or "search_query". Default is "search_document".
@@ -74,12 +109,38 @@ class EmbeddingFunction:
         """
         if isinstance(texts, str):
             texts = [texts]
-        tasks = [
-            self.embed_batch(texts[i : i + self.batch_size], input_type=input_type)
-            for i in range(0, len(texts), self.batch_size)
-        ]
-        results = await asyncio.gather(*tasks)
-        return [item for sublist in results for item in sublist]
+        if self.cache is None:
+            return await self._embed_uncached(texts, input_type)
+
+        vectors = self.cache.get_many(self.embedding_model, input_type, texts)
+        misses = list(
+            dict.fromkeys(
+                text for text, vector in zip(texts, vectors) if vector is None
+            )
+        )
+        if misses:
+            # Rounded to float32 as stored, so a text embeds identically whether or not it was cached
+            embeddings = np.asarray(
+                await self._embed_uncached(misses, input_type), dtype=np.float32
+            )
+            self.cache.put_many(self.embedding_model, input_type, misses, embeddings)
+            embedded = dict(zip(misses, embeddings))
+            vectors = [
+                embedded[text] if vector is None else vector
+                for text, vector in zip(texts, vectors)
+            ]
+        return [vector.tolist() for vector in vectors]
+
+    async def _embed_uncached(self, texts: List[str], input_type: str) -> List[float]:
+        self.scheduler.max_batch_size = self.batch_size
+        return await self.scheduler.run(texts, input_type)
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Progress and throughput of the last embed_texts call to finish (see EmbeddingScheduler.metrics).
+        """
+        return self.scheduler.metrics
 
     async def embed_query(
         self,
@@ -126,12 +187,102 @@ class EmbeddingFunction:
             return await self.embed_texts(texts, input_type=input_type)
 
 
+class BackgroundEventLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+
+    Coroutines submitted from any other thread run on this loop, so clients created for it keep
+    their connection pools across calls, and callers never need a loop of their own.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="embedding-event-loop", daemon=True
+        )
+        self.thread.start()
+
+    def run(self, coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the background loop and wait for its result.
+
+        Args:
+            coroutine (Coroutine): The coroutine to run.
+            timeout (Optional[float]): Seconds to wait for the result. Default is None (no timeout).
+
+        Returns:
+            Any: The result of the coroutine.
+        """
+        if threading.current_thread() is self.thread:
+            coroutine.close()
+            raise RuntimeError(
+                "Cannot wait on the background event loop from its own thread; await the coroutine instead."
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+
+_background_loop: Optional[BackgroundEventLoop] = None
+_default_embedding_function: Optional[EmbeddingFunction] = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """
+    Return the shared background event loop, starting it on first use.
+
+    Returns:
+        BackgroundEventLoop: The shared background event loop.
+    """
+    global _background_loop
+    with _lock:
+        if _background_loop is None:
+            _background_loop = BackgroundEventLoop()
+    return _background_loop
+
+
+def run_sync(coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+
+    Works from plain scripts, threads and code already inside a running event loop (e.g. Jupyter).
+
+    Args:
+        coroutine (Coroutine): The coroutine to run.
+        timeout (Optional[float]): Seconds to wait for the result. Default is None (no timeout).
+
+    Returns:
+        Any: The result of the coroutine.
+    """
+    return get_background_loop().run(coroutine, timeout)
+
+
+def get_default_embedding_function() -> EmbeddingFunction:
+    """
+    Return the shared EmbeddingFunction used by sync_embed.
+
+    Its cache is kept in memory, or on disk at the path in the `EMBEDDING_CACHE_PATH`
+    environment variable when that is set (e.g. ~/.cache/jan883_codebase/embeddings.sqlite).
+
+    Returns:
+        EmbeddingFunction: The shared embedding function.
+    """
+    global _default_embedding_function
+    with _lock:
+        if _default_embedding_function is None:
+            _default_embedding_function = EmbeddingFunction(
+                cache=EmbeddingCache(os.getenv("EMBEDDING_CACHE_PATH") or ":memory:")
+            )
+    return _default_embedding_function
+
+
 def sync_embed(
     texts: TextType, input_type: str = "search_document"
 ) -> List[List[float]]:
     """
     Synchronously embed texts based on the input type.
 
+    Thread-safe: every call runs on the shared background event loop with the shared EmbeddingFunction.
+
     Args:
         texts (TextType): A single string or a list of strings to embed.
         input_type (str): The type of input, either "search_document" or "search_query". Default is "search_document".
@@ -139,7 +290,5 @@ def sync_embed(
     Returns:
         List[List[float]]: A list of embeddings for the provided texts.
     """
-    embedding_function = EmbeddingFunction()
-    return asyncio.get_event_loop().run_until_complete(
-        embedding_function(texts, input_type=input_type)
-    )
+    embedding_function = get_default_embedding_function()
+    return run_sync(embedding_function(texts, input_type=input_type))
@@ -0,0 +1,168 @@
+"""
+This module provides a persistent, content-addressed cache for text embeddings.
+Embeddings are stored in SQLite as float32 blobs keyed by a hash of (model, input_type, text),
+with an in-process LRU in front of it, so repeated texts never reach the embedding API twice.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "jan883_codebase", "embeddings.sqlite"
+)
+
+# Stay below SQLite's limit on the number of host parameters per statement
+_MAX_QUERY_KEYS = 500
+
+
+def cache_key(model: str, input_type: str, text: str) -> bytes:
+    """
+    Compute the content address of an embedding.
+
+    Args:
+        model (str): The embedding model.
+        input_type (str): The input type, e.g. "search_document" or "search_query".
+        text (str): The embedded text.
+
+    Returns:
+        bytes: The SHA-256 digest of model, input type and text.
+    """
+    return hashlib.sha256("\0".join([model, input_type, text]).encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """
+    An on-disk embedding cache backed by SQLite, with an in-process LRU in front of it.
+
+    Vectors are stored as raw float32 blobs, so a lookup is one indexed read plus
+    np.frombuffer. The connection is shared by all threads behind a lock.
+    """
+
+    def __init__(
+        self, path: Optional[str] = DEFAULT_CACHE_PATH, lru_size: int = 10_000
+    ):
+        """
+        Initialize the EmbeddingCache.
+
+        Args:
+            path (Optional[str]): The SQLite file. ":memory:" or None keeps the cache in memory only.
+            lru_size (int): The number of embeddings kept in the in-process LRU. Default is 10,000.
+        """
+        path = path or ":memory:"
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get_many(
+        self, model: str, input_type: str, texts: Sequence[str]
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Look up the embeddings of several texts.
+
+        Args:
+            model (str): The embedding model.
+            input_type (str): The input type.
+            texts (Sequence[str]): The texts to look up.
+
+        Returns:
+            List[Optional[np.ndarray]]: The float32 embedding of each text, or None when it is not cached.
+        """
+        keys = [cache_key(model, input_type, text) for text in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+
+            missing = list({key for key in keys if key not in found})
+            for start in range(0, len(missing), _MAX_QUERY_KEYS):
+                batch = missing[start : start + _MAX_QUERY_KEYS]
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    found[key] = vector
+                    self._remember(key, vector)
+
+        vectors = [found.get(key) for key in keys]
+        n_hits = sum(vector is not None for vector in vectors)
+        self.hits += n_hits
+        self.misses += len(vectors) - n_hits
+        return vectors
+
+    def put_many(
+        self,
+        model: str,
+        input_type: str,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+    ):
+        """
+        Store the embeddings of several texts.
+
+        Args:
+            model (str): The embedding model.
+            input_type (str): The input type.
+            texts (Sequence[str]): The embedded texts.
+            vectors (Sequence[Sequence[float]]): Their embeddings.
+        """
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = cache_key(model, input_type, text)
+                vector = np.asarray(vector, dtype=np.float32)
+                rows.append((key, vector.tobytes()))
+                self._remember(key, vector)
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+
+    def clear(self):
+        """
+        Remove every cached embedding.
+        """
+        with self._lock:
+            self._lru.clear()
+            self._connection.execute("DELETE FROM embeddings")
+            self._connection.commit()
+
+    def close(self):
+        """
+        Close the SQLite connection.
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,335 @@
+"""
+This module schedules batched embedding requests against a rate-limited API.
+It provides a TokenBucket rate limiter and an EmbeddingScheduler that runs batches through a bounded
+pool of workers, retries 429 and 5xx responses with exponential backoff and jitter, sizes batches to
+the provider's token limits and returns the embeddings in the original order.
+"""
+
+import asyncio
+import math
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from tqdm.auto import tqdm
+
+EmbedBatchFunction = Callable[[List[str], str], Awaitable[List[List[float]]]]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of tokens in a text (about four characters per token).
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated token count, at least 1.
+    """
+    return max(1, math.ceil(len(text) / 4))
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a failed request is worth retrying: rate limits (429), server errors (5xx),
+    timeouts and dropped connections.
+
+    Args:
+        error (Exception): The raised exception.
+
+    Returns:
+        bool: True when the request should be retried.
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError, OSError)) or (
+        type(error).__name__ in {"ConnectError", "ReadTimeout", "RemoteProtocolError"}
+    )
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    The delay in seconds requested by a Retry-After response header, if any.
+    """
+    headers = getattr(error, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket: `rate` tokens are added per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (Optional[float]): The maximum burst. Default is one second of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """
+        Wait until `amount` tokens are available and take them.
+
+        Requests larger than the capacity wait for a full bucket and take all of it.
+
+        Args:
+            amount (float): The number of tokens to take. Default is 1.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+class EmbeddingScheduler:
+    """
+    Runs the batches of an embedding job through a bounded pool of workers.
+
+    Each request first takes one token from the requests-per-minute bucket and its estimated
+    token count from the tokens-per-minute bucket. The buckets and the max_concurrency limit
+    are shared by all concurrent and successive runs of the scheduler. Failed requests are
+    retried with full-jitter exponential backoff when they are retryable (see is_retryable);
+    a batch rejected with 400 (e.g. too many tokens) is split in half and retried. Each run's
+    progress and throughput can be returned with return_metrics; `metrics` holds those of the
+    last run to finish.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFunction,
+        max_concurrency: int = 8,
+        max_batch_size: int = 50,
+        max_batch_tokens: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        token_counter: Callable[[str], int] = estimate_tokens,
+        show_progress: bool = False,
+    ):
+        """
+        Initialize the EmbeddingScheduler.
+
+        Args:
+            embed_batch (EmbedBatchFunction): Coroutine function embedding one batch, called as embed_batch(texts, input_type).
+            max_concurrency (int): The maximum number of requests in flight. Default is 8.
+            max_batch_size (int): The maximum number of texts per request. Default is 50.
+            max_batch_tokens (Optional[int]): The maximum estimated tokens per request. Default is None (no limit).
+            requests_per_minute (Optional[float]): Request rate limit. Default is None (no limit).
+            tokens_per_minute (Optional[float]): Token rate limit. Default is None (no limit).
+            max_retries (int): Retries per batch before the error is raised. Default is 5.
+            base_delay (float): The backoff delay of the first retry in seconds. Default is 1.0.
+            max_delay (float): The maximum backoff delay in seconds. Default is 60.0.
+            token_counter (Callable[[str], int]): Counts the tokens of a text. Default is estimate_tokens.
+            show_progress (bool): Show a progress bar over the texts. Default is False.
+        """
+        self.embed_batch = embed_batch
+        self.max_concurrency = max_concurrency
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.token_counter = token_counter
+        self.show_progress = show_progress
+        self.metrics: Dict[str, float] = {}
+        self._limits = None
+        self._limits_loop = None
+
+    def _get_limits(self):
+        """
+        The rate-limit buckets and concurrency semaphore shared by every run on the running loop.
+
+        They are created lazily because asyncio primitives belong to the loop they are first used on.
+        """
+        loop = asyncio.get_running_loop()
+        if self._limits_loop is not loop:
+            request_bucket = (
+                TokenBucket(
+                    self.requests_per_minute / 60,
+                    capacity=max(1.0, self.requests_per_minute / 60),
+                )
+                if self.requests_per_minute
+                else None
+            )
+            token_bucket = (
+                TokenBucket(
+                    self.tokens_per_minute / 60, capacity=self.tokens_per_minute / 60
+                )
+                if self.tokens_per_minute
+                else None
+            )
+            semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            self._limits = (request_bucket, token_bucket, semaphore)
+            self._limits_loop = loop
+        return self._limits
+
+    def plan_batches(self, texts: List[str]) -> List[List[int]]:
+        """
+        Split texts into batches of at most max_batch_size texts and max_batch_tokens tokens.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            List[List[int]]: The indices of the texts in each batch, in order.
+        """
+        batches, batch, batch_tokens = [], [], 0
+        for i, text in enumerate(texts):
+            n_tokens = self.token_counter(text)
+            if batch and (
+                len(batch) >= self.max_batch_size
+                or (
+                    self.max_batch_tokens is not None
+                    and batch_tokens + n_tokens > self.max_batch_tokens
+                )
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(i)
+            batch_tokens += n_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        return delay
+
+    async def run(
+        self,
+        texts: List[str],
+        input_type: str = "search_document",
+        return_metrics: bool = False,
+    ):
+        """
+        Embed all texts and return their embeddings in the original order.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            input_type (str): The input type passed to embed_batch. Default is "search_document".
+            return_metrics (bool): Also return the metrics of this run. Default is False.
+
+        Returns:
+            List[List[float]]: One embedding per text, and the run's metrics dict when return_metrics is set.
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        tokens = [self.token_counter(text) for text in texts]
+        queue: asyncio.Queue = asyncio.Queue()
+        for batch in self.plan_batches(texts):
+            queue.put_nowait((batch, 0))
+
+        request_bucket, token_bucket, semaphore = self._get_limits()
+        metrics = {
+            "texts": len(texts),
+            "texts_done": 0,
+            "requests": 0,
+            "retries": 0,
+            "splits": 0,
+            "tokens": 0,
+            "elapsed_s": 0.0,
+            "texts_per_s": 0.0,
+            "tokens_per_s": 0.0,
+        }
+        progress = tqdm(
+            total=len(texts),
+            desc="Embedding",
+            colour="#9a276b",
+            disable=not self.show_progress,
+        )
+        start = time.perf_counter()
+
+        async def embed(batch: List[int], attempt: int):
+            batch_tokens = sum(tokens[i] for i in batch)
+            try:
+                async with semaphore:
+                    if request_bucket is not None:
+                        await request_bucket.acquire()
+                    if token_bucket is not None:
+                        await token_bucket.acquire(batch_tokens)
+                    metrics["requests"] += 1
+                    embeddings = await self.embed_batch(
+                        [texts[i] for i in batch], input_type
+                    )
+            except Exception as error:
+                if getattr(error, "status_code", None) == 400 and len(batch) > 1:
+                    metrics["splits"] += 1
+                    half = len(batch) // 2
+                    queue.put_nowait((batch[:half], attempt))
+                    queue.put_nowait((batch[half:], attempt))
+                    return
+                if attempt >= self.max_retries or not is_retryable(error):
+                    raise
+                metrics["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, error))
+                queue.put_nowait((batch, attempt + 1))
+                return
+
+            for i, embedding in zip(batch, embeddings):
+                results[i] = embedding
+            metrics["texts_done"] += len(batch)
+            metrics["tokens"] += batch_tokens
+            progress.update(len(batch))
+
+        async def worker():
+            while True:
+                batch, attempt = await queue.get()
+                try:
+                    await embed(batch, attempt)
+                finally:
+                    # Requeued halves and retries are put before this batch is marked done
+                    queue.task_done()
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(max(1, min(self.max_concurrency, queue.qsize())))
+        ]
+        done_task = asyncio.ensure_future(queue.join())
+        try:
+            # Workers only finish by raising, so the first one to finish aborts the job
+            await asyncio.wait(
+                [done_task, *workers], return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in workers:
+                if task.done():
+                    task.result()
+        finally:
+            done_task.cancel()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(done_task, *workers, return_exceptions=True)
+            progress.close()
+            elapsed = time.perf_counter() - start
+            metrics["elapsed_s"] = elapsed
+            metrics["texts_per_s"] = metrics["texts_done"] / elapsed if elapsed else 0.0
+            metrics["tokens_per_s"] = metrics["tokens"] / elapsed if elapsed else 0.0
+            self.metrics = metrics
+        if return_metrics:
+            return results, metrics
+        return results
@@ -2,9 +2,8 @@
 This module contains classes for reranking documents using Cohere's reranking model and a fusion ranking approach.
 """
 
-import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import cohere
 import numpy as np
@@ -63,48 +62,92 @@ class CohereReranker(weave.Model):
 class FusionRanker(weave.Model):
     """
     A class to rerank documents using a fusion ranking approach.
+
+    Documents are identified by their `id` (added by the retrievers in retriever.py), or by source and text when
+    any document has none, so the same chunk returned by several retrievers with different scores is fused into one
+    result. Fusion scores are accumulated with numpy and the returned documents are the original dicts (the first
+    occurrence of each), with a "fusion_score" key added.
+
+    Attributes:
+        method (str): "rrf" for reciprocal rank fusion, or "score" for the weighted sum of min-max normalized
+            retriever scores. Default is "rrf".
+        k (int): The RRF rank offset. Default is 60.
+        weights (List[float], optional): A weight per ranked list. Default is None (all 1).
+        id_key (str): The document key holding the chunk id. Default is "id".
     """
 
+    method: str = "rrf"
+    k: int = 60
+    weights: Optional[List[float]] = None
+    id_key: str = "id"
+
     @weave.op()
-    def rerank(self, *docs: List[List[Dict[Any, Any]]], k=60):
+    def rerank(
+        self, *docs: List[List[Dict[Any, Any]]], k=None, weights=None, method=None
+    ):
         """
         Reranks the given documents using a fusion ranking approach.
 
         Args:
             docs (List[List[Dict[Any, Any]]]): A variable number of lists of documents to be reranked.
-            k (int, optional): A parameter to adjust the ranking score. Defaults to 60.
+            k (int, optional): A parameter to adjust the ranking score. Defaults to the k attribute (60).
+            weights (List[float], optional): A weight per list. Defaults to the weights attribute.
+            method (str, optional): "rrf" or "score". Defaults to the method attribute.
 
         Returns:
             List[Dict[Any, Any]]: A list of reranked documents with fusion scores.
         """
-
-        class NumpyEncoder(json.JSONEncoder):
-            """
-            Custom JSON encoder for handling numpy data types.
-            """
-
-            def default(self, obj):
-                if isinstance(obj, np.integer):
-                    return int(obj)
-                elif isinstance(obj, np.floating):
-                    return float(obj)
-                elif isinstance(obj, np.ndarray):
-                    return obj.tolist()
-                return super(NumpyEncoder, self).default(obj)
-
-        fused_scores = {}
-        for doc_list in docs:
+        k = self.k if k is None else k
+        weights = weights if weights is not None else self.weights
+        method = method or self.method
+        if weights is not None and len(weights) != len(docs):
+            raise ValueError(
+                f"Got {len(weights)} weights for {len(docs)} ranked lists."
+            )
+        if method not in ("rrf", "score"):
+            raise ValueError(
+                f"Unknown fusion method {method!r}; expected 'rrf' or 'score'."
+            )
+
+        # Key on chunk ids only when every document has one; row ids and store ids are not comparable with
+        # documents identified by content, so otherwise all documents are keyed by (source, text)
+        id_key = self.id_key
+        use_ids = all(
+            doc.get(id_key) is not None for doc_list in docs for doc in doc_list
+        )
+        positions = {}  # fusion key -> index into unique_docs
+        unique_docs = []
+        list_scores = []
+        list_indices = []
+        for list_index, doc_list in enumerate(docs):
+            indices = np.empty(len(doc_list), dtype=np.int64)
             for rank, doc in enumerate(doc_list):
-                doc_str = json.dumps(doc, cls=NumpyEncoder)
-                if doc_str not in fused_scores:
-                    fused_scores[doc_str] = 0
-                fused_scores[doc_str] += 1 / (rank + k)
+                key = doc[id_key] if use_ids else (doc.get("source"), doc.get("text"))
+                if key not in positions:
+                    positions[key] = len(unique_docs)
+                    unique_docs.append(doc)
+                indices[rank] = positions[key]
+            weight = 1.0 if weights is None else weights[list_index]
+            if method == "rrf":
+                scores = 1 / (np.arange(len(doc_list)) + k)
+            else:
+                raw = np.array(
+                    [doc.get("score", 0.0) for doc in doc_list], dtype=np.float64
+                )
+                low, high = (raw.min(), raw.max()) if len(raw) else (0.0, 0.0)
+                scores = (raw - low) / (high - low) if high > low else np.ones_like(raw)
+            list_indices.append(indices)
+            list_scores.append(weight * scores)
+
+        fused_scores = np.zeros(len(unique_docs))
+        if unique_docs:
+            np.add.at(
+                fused_scores, np.concatenate(list_indices), np.concatenate(list_scores)
+            )
         reranked_results = []
-        for doc, score in sorted(
-            fused_scores.items(), key=lambda x: x[1], reverse=True
-        ):
-            doc = json.loads(doc)
-            doc["fusion_score"] = score
+        for index in np.argsort(-fused_scores, kind="stable"):
+            doc = unique_docs[index]
+            doc["fusion_score"] = float(fused_scores[index])
             reranked_results.append(doc)
 
         return reranked_results
@@ -0,0 +1,140 @@
+"""
+This module benchmarks the vector indexes in vector_index.py.
+benchmark_ann builds each index on the same vectors and reports build time, per-query latency, memory and
+recall@k against the exact FlatIndex, e.g.
+
+    from rag.scripts.retrieval_benchmarks import benchmark_ann
+    print(benchmark_ann(n_vectors=200_000, dim=256))
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .vector_index import FlatIndex, make_index
+
+
+def clustered_vectors(
+    n_vectors: int, dim: int, n_clusters: int = 1000, noise: float = 0.5, seed: int = 0
+) -> np.ndarray:
+    """
+    Synthetic embeddings: Gaussian noise around random cluster centres, like topical text chunks.
+
+    Args:
+        n_vectors (int): The number of vectors.
+        dim (int): The dimension.
+        n_clusters (int): The number of clusters. Default is 1000.
+        noise (float): The noise scale relative to the unit-norm centres. Default is 0.5.
+        seed (int): The random seed. Default is 0.
+
+    Returns:
+        np.ndarray: A float32 matrix of shape (n_vectors, dim).
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    vectors = centres[rng.integers(n_clusters, size=n_vectors)]
+    vectors += rng.standard_normal((n_vectors, dim)).astype(np.float32) * (
+        noise / np.sqrt(dim)
+    )
+    return vectors
+
+
+def recall_at_k(ids: np.ndarray, exact_ids: np.ndarray) -> float:
+    """
+    The mean share of the exact top-k ids that were retrieved.
+
+    Args:
+        ids (np.ndarray): Retrieved ids, shape (n_queries, k).
+        exact_ids (np.ndarray): Exact top-k ids, shape (n_queries, k).
+
+    Returns:
+        float: recall@k in [0, 1].
+    """
+    hits = [len(np.intersect1d(a, b)) for a, b in zip(ids, exact_ids)]
+    return float(np.sum(hits) / exact_ids.size)
+
+
+def benchmark_ann(
+    vectors: Optional[np.ndarray] = None,
+    queries: Optional[np.ndarray] = None,
+    n_vectors: int = 100_000,
+    dim: int = 256,
+    n_queries: int = 200,
+    k: int = 10,
+    configs: Optional[Dict[str, Tuple[str, dict, dict]]] = None,
+) -> pd.DataFrame:
+    """
+    Compare exact and approximate indexes on build time, latency, memory and recall@k.
+
+    Args:
+        vectors (Optional[np.ndarray]): Corpus embeddings. Default is None (clustered_vectors(n_vectors, dim)).
+        queries (Optional[np.ndarray]): Query embeddings. Default is None (n_queries perturbed corpus vectors).
+        n_vectors (int): Synthetic corpus size. Default is 100,000.
+        dim (int): Synthetic dimension. Default is 256.
+        n_queries (int): The number of synthetic queries. Default is 200.
+        k (int): The number of results per query. Default is 10.
+        configs (Optional[Dict[str, Tuple[str, dict, dict]]]): Name -> (index_type, build params, search
+            settings); the search settings are set as attributes before each timed sweep. Default is a sweep
+            of IVF n_probe and HNSW ef_search.
+
+    Returns:
+        pd.DataFrame: Build time (s), latency per query (ms) for single and batched queries, memory (MB) and
+        recall@k per configuration.
+    """
+    if vectors is None:
+        vectors = clustered_vectors(n_vectors, dim)
+    if queries is None:
+        rng = np.random.default_rng(1)
+        queries = vectors[rng.integers(len(vectors), size=n_queries)]
+        queries = queries + rng.standard_normal(queries.shape).astype(np.float32) * (
+            0.5 / np.sqrt(queries.shape[1])
+        )
+    if configs is None:
+        configs = {"flat": ("flat", {}, {})}
+        for n_probe in [1, 4, 16]:
+            configs[f"ivf n_probe={n_probe}"] = ("ivf", {}, {"n_probe": n_probe})
+        for ef_search in [16, 64, 256]:
+            configs[f"hnsw ef_search={ef_search}"] = (
+                "hnsw",
+                {},
+                {"ef_search": ef_search},
+            )
+
+    exact_ids = FlatIndex(vectors).search_batch(queries, k)[0]
+    built = {}
+    records = []
+    for name, (index_type, params, settings) in configs.items():
+        key = (index_type, tuple(sorted(params.items())))
+        build_s = 0.0
+        if key not in built:
+            start = time.perf_counter()
+            index = make_index(index_type, **params)
+            index.add(vectors)
+            build_s = time.perf_counter() - start
+            built[key] = (index, build_s)
+        index, build_s = built[key]
+        for attribute, value in settings.items():
+            setattr(index, attribute, value)
+
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query, k)
+        single_ms = (time.perf_counter() - start) / len(queries) * 1000
+        start = time.perf_counter()
+        ids = index.search_batch(queries, k)[0]
+        batch_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        records.append(
+            {
+                "Index": name,
+                "Build (s)": build_s,
+                "Latency (ms/query)": single_ms,
+                "Batched Latency (ms/query)": batch_ms,
+                "Memory (MB)": getattr(index, "nbytes", np.nan) / 2**20,
+                f"Recall@{k}": recall_at_k(ids, exact_ids),
+            }
+        )
+    return pd.DataFrame(records)
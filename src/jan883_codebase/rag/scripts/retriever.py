@@ -2,31 +2,48 @@
 This module contains implementations of various retriever models for document retrieval.
 """
 
-from typing import Callable
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
 
 import bm25s
 import numpy as np
 import Stemmer
 import weave
-from scipy.spatial.distance import cdist
+from joblib import Parallel, delayed
+from pydantic import Field
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
 
 from .embedding import sync_embed
 from .reranker import CohereReranker, FusionRanker
+from .vector_index import load_index, make_index, sparse_top_k, top_k
+from .vector_store import VectorStore
 
 
 class TFIDFRetriever(weave.Model):
     """
     A retriever model that uses TF-IDF for indexing and searching documents.
 
+    The index is an L2-normalized float32 CSR matrix, so cosine similarity is a sparse matrix product and never
+    densifies the corpus. With use_inverted_index, queries are scored against the term-major (transposed) index
+    instead, which only touches the documents sharing a term with the query; those are the only results returned.
+
     Attributes:
         vectorizer (TfidfVectorizer): The TF-IDF vectorizer.
-        index (list): The indexed data.
+        index (scipy.sparse.csr_matrix): The normalized document-term matrix.
+        postings (scipy.sparse.csr_matrix): The term-document matrix (inverted index), when use_inverted_index is set.
+        use_inverted_index (bool): Score through the inverted index. Default is False.
         data (list): The data to be indexed.
     """
 
-    vectorizer: TfidfVectorizer = TfidfVectorizer()
-    index: list = None
+    vectorizer: TfidfVectorizer = Field(default_factory=TfidfVectorizer)
+    index: Any = None
+    postings: Any = None
+    use_inverted_index: bool = False
     data: list = None
 
     def index_data(self, data):
@@ -39,7 +56,28 @@ class TFIDFRetriever(weave.Model):
         """
         self.data = data
         docs = [doc["cleaned_content"] for doc in data]
-        self.index = self.vectorizer.fit_transform(docs)
+        self.index = normalize(self.vectorizer.fit_transform(docs)).astype(np.float32)
+        self.postings = self.index.T.tocsr() if self.use_inverted_index else None
+
+    def _score(self, queries, k):
+        query_vecs = normalize(self.vectorizer.transform(queries)).astype(np.float32)
+        if self.postings is not None:
+            return sparse_top_k(query_vecs @ self.postings, k)
+        # (n_docs, n_queries) sparse x dense product, one column of scores per query
+        scores = self.index @ query_vecs.T.toarray()
+        return top_k(np.ascontiguousarray(scores.T), k)
+
+    def _results(self, ids, scores):
+        return [
+            {
+                "id": int(idx),
+                "source": self.data.rows[idx]["metadata"]["source"],
+                "text": self.data.rows[idx]["cleaned_content"],
+                "score": float(score),
+            }
+            for idx, score in zip(ids, scores)
+            if idx >= 0
+        ]
 
     @weave.op()
     def search(self, query, k=5):
@@ -53,20 +91,27 @@ class TFIDFRetriever(weave.Model):
         Returns:
             list: A list of dictionaries containing the source, text, and score of the top-k results.
         """
-        query_vec = self.vectorizer.transform([query])
-        cosine_distances = cdist(
-            query_vec.todense(), self.index.todense(), metric="cosine"
-        )[0]
-        top_k_indices = cosine_distances.argsort()[:k]
+        ids, scores = self._score([query], k)
+        return self._results(ids[0], scores[0])
+
+    @weave.op()
+    def search_batch(self, queries, k=5, batch_size=256):
+        """
+        Searches the indexed data for several queries with one sparse matrix product per batch of queries.
+
+        Args:
+            queries (list): The search queries.
+            k (int): The number of top results to return per query. Default is 5.
+            batch_size (int): Queries scored per matrix product, which bounds the dense score matrix. Default is 256.
+
+        Returns:
+            list: One list of result dictionaries (source, text, score) per query.
+        """
+        queries = list(queries)
         output = []
-        for idx in top_k_indices:
-            output.append(
-                {
-                    "source": self.data.rows[idx]["metadata"]["source"],
-                    "text": self.data.rows[idx]["cleaned_content"],
-                    "score": 1 - cosine_distances[idx],
-                }
-            )
+        for start in range(0, len(queries), batch_size):
+            ids, scores = self._score(queries[start : start + batch_size], k)
+            output.extend(self._results(*result) for result in zip(ids, scores))
         return output
 
     @weave.op()
@@ -87,17 +132,65 @@ class TFIDFRetriever(weave.Model):
 stemmer: Stemmer.Stemmer = Stemmer.Stemmer("english")
 
 
+@lru_cache(maxsize=None)
+def _get_stemmer(language):
+    return stemmer if language == "english" else Stemmer.Stemmer(language)
+
+
+def _tokenize_chunk(texts, language):
+    return bm25s.tokenize(
+        texts,
+        stemmer=_get_stemmer(language) if language else None,
+        return_ids=False,
+        show_progress=False,
+    )
+
+
+def tokenize(
+    texts: List[str],
+    language: Optional[str] = "english",
+    n_jobs: int = 1,
+    chunk_size: int = 10_000,
+) -> List[List[str]]:
+    """
+    Tokenizes texts for BM25: lowercased words without English stopwords, stemmed with PyStemmer.
+
+    Args:
+        texts (List[str]): The texts to tokenize.
+        language (Optional[str]): The Snowball stemmer language, or None to skip stemming. Default is "english".
+        n_jobs (int): Worker processes tokenizing chunks of texts in parallel (joblib). Default is 1.
+        chunk_size (int): Texts per parallel chunk. Default is 10,000.
+
+    Returns:
+        List[List[str]]: The tokens of each text.
+    """
+    if n_jobs == 1 or len(texts) <= chunk_size:
+        return _tokenize_chunk(texts, language)
+    chunks = Parallel(n_jobs=n_jobs)(
+        delayed(_tokenize_chunk)(texts[start : start + chunk_size], language)
+        for start in range(0, len(texts), chunk_size)
+    )
+    return [tokens for chunk in chunks for tokens in chunk]
+
+
 class BM25Retriever(weave.Model):
     """
     A retriever model that uses BM25 for indexing and searching documents.
 
+    Every instance owns its index. Documents and queries are tokenized with the stemmer, retrieval returns
+    document ids only, and the metadata of the final top-k documents is joined afterwards.
+
     Attributes:
         index (bm25s.BM25): The BM25 index.
         data (list): The data to be indexed.
+        stemmer_language (Optional[str]): The stemmer language, or None for no stemming. Default is "english".
+        n_jobs (int): Processes used to tokenize the corpus and threads used to retrieve. Default is 1.
     """
 
-    index: bm25s.BM25 = bm25s.BM25()
+    index: bm25s.BM25 = Field(default_factory=bm25s.BM25)
     data: list = None
+    stemmer_language: Optional[str] = "english"
+    n_jobs: int = 1
 
     def index_data(self, data):
         """
@@ -110,10 +203,53 @@ class BM25Retriever(weave.Model):
         self.data = data
         corpus = [doc["cleaned_content"] for doc in data]
 
-        corpus_tokens = bm25s.tokenize(corpus)
+        corpus_tokens = tokenize(corpus, self.stemmer_language, n_jobs=self.n_jobs)
 
         self.index.index(corpus_tokens, show_progress=False)
 
+    def save_index(self, path):
+        """
+        Saves the BM25 index in the bm25s on-disk format. The documents themselves are not saved.
+
+        Args:
+            path (str): The directory to write the index to.
+        """
+        self.index.save(path, show_progress=False)
+
+    def load_index(self, path, data, mmap=True):
+        """
+        Loads a BM25 index saved with save_index instead of indexing the data again.
+
+        Args:
+            path (str): The directory the index was saved to.
+            data (list): The indexed documents, in the order they were indexed.
+            mmap (bool): Memory-map the index arrays instead of reading them. Default is True.
+        """
+        self.data = data
+        self.index = bm25s.BM25.load(path, mmap=mmap, show_progress=False)
+
+    def _retrieve(self, queries, k):
+        query_tokens = tokenize(queries, self.stemmer_language)
+        k = min(k, self.index.scores["num_docs"])
+        # Doc ids and scores, both arrays of shape (n_queries, k)
+        return self.index.retrieve(
+            query_tokens,
+            k=k,
+            n_threads=0 if self.n_jobs == 1 else self.n_jobs,
+            show_progress=False,
+        )
+
+    def _results(self, ids, scores):
+        return [
+            {
+                "id": int(idx),
+                "source": self.data.rows[idx]["metadata"]["source"],
+                "text": self.data.rows[idx]["cleaned_content"],
+                "score": float(score),
+            }
+            for idx, score in zip(ids, scores)
+        ]
+
     @weave.op()
     def search(self, query, k=5):
         """
@@ -126,22 +262,23 @@ class BM25Retriever(weave.Model):
         Returns:
             list: A list of dictionaries containing the source, text, and score of the top-k results.
         """
-        query_tokens = bm25s.tokenize(query)
-        # Get top-k results as a tuple of (doc ids, scores). Both are arrays of shape (n_queries, k)
-        results, scores = self.index.retrieve(
-            query_tokens, corpus=self.data, k=k, show_progress=False
-        )
+        ids, scores = self._retrieve([query], k)
+        return self._results(ids[0], scores[0])
 
-        output = []
-        for idx in range(results.shape[1]):
-            output.append(
-                {
-                    "source": results[0, idx]["metadata"]["source"],
-                    "text": results[0, idx]["cleaned_content"],
-                    "score": scores[0, idx],
-                }
-            )
-        return output
+    @weave.op()
+    def search_batch(self, queries, k=5):
+        """
+        Searches the indexed data for several queries in one retrieval call.
+
+        Args:
+            queries (list): The search queries.
+            k (int): The number of top results to return per query. Default is 5.
+
+        Returns:
+            list: One list of result dictionaries (source, text, score) per query.
+        """
+        ids, scores = self._retrieve(list(queries), k)
+        return [self._results(*result) for result in zip(ids, scores)]
 
     @weave.op()
     def predict(self, query: str, k: int):
@@ -164,12 +301,17 @@ class DenseRetriever(weave.Model):
 
     Attributes:
         vectorizer (Callable): The function used to generate embeddings.
-        index (np.ndarray): The indexed embeddings.
+        index_type (str): The vector index: "flat" (exact), "ivf" or "hnsw" (approximate). Default is "flat".
+        index_params (dict): Parameters of the vector index, e.g. {"n_probe": 16} or {"ef_search": 128}.
+        index (FlatIndex | IVFIndex | HNSWIndex | VectorStore): The index of the embeddings. After open_store it is
+            an on-disk VectorStore that also holds the documents, so documents can be added and deleted.
         data (list): The data to be indexed.
     """
 
     vectorizer: Callable = sync_embed
-    index: np.ndarray = None
+    index_type: str = "flat"
+    index_params: dict = None
+    index: Any = None
     data: list = None
 
     def index_data(self, data):
@@ -181,9 +323,94 @@ class DenseRetriever(weave.Model):
                          containing a key 'cleaned_content' with the text to be indexed.
         """
         self.data = data
+        if isinstance(self.index, VectorStore):
+            self.add_documents(data)
+            return
         docs = [doc["cleaned_content"] for doc in data]
         embeddings = self.vectorizer(docs)
-        self.index = np.array(embeddings)
+        self.index = make_index(self.index_type, **(self.index_params or {}))
+        self.index.add(embeddings)
+
+    def open_store(self, path, read_only=False):
+        """
+        Uses the persistent VectorStore at `path` (created if missing) as the index. Documents already in
+        the store are searchable at once, without embedding them again.
+
+        Args:
+            path (str): The store directory.
+            read_only (bool): Open without write access, e.g. from serving workers. Default is False.
+        """
+        self.index = VectorStore(path, read_only=read_only)
+        self.index_type = "store"
+
+    def add_documents(self, documents):
+        """
+        Embeds documents and appends them to the VectorStore opened with open_store.
+
+        Args:
+            documents (list): Documents with 'cleaned_content' and metadata['source'].
+
+        Returns:
+            np.ndarray: The store ids of the added documents.
+        """
+        documents = list(documents)
+        embeddings = self.vectorizer([doc["cleaned_content"] for doc in documents])
+        return self.index.add(
+            embeddings,
+            [
+                {"source": doc["metadata"]["source"], "text": doc["cleaned_content"]}
+                for doc in documents
+            ],
+        )
+
+    def delete_documents(self, ids):
+        """
+        Deletes documents from the VectorStore opened with open_store.
+
+        Args:
+            ids (list): The store ids returned by add_documents.
+        """
+        self.index.delete(ids)
+
+    def save_index(self, path):
+        """
+        Saves the vector index to a directory. The documents themselves are not saved.
+
+        Args:
+            path (str): The directory to write the index to.
+        """
+        self.index.save(path)
+
+    def load_index(self, path, data, mmap=False):
+        """
+        Loads a vector index saved with save_index instead of embedding the data again.
+
+        Args:
+            path (str): The directory the index was saved to.
+            data (list): The indexed documents, in the order they were indexed.
+            mmap (bool): Memory-map the stored vectors instead of reading them. Default is False.
+        """
+        self.data = data
+        self.index = load_index(path, mmap=mmap)
+        self.index_type = self.index.config()["type"]
+
+    def _results(self, ids, scores):
+        if isinstance(self.index, VectorStore):
+            return [
+                {**document, "score": float(score)}
+                for document, score in zip(self.index.get_metadata(ids), scores)
+                if document is not None
+            ]
+        return [
+            {
+                "id": int(idx),
+                "source": self.data.rows[idx]["metadata"]["source"],
+                "text": self.data.rows[idx]["cleaned_content"],
+                "score": float(score),
+            }
+            for idx, score in zip(ids, scores)
+            if idx >= 0
+        ]
 
     @weave.op()
     def search(self, query, k=5):
@@ -198,18 +425,25 @@ class DenseRetriever(weave.Model):
             list: A list of dictionaries containing the source, text, and score of the top-k results.
         """
         query_embedding = self.vectorizer([query], input_type="search_query")
-        cosine_distances = cdist(query_embedding, self.index, metric="cosine")[0]
-        top_k_indices = cosine_distances.argsort()[:k]
-        output = []
-        for idx in top_k_indices:
-            output.append(
-                {
-                    "source": self.data.rows[idx]["metadata"]["source"],
-                    "text": self.data.rows[idx]["cleaned_content"],
-                    "score": 1 - cosine_distances[idx],
-                }
-            )
-        return output
+        ids, scores = self.index.search(query_embedding, k)
+        return self._results(ids, scores)
+
+    @weave.op()
+    def search_batch(self, queries, k=5):
+        """
+        Searches the indexed data for several queries, embedding them in one call and scoring them
+        with one matrix product.
+
+        Args:
+            queries (list): The search queries.
+            k (int): The number of top results to return per query. Default is 5.
+
+        Returns:
+            list: One list of result dictionaries (source, text, score) per query.
+        """
+        query_embeddings = self.vectorizer(list(queries), input_type="search_query")
+        ids, scores = self.index.search_batch(query_embeddings, k)
+        return [self._results(*result) for result in zip(ids, scores)]
 
     @weave.op()
     def predict(self, query: str, k: int):
@@ -274,21 +508,52 @@ class DenseRetrieverWithReranker(weave.Model):
         return reranked
 
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _submit(fn, *args):
+    """
+    Runs fn on the shared retrieval thread pool, in a copy of the caller's context so weave
+    traces nest under the calling op.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="retriever"
+                )
+    context = contextvars.copy_context()
+    start = time.perf_counter()
+
+    def timed():
+        result = context.run(fn, *args)
+        return result, (time.perf_counter() - start) * 1000
+
+    return _executor.submit(timed)
+
+
 class HybridRetrieverReranker(weave.Model):
     """
     A hybrid retriever model that combines sparse and dense retrieval methods and uses a reranker for final ranking.
 
+    The sparse and dense retrievals run concurrently, their raw candidates are fused, and the reranker is called
+    once on the best `candidate_pool` fused documents.
+
     Attributes:
         sparse_retriever (BM25Retriever): The sparse retriever model using BM25.
-        dense_retriever (DenseRetrieverWithReranker): The dense retriever model with a reranker.
+        dense_retriever (DenseRetriever): The dense retriever model.
         fusion_ranker (FusionRanker): The fusion ranker to combine sparse and dense retrievals.
         ranker (CohereReranker): The final reranker model.
+        candidate_pool (int): The maximum number of fused documents sent to the reranker. Default is 20.
     """
 
     sparse_retriever: BM25Retriever = BM25Retriever()
-    dense_retriever: DenseRetrieverWithReranker = DenseRetrieverWithReranker()
+    dense_retriever: DenseRetriever = DenseRetriever()
     fusion_ranker: FusionRanker = FusionRanker()
     ranker: CohereReranker = CohereReranker()
+    candidate_pool: int = 20
 
     def index_data(self, data):
         """
@@ -302,28 +567,56 @@ class HybridRetrieverReranker(weave.Model):
         self.dense_retriever.index_data(data)
 
     @weave.op()
-    def predict(self, query: str, top_k: int = None, top_n: int = None):
+    def predict(
+        self,
+        query: str,
+        top_k: int = None,
+        top_n: int = None,
+        return_timings: bool = False,
+    ):
         """
         Predicts the top-n results for the given query after re-ranking.
 
         Args:
             query (str): The search query.
-            top_k (int, optional): The number of top results to retrieve before re-ranking. Default is None.
+            top_k (int, optional): The number of top results to retrieve per retriever before re-ranking. Default is None.
             top_n (int, optional): The number of top results to return after re-ranking. Default is None.
+            return_timings (bool, optional): Also return the latency of each stage in milliseconds. Default is False.
 
         Returns:
-            list: A list of dictionaries containing the source, text, and score of the top-n results.
+            list: A list of dictionaries containing the source, text, and score of the top-n results; with
+                return_timings, a tuple of that list and a dict of sparse, dense, fusion, rerank and total latencies.
         """
         if top_k and not top_n:
             top_n = top_k
             top_k = top_k * 2
         elif top_n and not top_k:
             top_k = top_n * 2
-        else:
+        elif not top_k and not top_n:
             top_k = 10
             top_n = 5
-        sparse_retrievals = self.sparse_retriever.predict(query, top_k)
-        dense_retrievals = self.dense_retriever.predict(query, top_k)
+        start = time.perf_counter()
+        sparse_future = _submit(self.sparse_retriever.predict, query, top_k)
+        dense_future = _submit(self.dense_retriever.predict, query, top_k)
+        sparse_retrievals, sparse_ms = sparse_future.result()
+        dense_retrievals, dense_ms = dense_future.result()
+
+        fusion_start = time.perf_counter()
         fused = self.fusion_ranker.predict(sparse_retrievals, dense_retrievals)
-        reranked = self.ranker.predict(query, fused, top_n)
-        return reranked
+        candidates = fused[: max(self.candidate_pool, top_n)]
+        rerank_start = time.perf_counter()
+        reranked = self.ranker.predict(query, candidates, top_n)
+        end = time.perf_counter()
+
+        if not return_timings:
+            return reranked
+        timings = {
+            "sparse_ms": sparse_ms,
+            "dense_ms": dense_ms,
+            "retrieval_ms": (fusion_start - start) * 1000,
+            "fusion_ms": (rerank_start - fusion_start) * 1000,
+            "rerank_ms": (end - rerank_start) * 1000,
+            "total_ms": (end - start) * 1000,
+            "candidates": len(candidates),
+        }
+        return reranked, timings
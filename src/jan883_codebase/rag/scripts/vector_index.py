@@ -0,0 +1,618 @@
+"""
+This module provides dense vector indexes for cosine-similarity search.
+FlatIndex is exact: vectors are stored as one contiguous, L2-normalized float32 matrix, so scoring a batch of
+queries is a single BLAS matrix product and the top-k of each query is selected with np.argpartition instead of
+a full sort. For large corpora there are two approximate (ANN) indexes with recall/latency knobs:
+IVFIndex, a pure-numpy inverted file (k-means lists, n_probe lists scanned per query), and HNSWIndex, an HNSW
+graph through the optional hnswlib package (pip install hnswlib). All indexes share the add / search /
+search_batch / save interface, and load_index restores any of them from disk.
+"""
+
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+_CONFIG_FILE = "config.json"
+
+
+def normalize(vectors) -> np.ndarray:
+    """
+    Convert vectors to a C-contiguous float32 matrix with unit L2 norm rows.
+
+    Args:
+        vectors (array-like): A vector or a matrix of vectors (one per row).
+
+    Returns:
+        np.ndarray: The normalized float32 matrix of shape (n_vectors, dim). Zero vectors stay zero.
+    """
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2, order="C")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k highest scores of every row, best first.
+
+    Uses np.argpartition, which is linear in the number of columns, and only sorts the k selected scores.
+
+    Args:
+        scores (np.ndarray): Scores of shape (n_queries, n_vectors).
+        k (int): The number of results per row.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The column indices and the scores, both of shape (n_queries, min(k, n_vectors)).
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(scores.dtype)
+    if k < scores.shape[1]:
+        indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.broadcast_to(np.arange(k), scores.shape).copy()
+    selected = np.take_along_axis(scores, indices, axis=1)
+    order = np.argsort(-selected, axis=1, kind="stable")
+    return (
+        np.take_along_axis(indices, order, axis=1),
+        np.take_along_axis(selected, order, axis=1),
+    )
+
+
+def sparse_top_k(scores, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k highest stored scores of every row of a sparse score matrix, best first.
+
+    Only the stored (non-zero) entries are candidates, so the cost is linear in their number.
+
+    Args:
+        scores (scipy.sparse matrix): Scores of shape (n_queries, n_vectors).
+        k (int): The number of results per row.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The column indices and the scores, both of shape (n_queries, k),
+        padded with index -1 and score -inf when a row has fewer than k stored entries.
+    """
+    scores = scores.tocsr()
+    ids = np.full((scores.shape[0], k), -1, dtype=np.int64)
+    values = np.full((scores.shape[0], k), -np.inf, dtype=scores.dtype)
+    for i in range(scores.shape[0]):
+        start, end = scores.indptr[i], scores.indptr[i + 1]
+        if start == end:
+            continue
+        row_ids, row_values = top_k(scores.data[start:end][None], k)
+        n = row_ids.shape[1]
+        ids[i, :n] = scores.indices[start:end][row_ids[0]]
+        values[i, :n] = row_values[0]
+    return ids, values
+
+
+class FlatIndex:
+    """
+    An exact cosine-similarity index over L2-normalized float32 vectors.
+    """
+
+    def __init__(self, vectors=None, query_batch_size: int = 256):
+        """
+        Initialize the FlatIndex.
+
+        Args:
+            vectors (array-like, optional): Vectors to index, one per row. Default is None (empty index).
+            query_batch_size (int): Queries scored per matrix product in search_batch, which bounds the
+                (query_batch_size, n_vectors) score matrix. Default is 256.
+        """
+        self.vectors: Optional[np.ndarray] = None
+        self.query_batch_size = query_batch_size
+        if vectors is not None:
+            self.add(vectors)
+
+    def __len__(self) -> int:
+        return 0 if self.vectors is None else self.vectors.shape[0]
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self.vectors is None else self.vectors.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self.vectors is None else self.vectors.nbytes
+
+    def add(self, vectors) -> np.ndarray:
+        """
+        Normalize and append vectors to the index.
+
+        Args:
+            vectors (array-like): Vectors to add, one per row.
+
+        Returns:
+            np.ndarray: The ids (row positions) of the added vectors.
+        """
+        vectors = normalize(vectors)
+        start = len(self)
+        if self.vectors is None:
+            self.vectors = vectors
+        else:
+            if vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}."
+                )
+            self.vectors = np.concatenate([self.vectors, vectors])
+        return np.arange(start, len(self))
+
+    def search_batch(self, queries, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar vectors of every query.
+
+        Args:
+            queries (array-like): Query vectors, one per row.
+            k (int): The number of results per query. Default is 5.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The ids and the cosine similarities of the results, both of shape
+            (n_queries, min(k, len(self))), most similar first.
+        """
+        queries = normalize(queries)
+        if len(self) == 0:
+            return top_k(np.empty((queries.shape[0], 0), dtype=np.float32), k)
+        ids, scores = [], []
+        for start in range(0, queries.shape[0], self.query_batch_size):
+            batch_scores = (
+                queries[start : start + self.query_batch_size] @ self.vectors.T
+            )
+            batch_ids, batch_scores = top_k(batch_scores, k)
+            ids.append(batch_ids)
+            scores.append(batch_scores)
+        return np.concatenate(ids), np.concatenate(scores)
+
+    def search(self, query, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar vectors of one query.
+
+        Args:
+            query (array-like): The query vector.
+            k (int): The number of results. Default is 5.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The ids and the cosine similarities of the results, most similar first.
+        """
+        ids, scores = self.search_batch(query, k)
+        return ids[0], scores[0]
+
+    def config(self) -> dict:
+        return {"type": "flat", "query_batch_size": self.query_batch_size}
+
+    def save(self, path: str):
+        """
+        Save the index to the directory `path`.
+
+        Args:
+            path (str): The directory to write the index to.
+        """
+        _save_config(path, self.config())
+        if self.vectors is not None:
+            np.save(os.path.join(path, "vectors.npy"), self.vectors)
+
+    @classmethod
+    def load(cls, path: str, config: dict, mmap: bool = False) -> "FlatIndex":
+        index = cls(query_batch_size=config["query_batch_size"])
+        vectors_path = os.path.join(path, "vectors.npy")
+        if os.path.exists(vectors_path):
+            index.vectors = np.load(vectors_path, mmap_mode="r" if mmap else None)
+        return index
+
+
+def _save_config(path: str, config: dict):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, _CONFIG_FILE), "w") as f:
+        json.dump(config, f)
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    n_iter: int = 10,
+    seed: int = 0,
+    chunk_size: int = 16_384,
+) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity (k-means with normalized centroids).
+
+    Args:
+        vectors (np.ndarray): L2-normalized float32 vectors, one per row.
+        n_clusters (int): The number of clusters.
+        n_iter (int): The number of Lloyd iterations. Default is 10.
+        seed (int): Seed of the initial centroid sample. Default is 0.
+        chunk_size (int): Vectors assigned per matrix product, which bounds memory. Default is 16,384.
+
+    Returns:
+        np.ndarray: The normalized float32 centroids, shape (n_clusters, dim).
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, vectors.shape[0])
+    centroids = vectors[rng.choice(vectors.shape[0], n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignment = _assign(vectors, centroids, chunk_size)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        # Re-seed empty clusters with random vectors
+        empty = np.bincount(assignment, minlength=n_clusters) == 0
+        sums[empty] = vectors[rng.choice(vectors.shape[0], int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 16_384):
+    return np.concatenate(
+        [
+            np.argmax(vectors[start : start + chunk_size] @ centroids.T, axis=1)
+            for start in range(0, vectors.shape[0], chunk_size)
+        ]
+    )
+
+
+class IVFIndex:
+    """
+    An approximate cosine-similarity index with an inverted file (IVF), in pure numpy.
+
+    The vectors are clustered into n_lists k-means lists and stored contiguously, grouped by list.
+    A query is compared with the centroids and only the vectors of its n_probe most similar lists
+    are scored exactly, so a search scans about n_probe / n_lists of the corpus. Raising n_probe
+    raises recall and latency; n_probe = n_lists is exact.
+    """
+
+    def __init__(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        train_size: int = 100_000,
+        seed: int = 0,
+    ):
+        """
+        Initialize the IVFIndex.
+
+        Args:
+            n_lists (Optional[int]): The number of lists. Default is None (about 4 * sqrt(n_vectors) at the first add).
+            n_probe (int): The number of lists scanned per query. Default is 8.
+            n_iter (int): k-means iterations when training. Default is 10.
+            train_size (int): The maximum number of vectors the k-means is trained on. Default is 100,000.
+            seed (int): Seed of the training sample and k-means. Default is 0.
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.train_size = train_size
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.vectors: Optional[np.ndarray] = None  # grouped by list
+        self.ids: Optional[np.ndarray] = None  # original id of each stored vector
+        self.offsets: Optional[np.ndarray] = (
+            None  # list l is vectors[offsets[l]:offsets[l + 1]]
+        )
+
+    def __len__(self) -> int:
+        return 0 if self.vectors is None else self.vectors.shape[0]
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self.centroids is None else self.centroids.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        if self.vectors is None:
+            return 0
+        return (
+            self.vectors.nbytes
+            + self.ids.nbytes
+            + self.centroids.nbytes
+            + self.offsets.nbytes
+        )
+
+    def train(self, vectors):
+        """
+        Learn the list centroids with spherical k-means on (a sample of) vectors.
+
+        Args:
+            vectors (array-like): Training vectors, one per row.
+        """
+        vectors = normalize(vectors)
+        if self.n_lists is None:
+            self.n_lists = max(1, int(4 * np.sqrt(vectors.shape[0])))
+        rng = np.random.default_rng(self.seed)
+        if vectors.shape[0] > self.train_size:
+            vectors = vectors[
+                rng.choice(vectors.shape[0], self.train_size, replace=False)
+            ]
+        self.centroids = spherical_kmeans(
+            vectors, self.n_lists, n_iter=self.n_iter, seed=self.seed
+        )
+        self.n_lists = self.centroids.shape[0]
+
+    def add(self, vectors) -> np.ndarray:
+        """
+        Normalize vectors and add them to their lists, training the index first if needed.
+
+        Args:
+            vectors (array-like): Vectors to add, one per row.
+
+        Returns:
+            np.ndarray: The ids of the added vectors.
+        """
+        vectors = normalize(vectors)
+        if self.centroids is None:
+            self.train(vectors)
+        start = len(self)
+        new_ids = np.arange(start, start + vectors.shape[0])
+        lists = _assign(vectors, self.centroids)
+        if self.vectors is not None:
+            old_lists = np.repeat(np.arange(self.n_lists), np.diff(self.offsets))
+            lists = np.concatenate([old_lists, lists])
+            vectors = np.concatenate([self.vectors, vectors])
+            new_ids = np.concatenate([self.ids, new_ids])
+        order = np.argsort(lists, kind="stable")
+        self.vectors = np.ascontiguousarray(vectors[order])
+        self.ids = new_ids[order]
+        self.offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(lists, minlength=self.n_lists))]
+        )
+        return np.arange(start, len(self))
+
+    def search_batch(self, queries, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find approximately the k most similar vectors of every query.
+
+        Args:
+            queries (array-like): Query vectors, one per row.
+            k (int): The number of results per query. Default is 5.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The ids and the cosine similarities of the results, both of shape
+            (n_queries, k), most similar first. Queries with fewer than k candidates are padded with id -1
+            and score -inf.
+        """
+        queries = normalize(queries)
+        ids = np.full((queries.shape[0], k), -1, dtype=np.int64)
+        scores = np.full((queries.shape[0], k), -np.inf, dtype=np.float32)
+        if len(self) == 0:
+            return ids, scores
+        n_probe = min(self.n_probe, self.n_lists)
+        probes = top_k(queries @ self.centroids.T, n_probe)[0]
+        starts, ends = self.offsets[probes], self.offsets[probes + 1]
+        for i, query in enumerate(queries):
+            candidates = np.concatenate(
+                [np.arange(s, e) for s, e in zip(starts[i], ends[i])]
+            )
+            if candidates.size == 0:
+                continue
+            candidate_ids, candidate_scores = top_k(
+                (self.vectors[candidates] @ query)[None], k
+            )
+            n = candidate_ids.shape[1]
+            ids[i, :n] = self.ids[candidates[candidate_ids[0]]]
+            scores[i, :n] = candidate_scores[0]
+        return ids, scores
+
+    def search(self, query, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find approximately the k most similar vectors of one query (see search_batch).
+        """
+        ids, scores = self.search_batch(query, k)
+        return ids[0], scores[0]
+
+    def config(self) -> dict:
+        return {
+            "type": "ivf",
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "n_iter": self.n_iter,
+            "train_size": self.train_size,
+            "seed": self.seed,
+        }
+
+    def save(self, path: str):
+        """
+        Save the index to the directory `path`.
+
+        Args:
+            path (str): The directory to write the index to.
+        """
+        _save_config(path, self.config())
+        if self.centroids is not None:
+            np.save(os.path.join(path, "centroids.npy"), self.centroids)
+        if self.vectors is not None:
+            for name in ["vectors", "ids", "offsets"]:
+                np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, path: str, config: dict, mmap: bool = False) -> "IVFIndex":
+        config = {key: value for key, value in config.items() if key != "type"}
+        index = cls(**config)
+        for name in ["centroids", "vectors", "ids", "offsets"]:
+            array_path = os.path.join(path, f"{name}.npy")
+            if os.path.exists(array_path):
+                mmap_mode = "r" if mmap and name == "vectors" else None
+                setattr(index, name, np.load(array_path, mmap_mode=mmap_mode))
+        return index
+
+
+def _require_hnswlib():
+    try:
+        import hnswlib
+    except ImportError as e:
+        raise ImportError("HNSWIndex requires hnswlib: pip install hnswlib") from e
+    return hnswlib
+
+
+class HNSWIndex:
+    """
+    An approximate cosine-similarity index on an HNSW graph, through hnswlib.
+
+    M (graph degree) and ef_construction trade build time and memory for graph quality;
+    ef_search trades query latency for recall and can be changed at any time.
+    """
+
+    def __init__(
+        self,
+        M: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        num_threads: int = -1,
+        seed: int = 0,
+    ):
+        """
+        Initialize the HNSWIndex.
+
+        Args:
+            M (int): The number of graph neighbours per node. Default is 16.
+            ef_construction (int): The candidate list size while building. Default is 200.
+            ef_search (int): The candidate list size while searching (at least k is used). Default is 64.
+            num_threads (int): Threads used to add and search. Default is -1 (all cores).
+            seed (int): Seed of the graph construction. Default is 0.
+        """
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.num_threads = num_threads
+        self.seed = seed
+        self.dim: Optional[int] = None
+        self.graph = None
+
+    def __len__(self) -> int:
+        return 0 if self.graph is None else self.graph.get_current_count()
+
+    def _init_graph(self, dim: int, max_elements: int):
+        hnswlib = _require_hnswlib()
+        self.dim = dim
+        self.graph = hnswlib.Index(space="ip", dim=dim)
+        self.graph.init_index(
+            max_elements=max_elements,
+            ef_construction=self.ef_construction,
+            M=self.M,
+            random_seed=self.seed,
+        )
+
+    def add(self, vectors) -> np.ndarray:
+        """
+        Normalize vectors and insert them into the graph.
+
+        Args:
+            vectors (array-like): Vectors to add, one per row.
+
+        Returns:
+            np.ndarray: The ids of the added vectors.
+        """
+        vectors = normalize(vectors)
+        start = len(self)
+        if self.graph is None:
+            self._init_graph(vectors.shape[1], vectors.shape[0])
+        elif start + vectors.shape[0] > self.graph.get_max_elements():
+            self.graph.resize_index(
+                max(start + vectors.shape[0], 2 * self.graph.get_max_elements())
+            )
+        ids = np.arange(start, start + vectors.shape[0])
+        self.graph.add_items(vectors, ids, num_threads=self.num_threads)
+        return ids
+
+    def search_batch(self, queries, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find approximately the k most similar vectors of every query.
+
+        Args:
+            queries (array-like): Query vectors, one per row.
+            k (int): The number of results per query. Default is 5.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The ids and the cosine similarities of the results, both of shape
+            (n_queries, min(k, len(self))), most similar first.
+        """
+        queries = normalize(queries)
+        k = min(k, len(self))
+        if k == 0:
+            return top_k(np.empty((queries.shape[0], 0), dtype=np.float32), 0)
+        self.graph.set_ef(max(self.ef_search, k))
+        labels, distances = self.graph.knn_query(
+            queries, k=k, num_threads=self.num_threads
+        )
+        return labels.astype(np.int64), 1 - distances
+
+    def search(self, query, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find approximately the k most similar vectors of one query (see search_batch).
+        """
+        ids, scores = self.search_batch(query, k)
+        return ids[0], scores[0]
+
+    def config(self) -> dict:
+        return {
+            "type": "hnsw",
+            "M": self.M,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "num_threads": self.num_threads,
+            "seed": self.seed,
+            "dim": self.dim,
+        }
+
+    def save(self, path: str):
+        """
+        Save the index to the directory `path`.
+
+        Args:
+            path (str): The directory to write the index to.
+        """
+        _save_config(path, self.config())
+        if self.graph is not None:
+            self.graph.save_index(os.path.join(path, "graph.bin"))
+
+    @classmethod
+    def load(cls, path: str, config: dict, mmap: bool = False) -> "HNSWIndex":
+        config = dict(config)
+        config.pop("type")
+        dim = config.pop("dim")
+        index = cls(**config)
+        graph_path = os.path.join(path, "graph.bin")
+        if os.path.exists(graph_path):
+            index.dim = dim
+            index.graph = _require_hnswlib().Index(space="ip", dim=dim)
+            index.graph.load_index(graph_path)
+        return index
+
+
+INDEX_TYPES = {"flat": FlatIndex, "ivf": IVFIndex, "hnsw": HNSWIndex}
+
+
+def make_index(index_type: str = "flat", **params):
+    """
+    Create an empty index by name.
+
+    Args:
+        index_type (str): "flat" (exact), "ivf" or "hnsw". Default is "flat".
+        **params: Parameters of the index class.
+
+    Returns:
+        FlatIndex, IVFIndex or HNSWIndex: The new index.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Unknown index_type {index_type!r}; expected one of {sorted(INDEX_TYPES)}."
+        )
+    return INDEX_TYPES[index_type](**params)
+
+
+def load_index(path: str, mmap: bool = False):
+    """
+    Load an index saved with its save method.
+
+    Args:
+        path (str): The directory the index was saved to.
+        mmap (bool): Memory-map the stored vectors instead of reading them (flat and ivf). Default is False.
+
+    Returns:
+        FlatIndex, IVFIndex or HNSWIndex: The loaded index.
+    """
+    with open(os.path.join(path, _CONFIG_FILE)) as f:
+        config = json.load(f)
+    return INDEX_TYPES[config["type"]].load(path, config, mmap=mmap)
@@ -0,0 +1,417 @@
+"""
+This module provides a persistent, memory-mapped vector and metadata store.
+The store is a directory of immutable segments plus a manifest. Every add writes a new segment (L2-normalized
+float32 vectors, int64 ids and JSON metadata, each a flat file opened with np.memmap) and then atomically
+replaces the manifest, so the manifest is the append log: readers only ever see fully written segments.
+Deletes append ids to a tombstone file and are masked at search time; compact merges the segments and drops
+deleted rows, optionally in a background thread.
+
+One process writes; any number of processes can open the same directory read-only. Their memory maps share
+the operating system's page cache, so opening is zero-copy and restarting does not re-embed anything.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .vector_index import normalize, top_k
+
+_MANIFEST = "manifest.json"
+_SEGMENT_FILES = ["vectors.f32", "ids.i64", "offsets.i64", "meta.jsonl"]
+
+
+class _Segment:
+    """
+    An immutable, memory-mapped segment: vectors, ids (ascending) and metadata.
+    """
+
+    def __init__(self, path: str, name: str, count: int, dim: int):
+        self.name = name
+        self.count = count
+        prefix = os.path.join(path, name)
+        self.vectors = np.memmap(
+            f"{prefix}.vectors.f32", dtype=np.float32, mode="r", shape=(count, dim)
+        )
+        self.ids = np.memmap(
+            f"{prefix}.ids.i64", dtype=np.int64, mode="r", shape=(count,)
+        )
+        self.offsets = np.memmap(
+            f"{prefix}.offsets.i64", dtype=np.int64, mode="r", shape=(count + 1,)
+        )
+        meta_size = int(self.offsets[-1])
+        self.metadata = (
+            np.memmap(
+                f"{prefix}.meta.jsonl", dtype=np.uint8, mode="r", shape=(meta_size,)
+            )
+            if meta_size
+            else np.empty(0, dtype=np.uint8)
+        )
+
+    def get_metadata(self, row: int) -> dict:
+        return json.loads(
+            self.metadata[self.offsets[row] : self.offsets[row + 1]].tobytes()
+        )
+
+    @staticmethod
+    def write(
+        path: str,
+        name: str,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        metadata: Sequence[dict],
+    ):
+        prefix = os.path.join(path, name)
+        lines = [
+            (json.dumps(item, default=str) + "\n").encode("utf-8") for item in metadata
+        ]
+        offsets = np.concatenate([[0], np.cumsum([len(line) for line in lines])])
+        payloads = [
+            np.ascontiguousarray(vectors, dtype=np.float32).tobytes(),
+            np.asarray(ids, dtype=np.int64).tobytes(),
+            offsets.astype(np.int64).tobytes(),
+            b"".join(lines),
+        ]
+        for suffix, payload in zip(_SEGMENT_FILES, payloads):
+            with open(f"{prefix}.{suffix}", "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class VectorStore:
+    """
+    A persistent vector store of memory-mapped segments with incremental add, delete and compaction.
+    """
+
+    def __init__(self, path: str, dim: Optional[int] = None, read_only: bool = False):
+        """
+        Open or create a VectorStore.
+
+        Args:
+            path (str): The store directory.
+            dim (Optional[int]): The vector dimension. Default is None (taken from the first add).
+            read_only (bool): Open without write access, e.g. from serving workers. Default is False.
+        """
+        self.path = path
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        self.manifest = {
+            "version": 0,
+            "dim": dim,
+            "next_id": 0,
+            "next_segment": 0,
+            "segments": [],
+            "tombstones": None,
+            "n_tombstones": 0,
+        }
+        if os.path.exists(os.path.join(path, _MANIFEST)):
+            self._load_manifest()
+        elif read_only:
+            raise FileNotFoundError(f"No vector store at {path}")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._write_manifest(self.manifest)
+            self._open()
+
+    # Manifest and segments -------------------------------------------------
+
+    def _read_manifest(self) -> dict:
+        with open(os.path.join(self.path, _MANIFEST)) as f:
+            return json.load(f)
+
+    def _load_manifest(self, manifest: Optional[dict] = None):
+        # A compaction can remove the files of a manifest between reading and opening it; read again
+        for attempt in range(5):
+            try:
+                self.manifest = manifest or self._read_manifest()
+                self._open()
+                return
+            except FileNotFoundError:
+                if attempt == 4:
+                    raise
+                manifest = None
+
+    def _write_manifest(self, manifest: dict):
+        manifest["version"] += 1
+        temporary = os.path.join(self.path, f"{_MANIFEST}.tmp")
+        with open(temporary, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, os.path.join(self.path, _MANIFEST))
+        self.manifest = manifest
+
+    def _open(self):
+        dim = self.manifest["dim"]
+        previous = {segment.name: segment for segment in getattr(self, "segments", [])}
+        self.segments: List[_Segment] = [
+            previous.get(name) or _Segment(self.path, name, count, dim)
+            for name, count in self.manifest["segments"]
+        ]
+        tombstones = self.manifest["tombstones"]
+        if tombstones and self.manifest["n_tombstones"]:
+            deleted = np.fromfile(
+                os.path.join(self.path, tombstones),
+                dtype=np.int64,
+                count=self.manifest["n_tombstones"],
+            )
+        else:
+            deleted = np.empty(0, dtype=np.int64)
+        self.deleted = np.unique(deleted)
+        self._live: Dict[str, np.ndarray] = {}
+
+    def refresh(self) -> bool:
+        """
+        Pick up segments and deletes committed by the writer since the store was opened.
+
+        Returns:
+            bool: True when the store changed.
+        """
+        manifest = self._read_manifest()
+        if manifest["version"] == self.manifest["version"]:
+            return False
+        with self._lock:
+            self._load_manifest(manifest)
+        return True
+
+    def _live_mask(self, segment: _Segment) -> Optional[np.ndarray]:
+        """
+        The rows of a segment that are not deleted, or None when none are deleted.
+        """
+        if segment.name not in self._live:
+            mask = None
+            if self.deleted.size:
+                mask = ~np.isin(segment.ids, self.deleted, assume_unique=True)
+                if mask.all():
+                    mask = None
+            self._live[segment.name] = mask
+        return self._live[segment.name]
+
+    def _check_writable(self):
+        if self.read_only:
+            raise PermissionError("The vector store was opened read-only.")
+
+    # Public API --------------------------------------------------------------
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.manifest["dim"]
+
+    def __len__(self) -> int:
+        n_live = 0
+        for segment in self.segments:
+            mask = self._live_mask(segment)
+            n_live += segment.count if mask is None else int(mask.sum())
+        return n_live
+
+    def add(self, vectors, metadata: Optional[Sequence[dict]] = None) -> np.ndarray:
+        """
+        Normalize vectors and append them, with their metadata, as a new segment.
+
+        Args:
+            vectors (array-like): Vectors to add, one per row.
+            metadata (Optional[Sequence[dict]]): A JSON-serializable dict per vector. Default is None (empty dicts).
+
+        Returns:
+            np.ndarray: The ids assigned to the vectors.
+        """
+        self._check_writable()
+        vectors = normalize(vectors)
+        if len(vectors) == 0:
+            return np.empty(0, dtype=np.int64)
+        metadata = list(metadata) if metadata is not None else [{}] * len(vectors)
+        if len(metadata) != len(vectors):
+            raise ValueError(
+                f"Got {len(vectors)} vectors but {len(metadata)} metadata entries."
+            )
+        with self._lock:
+            manifest = json.loads(json.dumps(self.manifest))
+            if manifest["dim"] is None:
+                manifest["dim"] = vectors.shape[1]
+            elif vectors.shape[1] != manifest["dim"]:
+                raise ValueError(
+                    f"Expected vectors of dimension {manifest['dim']}, got {vectors.shape[1]}."
+                )
+            ids = np.arange(manifest["next_id"], manifest["next_id"] + len(vectors))
+            name = f"segment-{manifest['next_segment']:06d}"
+            _Segment.write(self.path, name, vectors, ids, metadata)
+            manifest["segments"].append([name, len(vectors)])
+            manifest["next_id"] += len(vectors)
+            manifest["next_segment"] += 1
+            self._write_manifest(manifest)
+            self._open()
+        return ids
+
+    def delete(self, ids: Sequence[int]):
+        """
+        Mark vectors as deleted. They are skipped by search and removed by compact.
+
+        Args:
+            ids (Sequence[int]): The ids to delete.
+        """
+        self._check_writable()
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            manifest = json.loads(json.dumps(self.manifest))
+            if manifest["tombstones"] is None:
+                manifest["tombstones"] = (
+                    f"tombstones-{manifest['next_segment']:06d}.i64"
+                )
+                manifest["next_segment"] += 1
+            path = os.path.join(self.path, manifest["tombstones"])
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # Overwrite anything past the committed count left by an interrupted delete
+                f.seek(manifest["n_tombstones"] * 8)
+                f.write(ids.tobytes())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            manifest["n_tombstones"] += len(ids)
+            self._write_manifest(manifest)
+            self._open()
+
+    def get_metadata(self, ids: Sequence[int]) -> List[Optional[dict]]:
+        """
+        Look up the metadata of vectors by id.
+
+        Args:
+            ids (Sequence[int]): The ids to look up.
+
+        Returns:
+            List[Optional[dict]]: The metadata of each id, or None when it does not exist or was deleted.
+        """
+        deleted = set(self.deleted.tolist())
+        results = []
+        for id_ in ids:
+            item = None
+            if id_ not in deleted:
+                for segment in self.segments:
+                    row = int(np.searchsorted(segment.ids, id_))
+                    if row < segment.count and segment.ids[row] == id_:
+                        item = segment.get_metadata(row)
+                        break
+            results.append(item)
+        return results
+
+    def search_batch(self, queries, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar live vectors of every query.
+
+        Args:
+            queries (array-like): Query vectors, one per row.
+            k (int): The number of results per query. Default is 5.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The ids and the cosine similarities, both of shape (n_queries, k),
+            most similar first; padded with id -1 and score -inf when fewer than k vectors are live.
+        """
+        queries = normalize(queries)
+        all_ids = [np.full((queries.shape[0], k), -1, dtype=np.int64)]
+        all_scores = [np.full((queries.shape[0], k), -np.inf, dtype=np.float32)]
+        for segment in self.segments:
+            scores = queries @ segment.vectors.T
+            mask = self._live_mask(segment)
+            if mask is not None:
+                scores[:, ~mask] = -np.inf
+            rows, segment_scores = top_k(scores, k)
+            all_ids.append(np.asarray(segment.ids)[rows])
+            all_scores.append(segment_scores)
+        ids = np.concatenate(all_ids, axis=1)
+        scores = np.concatenate(all_scores, axis=1)
+        best, best_scores = top_k(scores, k)
+        ids = np.take_along_axis(ids, best, axis=1)
+        ids[np.isneginf(best_scores)] = -1
+        return ids, best_scores
+
+    def search(self, query, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar live vectors of one query (see search_batch).
+        """
+        ids, scores = self.search_batch(query, k)
+        return ids[0], scores[0]
+
+    def compact(self):
+        """
+        Merge all segments into one and drop deleted rows.
+
+        Adds and deletes made while compacting are kept: only the segments present when compaction
+        started are replaced, and tombstones of vectors that still exist afterwards are carried over.
+        """
+        self._check_writable()
+        with self._lock:
+            snapshot = list(self.segments)
+            manifest = json.loads(json.dumps(self.manifest))
+            name = f"segment-{manifest['next_segment']:06d}"
+            manifest["next_segment"] += 1
+            self._write_manifest(manifest)
+        if not snapshot:
+            return
+
+        vectors, ids, metadata = [], [], []
+        for segment in snapshot:
+            mask = self._live_mask(segment)
+            rows = np.arange(segment.count) if mask is None else np.flatnonzero(mask)
+            vectors.append(segment.vectors[rows])
+            ids.append(segment.ids[rows])
+            metadata.extend(segment.get_metadata(row) for row in rows)
+        ids = np.concatenate(ids)
+        if len(ids):
+            _Segment.write(self.path, name, np.concatenate(vectors), ids, metadata)
+
+        with self._lock:
+            manifest = json.loads(json.dumps(self.manifest))
+            replaced = {segment.name for segment in snapshot}
+            remaining = [s for s in manifest["segments"] if s[0] not in replaced]
+            # Merged rows keep ascending ids and come before any segment added meanwhile
+            manifest["segments"] = ([[name, len(ids)]] if len(ids) else []) + remaining
+            existing = np.concatenate(
+                [ids] + [self._segment(s[0]).ids for s in remaining]
+            )
+            kept = self.deleted[np.isin(self.deleted, existing)]
+            obsolete = [
+                f"{segment}.{suffix}"
+                for segment in replaced
+                for suffix in _SEGMENT_FILES
+            ]
+            if manifest["tombstones"]:
+                obsolete.append(manifest["tombstones"])
+            manifest["tombstones"] = None
+            manifest["n_tombstones"] = 0
+            if kept.size:
+                manifest["tombstones"] = (
+                    f"tombstones-{manifest['next_segment']:06d}.i64"
+                )
+                manifest["next_segment"] += 1
+                kept.tofile(os.path.join(self.path, manifest["tombstones"]))
+                manifest["n_tombstones"] = int(kept.size)
+            self._write_manifest(manifest)
+            self._open()
+        # Readers that still map the old files keep them alive until they refresh (POSIX unlink semantics)
+        for file_name in obsolete:
+            try:
+                os.remove(os.path.join(self.path, file_name))
+            except FileNotFoundError:
+                pass
+
+    def _segment(self, name: str) -> _Segment:
+        return next(segment for segment in self.segments if segment.name == name)
+
+    def compact_in_background(self) -> threading.Thread:
+        """
+        Run compact in a daemon thread; searches and writes keep working meanwhile.
+
+        Returns:
+            threading.Thread: The compaction thread (already running; join it to wait).
+        """
+        self._check_writable()
+        if self._compaction is not None and self._compaction.is_alive():
+            return self._compaction
+        self._compaction = threading.Thread(
+            target=self.compact, name="vector-store-compaction", daemon=True
+        )
+        self._compaction.start()
+        return self._compaction
@@ -0,0 +1,117 @@
+"""
+Load test for the micro-batching prediction server.
+
+Fires n_requests single-row /predict calls from `concurrency` client threads and
+reports the client-side p50/p99 latency and throughput, next to the server's own
+/metrics. Either point it at a running server with --url, or pass --pipeline to
+start a local instance in a background thread first.
+
+Usage:
+    python -m serving.load_test --pipeline model.joblib --n-features 10
+    python -m serving.load_test --url http://localhost:8080 --n-features 10 --concurrency 64
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from werkzeug.serving import make_server
+
+from .model_server import create_app
+
+
+def _post(url, payload):
+    data = json.dumps(payload).encode()
+    req = urllib.request.Request(
+        url, data=data, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req) as response:
+        return json.loads(response.read())
+
+
+def _get(url):
+    with urllib.request.urlopen(url) as response:
+        return json.loads(response.read())
+
+
+def start_local_server(pipeline_path, port=8080, **kwargs):
+    """
+    Starts create_app(pipeline_path, **kwargs) in a daemon thread and returns the server.
+
+    Call server.shutdown() to stop it.
+    """
+    app = create_app(pipeline_path, **kwargs)
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_load_test(url, n_features, n_requests=2000, concurrency=32, random_state=0):
+    """
+    Sends n_requests single-row predictions with `concurrency` threads.
+
+    Parameters:
+    - url: str. Base URL of the server, e.g. 'http://localhost:8080'.
+    - n_features: int. Number of features per row.
+    - n_requests: int, default=2000. Total number of requests.
+    - concurrency: int, default=32. Number of client threads.
+    - random_state: int, default=0. Seed of the random rows.
+
+    Returns:
+    - report: dict. Client-side latency and throughput plus the server's /metrics.
+    """
+    rows = np.random.default_rng(random_state).normal(size=(n_requests, n_features))
+    _post(f"{url}/metrics/reset", {})
+
+    def one_request(row):
+        start = time.perf_counter()
+        _post(f"{url}/predict", {"instances": [row.tolist()]})
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        latencies = np.array(list(executor.map(one_request, rows))) * 1000
+    elapsed = time.perf_counter() - start
+
+    return {
+        "client_p50_ms": float(np.percentile(latencies, 50)),
+        "client_p99_ms": float(np.percentile(latencies, 99)),
+        "client_throughput_rps": n_requests / elapsed,
+        "server": _get(f"{url}/metrics"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the prediction server.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--pipeline", default=None, help="Start a local server first.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--n-features", type=int, required=True)
+    parser.add_argument("--n-requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-latency-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.pipeline is not None:
+        server = start_local_server(
+            args.pipeline,
+            port=args.port,
+            max_batch_size=args.max_batch_size,
+            max_latency_ms=args.max_latency_ms,
+        )
+        url = f"http://127.0.0.1:{args.port}"
+
+    report = run_load_test(
+        url, args.n_features, n_requests=args.n_requests, concurrency=args.concurrency
+    )
+    print(json.dumps(report, indent=2))
+
+    if server is not None:
+        server.shutdown()
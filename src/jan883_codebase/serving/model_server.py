@@ -0,0 +1,389 @@
+"""
+Micro-batching prediction server for a persisted scaler + estimator pipeline.
+
+The pipeline is loaded once, memory-mapped with joblib, and shared by all request
+threads. Concurrent /predict requests are queued and a single worker thread groups
+them into micro-batches: a batch is predicted as soon as it holds max_batch_size
+rows or the oldest request has waited max_latency_ms, whichever comes first. One
+vectorised predict call per batch and input format replaces one call per request.
+
+Usage:
+    save_pipeline(best_model, "model.joblib", scaler=scaler)
+    python -m serving.model_server model.joblib --port 8080
+    python -m serving.model_server model.onnx --port 8080   # see serving.onnx_export
+
+    POST /predict  {"instances": [[5.1, 3.5, 1.4, 0.2]]}  or  {"instances": [{"col": 1.0, ...}]}
+    GET  /metrics  p50/p99 latency (ms), throughput and batch statistics
+"""
+
+import argparse
+import atexit
+import queue
+import threading
+import time
+from collections import deque
+
+import joblib
+import numpy as np
+import pandas as pd
+from flask import Flask, jsonify, request
+from sklearn.pipeline import Pipeline
+
+
+def save_pipeline(model, path, scaler=None):
+    """
+    Persists a fitted model, optionally preceded by its fitted scaler, as one joblib file.
+
+    The file is written uncompressed so that load_pipeline can memory-map its arrays.
+
+    Parameters:
+    - model: fitted estimator, or a fitted Pipeline.
+    - path: str. Destination file, e.g. 'model.joblib'.
+    - scaler: fitted scaler, default=None. E.g. the scaler used by scale_X_train_X_test.
+
+    Returns:
+    - pipeline: The persisted Pipeline (or model when no scaler is given).
+    """
+    pipeline = (
+        model if scaler is None else Pipeline([("scaler", scaler), ("model", model)])
+    )
+    joblib.dump(pipeline, path)
+    print(f"💾 Pipeline saved to: {path}")
+    return pipeline
+
+
+def load_pipeline(path, mmap_mode="r"):
+    """
+    Loads a pipeline saved by save_pipeline, memory-mapping its large numpy arrays.
+
+    Files ending in .onnx (see serving.onnx_export) are opened as an OnnxPredictor.
+
+    Parameters:
+    - path: str. The joblib or .onnx file.
+    - mmap_mode: str, default='r'. Passed to joblib.load; None loads everything into memory.
+    """
+    if str(path).endswith(".onnx"):
+        from .onnx_export import OnnxPredictor
+
+        return OnnxPredictor(path)
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+class InvalidInstances(ValueError):
+    """
+    Raised by MicroBatcher.submit for instances that cannot be converted to model input.
+    """
+
+
+class _Request:
+    __slots__ = ("X", "key", "submitted", "done", "result", "error")
+
+    def __init__(self, X, key):
+        self.X = X
+        self.key = key
+        self.submitted = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Groups concurrent prediction requests into batches for one vectorised predict call.
+
+    Each request is validated and converted when it is submitted, so malformed input is
+    rejected before it joins a batch. Requests are batched with others of the same format;
+    when a batch's predict call fails, its requests are predicted one by one so a single
+    bad request cannot fail the rest.
+
+    Parameters:
+    - pipeline: fitted estimator or Pipeline.
+    - max_batch_size: int, default=64. Maximum number of rows per batch.
+    - max_latency_ms: float, default=5. Longest time the first request of a batch waits for more rows.
+    - method: str, default='predict'. Estimator method to call, e.g. 'predict_proba'.
+    - metrics_window: int, default=10_000. Number of recent request latencies kept for the percentiles.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        max_batch_size=64,
+        max_latency_ms=5,
+        method="predict",
+        metrics_window=10_000,
+    ):
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.predict = getattr(pipeline, method)
+        self.feature_names = getattr(pipeline, "feature_names_in_", None)
+        self.n_features = getattr(pipeline, "n_features_in_", None)
+
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=metrics_window)
+        self._lock = threading.Lock()
+        self._n_requests = 0
+        self._n_rows = 0
+        self._n_batches = 0
+        self._started = time.perf_counter()
+
+        self._closed = threading.Event()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def close(self, timeout=None):
+        """
+        Stops the worker thread after the queued batches, and fails requests submitted later.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        atexit.unregister(self.close)
+        self._queue.put(None)  # wakes the worker if it waits for a request
+        self._worker.join(timeout)
+        # Requests that slipped in behind the stop marker are never predicted
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is not None:
+                pending.error = RuntimeError("The MicroBatcher is closed.")
+                pending.done.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _convert(self, rows):
+        """
+        Converts one request's rows to (X, key); requests with equal keys can share a batch.
+
+        Lists of lists become a float array. Lists of dicts are ordered by the pipeline's
+        feature names when it has them, and otherwise kept as a DataFrame batched only
+        with requests that have the same columns.
+        """
+        if not isinstance(rows, list) or not rows:
+            raise InvalidInstances("Instances must be a non-empty list.")
+        if all(isinstance(row, dict) for row in rows):
+            frame = pd.DataFrame(rows)
+            if self.feature_names is None:
+                return frame, ("columns", tuple(frame.columns))
+            missing = [name for name in self.feature_names if name not in frame]
+            if missing:
+                raise InvalidInstances(f"Missing features: {missing}.")
+            rows = frame[list(self.feature_names)]
+        elif any(isinstance(row, dict) for row in rows):
+            raise InvalidInstances("Instances mix lists and dicts.")
+        try:
+            X = np.asarray(rows, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise InvalidInstances(f"Instances are not a numeric table: {e}") from e
+        if X.ndim != 2:
+            raise InvalidInstances("Instances must be a list of rows.")
+        if self.n_features is not None and X.shape[1] != self.n_features:
+            raise InvalidInstances(
+                f"Expected {self.n_features} features per row, got {X.shape[1]}."
+            )
+        return X, ("array", X.shape[1])
+
+    def submit(self, rows, timeout=30):
+        """
+        Queues rows (list of lists or list of dicts) and blocks until their predictions are ready.
+
+        Raises InvalidInstances when the rows cannot be converted to model input.
+        """
+        if self._closed.is_set():
+            raise RuntimeError("The MicroBatcher is closed.")
+        pending = _Request(*self._convert(rows))
+        self._queue.put(pending)
+        if not pending.done.wait(timeout):
+            raise TimeoutError("Prediction timed out.")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect(self):
+        # Block for the first request, then fill the batch until it is full or the cap expires.
+        # Requests that are already queued are always taken, only waiting is capped.
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        n_rows = len(batch[0].X)
+        deadline = batch[0].submitted + self.max_latency
+        while n_rows < self.max_batch_size:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if pending is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(pending)
+            n_rows += len(pending.X)
+        return batch
+
+    def _to_frame(self, group):
+        if isinstance(group[0].X, pd.DataFrame):
+            return pd.concat([pending.X for pending in group], ignore_index=True)
+        X = np.concatenate([pending.X for pending in group])
+        if self.feature_names is not None:
+            return pd.DataFrame(X, columns=self.feature_names)
+        return X
+
+    def _predict_group(self, group):
+        # One predict call for the group; if it fails, predict each request on its own
+        try:
+            predictions = self.predict(self._to_frame(group))
+        except Exception:
+            if len(group) == 1:
+                raise
+            for pending in group:
+                try:
+                    pending.result = self.predict(self._to_frame([pending])).tolist()
+                except Exception as e:
+                    pending.error = e
+            return
+        start = 0
+        for pending in group:
+            stop = start + len(pending.X)
+            pending.result = predictions[start:stop].tolist()
+            start = stop
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            groups = {}
+            for pending in batch:
+                groups.setdefault(pending.key, []).append(pending)
+            for group in groups.values():
+                try:
+                    self._predict_group(group)
+                except Exception as e:
+                    group[0].error = e
+
+            finished = time.perf_counter()
+            with self._lock:
+                for pending in batch:
+                    if pending.error is None:
+                        self._latencies.append(finished - pending.submitted)
+                        self._n_requests += 1
+                        self._n_rows += len(pending.X)
+                self._n_batches += len(groups)
+            for pending in batch:
+                pending.done.set()
+
+    def metrics(self):
+        """
+        Returns p50/p99 request latency in ms, throughput and batch statistics.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            elapsed = time.perf_counter() - self._started
+            return {
+                "requests": self._n_requests,
+                "rows": self._n_rows,
+                "batches": self._n_batches,
+                "mean_batch_size": self._n_rows / max(self._n_batches, 1),
+                "p50_ms": (
+                    float(np.percentile(latencies, 50)) if len(latencies) else None
+                ),
+                "p99_ms": (
+                    float(np.percentile(latencies, 99)) if len(latencies) else None
+                ),
+                "throughput_rps": self._n_requests / elapsed,
+            }
+
+    def reset_metrics(self):
+        with self._lock:
+            self._latencies.clear()
+            self._n_requests = self._n_rows = self._n_batches = 0
+            self._started = time.perf_counter()
+
+
+def create_app(pipeline_path, max_batch_size=64, max_latency_ms=5, method="predict"):
+    """
+    Builds the Flask app serving one persisted pipeline through a MicroBatcher.
+
+    Parameters:
+    - pipeline_path: str. File written by save_pipeline.
+    - max_batch_size: int, default=64. Maximum number of rows per batch.
+    - max_latency_ms: float, default=5. Latency cap for filling a batch.
+    - method: str, default='predict'. Estimator method to serve, e.g. 'predict_proba'.
+    """
+    pipeline = load_pipeline(pipeline_path)
+    batcher = MicroBatcher(
+        pipeline,
+        max_batch_size=max_batch_size,
+        max_latency_ms=max_latency_ms,
+        method=method,
+    )
+
+    app = Flask(__name__)
+    app.config["batcher"] = batcher
+    # Flask has no shutdown hook; stop the worker at interpreter exit, or call
+    # app.config["batcher"].close() when an app is discarded earlier
+    atexit.register(batcher.close)
+
+    @app.route("/predict", methods=["POST"])
+    def predict():
+        """
+        Predicts the rows in {"instances": [...]}.
+        """
+        body = request.get_json(silent=True)
+        instances = body.get("instances") if isinstance(body, dict) else None
+        if not instances:
+            return jsonify({"status": "error", "message": "No instances."}), 400
+        try:
+            return jsonify({"predictions": batcher.submit(instances)}), 200
+
+        except InvalidInstances as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        except Exception as e:
+            print(f"Error: {e}")
+            return jsonify({"status": "error", "message": str(e)}), 500
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return jsonify(batcher.metrics()), 200
+
+    @app.route("/metrics/reset", methods=["POST"])
+    def reset_metrics():
+        batcher.reset_metrics()
+        return jsonify({"status": "success"}), 200
+
+    @app.route("/health", methods=["GET"])
+    def health():
+        return jsonify({"status": "ok"}), 200
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a persisted model pipeline.")
+    parser.add_argument("pipeline_path")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-latency-ms", type=float, default=5)
+    parser.add_argument("--method", default="predict")
+    args = parser.parse_args()
+
+    app = create_app(
+        args.pipeline_path,
+        max_batch_size=args.max_batch_size,
+        max_latency_ms=args.max_latency_ms,
+        method=args.method,
+    )
+    # threaded=True lets concurrent requests reach the batcher together
+    app.run(host="0.0.0.0", port=args.port, threaded=True)
@@ -0,0 +1,222 @@
+"""
+ONNX export of the models picked by best_classification_models / best_regression_models.
+
+A fitted estimator, or a scaler + estimator Pipeline (see save_pipeline), is
+converted with skl2onnx (XGBoost through onnxmltools) and run with onnxruntime on
+CPU. OnnxPredictor mirrors the sklearn predict / predict_proba interface, so a
+.onnx file can be served by the MicroBatcher just like a joblib pipeline.
+
+The converters are optional dependencies:
+    pip install skl2onnx onnxruntime onnxmltools
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import is_classifier
+
+
+def _require(module):
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise ImportError(
+            f"ONNX export requires {module}: pip install skl2onnx onnxruntime onnxmltools"
+        ) from e
+
+
+def _final_estimator(model):
+    return model.steps[-1][1] if hasattr(model, "steps") else model
+
+
+def _register_xgboost_converters():
+    from skl2onnx import update_registered_converter
+    from skl2onnx.common.shape_calculator import (
+        calculate_linear_classifier_output_shapes,
+        calculate_linear_regressor_output_shapes,
+    )
+    from xgboost import XGBClassifier, XGBRegressor
+
+    _require("onnxmltools")
+    from onnxmltools.convert.xgboost.operator_converters.XGBoost import (
+        convert_xgboost,
+    )
+
+    update_registered_converter(
+        XGBClassifier,
+        "XGBoostXGBClassifier",
+        calculate_linear_classifier_output_shapes,
+        convert_xgboost,
+        options={"nocl": [True, False], "zipmap": [True, False, "columns"]},
+    )
+    update_registered_converter(
+        XGBRegressor,
+        "XGBoostXGBRegressor",
+        calculate_linear_regressor_output_shapes,
+        convert_xgboost,
+    )
+
+
+def export_onnx(model, n_features, path, target_opset=None):
+    """
+    Converts a fitted estimator or Pipeline to an ONNX file.
+
+    Parameters:
+    - model: fitted estimator or Pipeline (e.g. scaler + winning model).
+    - n_features: int. Number of input features.
+    - path: str. Destination .onnx file.
+    - target_opset: int or dict, default=None. ONNX opset, defaults to the latest supported one.
+
+    Returns:
+    - path: str. The written file.
+    """
+    _require("skl2onnx")
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    if type(_final_estimator(model)).__module__.startswith("xgboost"):
+        _register_xgboost_converters()
+        if target_opset is None:
+            from skl2onnx import get_latest_tested_opset_version
+
+            # onnxmltools emits ai.onnx.ml v5 tree ensembles, which skl2onnx can't merge yet
+            target_opset = {"": get_latest_tested_opset_version(), "ai.onnx.ml": 3}
+
+    options = None
+    if is_classifier(_final_estimator(model)):
+        # Plain probability tensor instead of a list of {class: probability} dicts
+        options = {id(_final_estimator(model)): {"zipmap": False}}
+
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[("input", FloatTensorType([None, n_features]))],
+        options=options,
+        target_opset=target_opset,
+    )
+    with open(path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+
+    print(f"💾 ONNX model saved to: {path}")
+    return str(path)
+
+
+class OnnxPredictor:
+    """
+    onnxruntime session with the sklearn predict / predict_proba interface.
+
+    Parameters:
+    - path: str. File written by export_onnx.
+    - n_threads: int, default=None. Intra-op threads, onnxruntime's default when None.
+    """
+
+    def __init__(self, path, n_threads=None):
+        onnxruntime = _require("onnxruntime")
+
+        session_options = onnxruntime.SessionOptions()
+        if n_threads is not None:
+            session_options.intra_op_num_threads = n_threads
+        self.session = onnxruntime.InferenceSession(
+            str(path), session_options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.output_names = [output.name for output in self.session.get_outputs()]
+
+    def _run(self, X):
+        X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+        return self.session.run(None, {self.input_name: X})
+
+    def predict(self, X):
+        predictions = self._run(X)[0]
+        # Regressors return an (n, 1) tensor
+        return predictions.ravel() if predictions.ndim > 1 else predictions
+
+    def predict_proba(self, X):
+        if len(self.output_names) < 2:
+            raise AttributeError("The exported model is not a classifier.")
+        return self._run(X)[1]
+
+
+def check_parity(native, compiled, X, atol=1e-4, rtol=1e-5, min_share=0.99):
+    """
+    Compares the predictions of the native model and its ONNX export.
+
+    ONNX runs in float32, so a row whose (scaled) feature lies within rounding error of
+    a tree split can take the other branch; parity is therefore judged on the share of
+    rows that agree within atol rather than on the single worst row. Use held-out
+    rows: training rows often sit exactly on a split threshold (XGBoost's histogram
+    cuts are data values), which exaggerates these flips.
+
+    Parameters:
+    - native: fitted estimator or Pipeline.
+    - compiled: OnnxPredictor.
+    - X: DataFrame or array-like. Rows to compare on.
+    - atol: float, default=1e-4. Absolute tolerance for probabilities / regression outputs.
+    - rtol: float, default=1e-5. Relative tolerance for regression outputs (float32 has ~7 digits).
+    - min_share: float, default=0.99. Share of rows that must agree for the check to pass.
+
+    Returns:
+    - report: dict. 'label_agreement' for classifiers (ties excluded), 'max_abs_diff', 'share_within_atol' and 'passed'.
+    """
+    report = {}
+    if is_classifier(_final_estimator(native)):
+        proba = native.predict_proba(X)
+        top_two = np.sort(proba, axis=1)[:, -2:]
+        # Rows with tied top probabilities (e.g. 10 of 20 trees) may break the tie either way
+        tied = top_two[:, 1] - top_two[:, 0] <= atol
+        agree = native.predict(X) == compiled.predict(X)
+        report["label_agreement"] = float(np.mean(agree | tied))
+        diff = np.abs(proba - compiled.predict_proba(X)).max(axis=1)
+    else:
+        expected = native.predict(X)
+        diff = np.abs(expected - compiled.predict(X))
+        atol = atol + rtol * np.abs(expected)
+
+    report["max_abs_diff"] = float(diff.max())
+    report["share_within_atol"] = float(np.mean(diff <= atol))
+    report["passed"] = report["share_within_atol"] >= min_share and (
+        report.get("label_agreement", 1.0) >= min_share
+    )
+    return report
+
+
+def benchmark_inference(models, X, batch_sizes=(1, 32, 1024), n_batches=50):
+    """
+    Measures batched predict latency and throughput for native and compiled models.
+
+    Parameters:
+    - models: dict. Name -> object with predict, e.g. {"native": pipeline, "onnx": OnnxPredictor(...)}.
+    - X: DataFrame or array-like. Rows the batches are cut from.
+    - batch_sizes: tuple of int, default=(1, 32, 1024). Batch sizes to time.
+    - n_batches: int, default=50. Number of timed batches per model and batch size.
+
+    Returns:
+    - results_df: DataFrame. Median and p99 latency per batch (ms) and throughput (rows/s).
+    """
+    X_array = np.asarray(X)
+    records = []
+    for batch_size in batch_sizes:
+        starts = np.arange(n_batches) * batch_size % max(len(X_array) - batch_size, 1)
+        for name, model in models.items():
+            batches = [X_array[s : s + batch_size] for s in starts]
+            if isinstance(X, pd.DataFrame):
+                batches = [pd.DataFrame(b, columns=X.columns) for b in batches]
+            model.predict(batches[0])  # warm-up
+            latencies = []
+            for batch in batches:
+                start = time.perf_counter()
+                model.predict(batch)
+                latencies.append(time.perf_counter() - start)
+            latencies = np.array(latencies)
+            records.append(
+                {
+                    "Model": name,
+                    "Batch Size": batch_size,
+                    "Median Latency (ms)": np.median(latencies) * 1000,
+                    "p99 Latency (ms)": np.percentile(latencies, 99) * 1000,
+                    "Throughput (rows/s)": batch_size
+                    * len(latencies)
+                    / latencies.sum(),
+                }
+            )
+    return pd.DataFrame(records)
@@ -0,0 +1,53 @@
+from rag.scripts.retriever import BM25Retriever, tokenize
+
+DOCS = [
+    "the runner was running fast",
+    "cats purr quietly",
+    "dogs bark at the mailman",
+    "she runs every morning",
+    "markets rallied today",
+]
+
+
+class Rows(list):
+    @property
+    def rows(self):
+        return self
+
+
+def make_data():
+    return Rows(
+        {"cleaned_content": text, "metadata": {"source": str(i)}}
+        for i, text in enumerate(DOCS)
+    )
+
+
+def test_instances_have_their_own_stemmed_index():
+    first, second = BM25Retriever(), BM25Retriever()
+    assert first.index is not second.index
+    first.index_data(make_data())
+    second.index_data(Rows(make_data()[:2]))
+
+    # "run" only matches through the stemmer
+    sources = {r["source"] for r in first.search("run", k=5) if r["score"] > 0}
+    assert sources == {"0", "3"}
+    assert len(second.search("run", k=5)) == 2
+
+
+def test_search_batch_and_saved_index_match_search(tmp_path):
+    retriever = BM25Retriever()
+    retriever.index_data(make_data())
+    queries = ["running dogs", "cats", "markets today"]
+    expected = [retriever.search(query, k=2) for query in queries]
+    assert retriever.search_batch(queries, k=2) == expected
+
+    retriever.save_index(str(tmp_path / "bm25"))
+    loaded = BM25Retriever()
+    loaded.load_index(str(tmp_path / "bm25"), make_data(), mmap=True)
+    assert loaded.search_batch(queries, k=2) == expected
+
+
+def test_parallel_tokenize_matches_serial():
+    texts = DOCS * 3
+    assert tokenize(texts, n_jobs=2, chunk_size=4) == tokenize(texts)
+    assert tokenize(["Running"], language=None) == [["running"]]
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import silhouette_score
+
+from data_preprocessing.clustering import (
+    MINIBATCH_THRESHOLD,
+    find_elbow,
+    kmeans_sweep,
+    make_kmeans,
+    sampled_silhouette,
+    stratified_sample,
+)
+
+
+@pytest.fixture
+def blobs():
+    X, _ = make_blobs(n_samples=3000, n_features=4, centers=5, random_state=0)
+    return X
+
+
+def test_make_kmeans_switches_to_minibatch():
+    assert isinstance(make_kmeans(4, 1000), KMeans)
+    assert isinstance(make_kmeans(4, MINIBATCH_THRESHOLD + 1), MiniBatchKMeans)
+
+
+def test_stratified_sample_keeps_cluster_shares():
+    labels = np.repeat([0, 1, 2], [6000, 3000, 1000])
+
+    rows = stratified_sample(labels, sample_size=1000, random_state=0)
+
+    assert np.bincount(labels[rows]).tolist() == [600, 300, 100]
+    assert len(stratified_sample(labels[:500], sample_size=1000)) == 500
+
+
+def test_sampled_silhouette_close_to_exact(blobs):
+    labels = KMeans(n_clusters=5, random_state=0).fit_predict(blobs)
+
+    estimate = sampled_silhouette(blobs, labels, sample_size=1000, random_state=0)
+
+    assert estimate == pytest.approx(silhouette_score(blobs, labels), abs=0.02)
+
+
+def test_kmeans_sweep_returns_reusable_models(blobs):
+    models, results_df = kmeans_sweep(blobs, k_range=(2, 9), random_state=0, n_jobs=2)
+
+    assert list(models) == list(range(2, 9))
+    assert results_df["k"].tolist() == list(range(2, 9))
+    assert models[5].labels_.shape == (len(blobs),)
+    assert results_df.loc[results_df["Silhouette"].idxmax(), "k"] == 5
+    assert find_elbow(results_df) in models
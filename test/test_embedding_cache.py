@@ -0,0 +1,107 @@
+import asyncio
+
+import numpy as np
+
+from rag.scripts.embedding import EmbeddingFunction
+from rag.scripts.embedding_cache import EmbeddingCache
+
+
+class RecordingEmbeddingFunction(EmbeddingFunction):
+    """Embeds locally and records the texts that would have been sent to the API."""
+
+    def __init__(self, **kwargs):
+        super().__init__(api_key="test", **kwargs)
+        self.requests = []
+
+    async def embed_batch(self, texts, input_type="search_document"):
+        self.requests.append(list(texts))
+        return [
+            [float(len(text)), float(input_type == "search_query")] for text in texts
+        ]
+
+
+def test_only_cache_misses_reach_the_api(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    embed = RecordingEmbeddingFunction(batch_size=2, cache=EmbeddingCache(path))
+    first = asyncio.run(embed.embed_texts(["a", "bb", "a", "ccc"]))
+    assert first == [[1.0, 0.0], [2.0, 0.0], [1.0, 0.0], [3.0, 0.0]]
+    assert embed.requests == [["a", "bb"], ["ccc"]]
+
+    # A new process re-indexing the same corpus reads everything from disk
+    reindex = RecordingEmbeddingFunction(cache=EmbeddingCache(path, lru_size=1))
+    assert asyncio.run(reindex.embed_texts(["ccc", "bb", "a"])) == [
+        [3.0, 0.0],
+        [2.0, 0.0],
+        [1.0, 0.0],
+    ]
+    assert reindex.requests == []
+
+    # The input type is part of the key
+    assert asyncio.run(reindex.embed_query("a")) == [[1.0, 1.0]]
+    assert reindex.requests == [["a"]]
+    assert len(reindex.cache) == 4
+
+
+def test_cache_round_trips_float32_vectors():
+    cache = EmbeddingCache(":memory:", lru_size=2)
+    vectors = np.random.default_rng(0).normal(size=(5, 8)).astype(np.float32)
+    texts = [f"text {i}" for i in range(5)]
+    cache.put_many("model", "search_document", texts, vectors)
+
+    found = cache.get_many("model", "search_document", texts + ["unknown"])
+    assert found[-1] is None
+    np.testing.assert_array_equal(np.stack(found[:-1]), vectors)
+    assert cache.get_many("other-model", "search_document", texts[:1]) == [None]
+    assert (cache.hits, cache.misses) == (5, 2)
+
+
+def test_sync_embed_reuses_one_loop_and_works_inside_a_running_loop(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from rag.scripts import embedding
+
+    shared = RecordingEmbeddingFunction(cache=EmbeddingCache(":memory:"))
+    loops = set()
+    original = shared.embed_batch
+
+    async def embed_batch(texts, input_type="search_document"):
+        loops.add(asyncio.get_running_loop())
+        return await original(texts, input_type)
+
+    shared.embed_batch = embed_batch
+    shared.scheduler.embed_batch = embed_batch
+    monkeypatch.setattr(embedding, "_default_embedding_function", shared)
+
+    async def from_async_code():
+        return embedding.sync_embed("abc")
+
+    assert asyncio.run(from_async_code()) == [[3.0, 0.0]]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(embedding.sync_embed, ["a", "bb", "a", "dddd"]))
+    assert results == [[[1.0, 0.0]], [[2.0, 0.0]], [[1.0, 0.0]], [[4.0, 0.0]]]
+    assert loops == {embedding.get_background_loop().loop}
+
+
+def test_misses_and_hits_return_identical_float32_values(monkeypatch):
+    class Float64EmbeddingFunction(RecordingEmbeddingFunction):
+        async def embed_batch(self, texts, input_type="search_document"):
+            return [[0.1, 1 / 3] for _ in texts]
+
+    embed = Float64EmbeddingFunction(cache=EmbeddingCache(":memory:"))
+    first = asyncio.run(embed.embed_texts(["a"]))
+    assert first == asyncio.run(embed.embed_texts(["a"]))
+    assert first == [np.float32([0.1, 1 / 3]).tolist()]
+
+
+def test_default_cache_is_in_memory_unless_a_path_is_set(monkeypatch, tmp_path):
+    from rag.scripts import embedding
+
+    monkeypatch.setenv("CO_API_KEY", "test")
+    monkeypatch.delenv("EMBEDDING_CACHE_PATH", raising=False)
+    monkeypatch.setattr(embedding, "_default_embedding_function", None)
+    assert embedding.get_default_embedding_function().cache.path == ":memory:"
+
+    path = str(tmp_path / "embeddings.sqlite")
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", path)
+    monkeypatch.setattr(embedding, "_default_embedding_function", None)
+    assert embedding.get_default_embedding_function().cache.path == path
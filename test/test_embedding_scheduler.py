@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from rag.scripts.embedding_scheduler import EmbeddingScheduler, TokenBucket
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeApi:
+    """Embeds each text as [index], tracking concurrency and failing on request."""
+
+    def __init__(self, failures=(), max_texts=None, delay=0.001):
+        self.failures = list(failures)
+        self.max_texts = max_texts
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.batch_sizes = []
+
+    async def embed_batch(self, texts, input_type):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                raise ApiError(self.failures.pop(0))
+            if self.max_texts is not None and len(texts) > self.max_texts:
+                raise ApiError(400)
+            self.batch_sizes.append(len(texts))
+            return [[float(text)] for text in texts]
+        finally:
+            self.in_flight -= 1
+
+
+def test_results_keep_order_with_bounded_concurrency_and_retries():
+    api = FakeApi(failures=[429, 503])
+    scheduler = EmbeddingScheduler(
+        api.embed_batch, max_concurrency=3, max_batch_size=7, base_delay=0.001
+    )
+    texts = [str(i) for i in range(100)]
+    assert asyncio.run(scheduler.run(texts)) == [[float(i)] for i in range(100)]
+    assert api.peak_in_flight <= 3
+    assert scheduler.metrics["retries"] == 2
+    assert scheduler.metrics["texts_done"] == 100
+    assert scheduler.metrics["texts_per_s"] > 0
+
+
+def test_rejected_batches_are_split_and_errors_surface():
+    api = FakeApi(max_texts=3)
+    scheduler = EmbeddingScheduler(api.embed_batch, max_batch_size=10)
+    texts = [str(i) for i in range(20)]
+    assert asyncio.run(scheduler.run(texts)) == [[float(i)] for i in range(20)]
+    assert max(api.batch_sizes) <= 3 and scheduler.metrics["splits"] > 0
+
+    failing = EmbeddingScheduler(FakeApi(failures=[401]).embed_batch, max_batch_size=1)
+    with pytest.raises(ApiError):
+        asyncio.run(failing.run(["1", "2"]))
+
+
+def test_batches_respect_token_limit_and_rate_limit():
+    scheduler = EmbeddingScheduler(
+        FakeApi().embed_batch, max_batch_size=50, max_batch_tokens=10
+    )
+    # 8 characters are two estimated tokens, so five texts fill a batch
+    assert [len(b) for b in scheduler.plan_batches(["12345678"] * 12)] == [5, 5, 2]
+
+    async def take(bucket, n):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(n):
+            await bucket.acquire()
+        return loop.time() - start
+
+    # A 100/s bucket with a burst of 1 needs about 0.1s for 11 requests
+    assert asyncio.run(take(TokenBucket(100, capacity=1), 11)) >= 0.09
+
+
+def test_limits_are_shared_across_runs():
+    api = FakeApi(delay=0.01)
+    scheduler = EmbeddingScheduler(
+        api.embed_batch, max_concurrency=2, requests_per_minute=300
+    )
+
+    async def many_runs():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(3):
+            await scheduler.run([str(i)])
+        runs = await asyncio.gather(
+            *[scheduler.run([str(i)], return_metrics=True) for i in range(6)]
+        )
+        return loop.time() - start, runs
+
+    # A 5/s bucket with a burst of 5 needs about 0.8s for 9 single-text runs
+    elapsed, runs = asyncio.run(many_runs())
+    assert elapsed >= 0.7
+    assert api.peak_in_flight <= 2
+    assert [result for result, _ in runs] == [[[float(i)]] for i in range(6)]
+    assert all(metrics["texts_done"] == 1 for _, metrics in runs)
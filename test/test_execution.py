@@ -0,0 +1,66 @@
+import pytest
+import pandas as pd
+from sklearn.datasets import make_classification
+
+from data_preprocessing.eda import best_classification_models
+from data_preprocessing.execution import (
+    execution_backend,
+    get_execution_backend,
+    get_n_jobs,
+    set_execution_backend,
+    shutdown_execution_backend,
+)
+from data_preprocessing.tuning import tune_model
+
+
+@pytest.fixture
+def classification_data():
+    X, y = make_classification(n_samples=200, n_features=5, random_state=0)
+    return pd.DataFrame(X), pd.Series(y)
+
+
+def test_default_backend_keeps_local_defaults():
+    assert get_execution_backend() is None
+    assert get_n_jobs(-1) == -1
+    assert get_n_jobs(1) == 1
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError, match="Invalid backend"):
+        set_execution_backend("carrier-pigeon")
+
+
+def test_loky_backend_matches_sequential(classification_data):
+    X, y = classification_data
+    sequential = best_classification_models(X, y, random_state=0)
+
+    with execution_backend("loky", n_jobs=2):
+        assert get_n_jobs(1) == 2
+        parallel = best_classification_models(X, y, random_state=0)
+
+    assert get_execution_backend() is None
+    # Deterministic models score the same wherever they were fitted
+    sequential = sequential.set_index("Model")
+    parallel = parallel.set_index("Model")
+    assert set(sequential.index) == set(parallel.index)
+    for name in ["Logistic Regression", "K-Nearest Neighbors", "Naive Bayes"]:
+        assert sequential.loc[name, "Accuracy"] == parallel.loc[name, "Accuracy"]
+
+
+def test_dask_backend_with_local_worker_processes(classification_data):
+    pytest.importorskip("distributed")
+    X, y = classification_data
+
+    # Two local worker processes stand in for two machines
+    client = set_execution_backend("dask", n_jobs=2, n_workers=2)
+    try:
+        assert len(client.scheduler_info()["workers"]) == 2
+        results_df = best_classification_models(X, y, random_state=0)
+        _, best_params, _ = tune_model(
+            "Decision Tree", X, y, n_trials=3, random_state=0
+        )
+    finally:
+        shutdown_execution_backend()
+
+    assert len(results_df) == 9
+    assert "max_depth" in best_params
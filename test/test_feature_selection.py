@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_classification
+from sklearn.feature_selection import RFECV
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from sklearn.tree import DecisionTreeClassifier
+
+from data_preprocessing.feature_selection import fast_rfecv, feature_count_schedule
+
+
+@pytest.fixture
+def classification_data():
+    X, y = make_classification(
+        n_samples=300, n_features=12, n_informative=4, random_state=0
+    )
+    return pd.DataFrame(X), pd.Series(y)
+
+
+def test_feature_count_schedule():
+    assert feature_count_schedule(5) == [5, 4, 3, 2, 1]
+    assert feature_count_schedule(100, step=0.5, min_features_to_select=10) == [
+        100,
+        50,
+        25,
+        13,
+        10,
+    ]
+    with pytest.raises(ValueError):
+        feature_count_schedule(10, step=0)
+
+
+def test_step_one_matches_sklearn_rfecv(classification_data):
+    X, y = classification_data
+    estimator = LogisticRegression(max_iter=1000)
+    cv = StratifiedKFold(5)
+
+    support, ranking, results_df = fast_rfecv(
+        X, y, estimator=estimator, cv=cv, scoring="accuracy", n_jobs=1
+    )
+    reference = RFECV(estimator, cv=cv, scoring="accuracy").fit(X, y)
+
+    np.testing.assert_allclose(
+        results_df["Mean Score"], reference.cv_results_["mean_test_score"][::-1]
+    )
+    np.testing.assert_array_equal(support, reference.support_)
+    np.testing.assert_array_equal(ranking, reference.ranking_)
+
+
+def test_surrogate_confirms_best_counts(classification_data):
+    X, y = classification_data
+
+    support, _, results_df = fast_rfecv(
+        X,
+        y,
+        estimator=DecisionTreeClassifier(random_state=0),
+        step=0.25,
+        cv=3,
+        surrogate=LogisticRegression(max_iter=1000),
+        n_confirm=3,
+        n_jobs=1,
+    )
+
+    confirmed = results_df.dropna(subset=["Confirmed Score"])
+    assert len(confirmed) == 3
+    best = confirmed.loc[confirmed["Confirmed Score"][::-1].idxmax(), "Features"]
+    assert support.sum() == best
@@ -0,0 +1,68 @@
+import pytest
+
+from rag.scripts.reranker import FusionRanker
+
+
+def doc(id_, score, text=None):
+    return {
+        "id": id_,
+        "source": f"s{id_}",
+        "text": text or f"text {id_}",
+        "score": score,
+    }
+
+
+def test_rrf_fuses_by_id_and_returns_the_original_documents():
+    sparse = [doc(1, 9.0), doc(2, 7.0), doc(3, 1.0)]
+    dense = [doc(2, 0.9), doc(4, 0.8), doc(1, 0.5)]
+
+    fused = FusionRanker().rerank(sparse, dense)
+
+    assert [d["id"] for d in fused] == [2, 1, 4, 3]
+    assert fused[0] is sparse[1]
+    assert fused[0]["fusion_score"] == pytest.approx(1 / 61 + 1 / 60)
+    assert fused[2]["fusion_score"] == pytest.approx(1 / 61)
+
+
+def test_documents_with_the_same_id_are_deduplicated_whatever_their_text():
+    fused = FusionRanker().rerank([doc(1, 1.0, "short")], [doc(1, 0.2, "long " * 100)])
+
+    assert len(fused) == 1
+    assert fused[0]["fusion_score"] == pytest.approx(2 / 60)
+
+
+def test_documents_without_ids_are_keyed_by_source_and_text():
+    first = [{"source": "a", "text": "x", "score": 1.0}]
+    second = [{"source": "a", "text": "x", "score": 0.3}, doc(7, 0.1)]
+
+    fused = FusionRanker().rerank(first, second)
+
+    assert [d["source"] for d in fused] == ["a", "s7"]
+
+
+def test_weighted_rrf_over_three_lists():
+    lists = [[doc(1, 0), doc(2, 0)], [doc(2, 0), doc(1, 0)], [doc(2, 0), doc(3, 0)]]
+
+    fused = FusionRanker(weights=[1.0, 0.0, 0.0]).rerank(*lists)
+    assert [d["id"] for d in fused] == [1, 2, 3]
+
+    fused = FusionRanker().rerank(*lists, weights=[1.0, 1.0, 1.0])
+    assert [d["id"] for d in fused] == [2, 1, 3]
+
+
+def test_normalized_score_fusion():
+    sparse = [doc(1, 20.0), doc(2, 15.0), doc(3, 10.0)]
+    dense = [doc(3, 0.9), doc(2, 0.1)]
+
+    fused = FusionRanker(method="score").rerank(sparse, dense)
+
+    assert [d["id"] for d in fused] == [1, 3, 2]
+    assert [d["fusion_score"] for d in fused] == pytest.approx([1.0, 1.0, 0.5])
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        FusionRanker(weights=[1.0]).rerank([doc(1, 0)], [doc(2, 0)])
+    with pytest.raises(ValueError):
+        FusionRanker(method="borda").rerank([doc(1, 0)])
+    assert FusionRanker().rerank([], []) == []
@@ -0,0 +1,74 @@
+import time
+
+from rag.scripts.reranker import CohereReranker
+from rag.scripts.retriever import BM25Retriever, DenseRetriever, HybridRetrieverReranker
+
+
+def doc(source, score):
+    return {"source": source, "text": f"text {source}", "score": score}
+
+
+class SlowSparse(BM25Retriever):
+    def predict(self, query, k):
+        time.sleep(0.2)
+        return [doc("a", 9.0), doc("b", 7.0), doc("c", 1.0)][:k]
+
+
+class SlowDense(DenseRetriever):
+    def predict(self, query, k):
+        time.sleep(0.2)
+        return [doc("b", 0.9), doc("d", 0.8), doc("a", 0.5)][:k]
+
+
+class CountingReranker(CohereReranker):
+    calls: list = []
+
+    def predict(self, query, docs, top_n=None):
+        self.calls.append([d["source"] for d in docs])
+        return [dict(d, relevance_score=1.0) for d in docs][:top_n]
+
+
+def test_legs_run_concurrently_and_rerank_once_on_unique_candidates():
+    ranker = CountingReranker(calls=[])
+    hybrid = HybridRetrieverReranker(
+        sparse_retriever=SlowSparse(),
+        dense_retriever=SlowDense(),
+        ranker=ranker,
+        candidate_pool=3,
+    )
+    results, timings = hybrid.predict("query", top_k=3, top_n=2, return_timings=True)
+
+    assert timings["retrieval_ms"] < 350  # both 200ms legs overlap
+    assert timings["sparse_ms"] >= 200 and timings["dense_ms"] >= 200
+    # One rerank call on the deduplicated fused pool: a and b were found by both legs
+    assert ranker.calls == [["b", "a", "d"]]
+    assert [r["source"] for r in results] == ["b", "a"]
+    assert hybrid.predict("query", top_n=1) == results[:1]
+
+
+def test_concurrent_first_calls_share_one_executor(monkeypatch):
+    import threading
+
+    from rag.scripts import retriever
+
+    monkeypatch.setattr(retriever, "_executor", None)
+    created = []
+    original = retriever.ThreadPoolExecutor
+
+    def slow_executor(*args, **kwargs):
+        time.sleep(0.05)
+        created.append(original(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(retriever, "ThreadPoolExecutor", slow_executor)
+    threads = [
+        threading.Thread(target=lambda: retriever._submit(lambda: None).result())
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    created[0].shutdown()
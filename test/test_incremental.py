@@ -0,0 +1,181 @@
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_classification, make_regression
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+
+from data_preprocessing import incremental
+from data_preprocessing.incremental import (
+    _roc_auc_from_histograms,
+    _score_bins,
+    N_AUC_BINS,
+    best_classification_models_incremental,
+    best_regression_models_incremental,
+    iter_chunks,
+)
+
+
+@pytest.fixture
+def classification_files(tmp_path):
+    X, y = make_classification(n_samples=2000, n_features=6, random_state=0)
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(6)])
+    df["target"] = y
+    df.to_csv(tmp_path / "data.csv", index=False)
+    df.to_parquet(tmp_path / "data.parquet")
+    return str(tmp_path / "data.csv"), str(tmp_path / "data.parquet")
+
+
+def test_iter_chunks_csv_and_parquet(classification_files):
+    csv_path, parquet_path = classification_files
+
+    csv_chunks = list(iter_chunks(csv_path, chunksize=300))
+    parquet_chunks = list(iter_chunks(parquet_path, chunksize=300))
+
+    assert [len(c) for c in csv_chunks] == [300] * 6 + [200]
+    assert sum(len(c) for c in parquet_chunks) == 2000
+    assert list(iter_chunks([csv_path, csv_path], chunksize=1000))[2].shape == (
+        1000,
+        7,
+    )
+
+
+def test_streamed_metrics_match_in_memory(classification_files):
+    csv_path, _ = classification_files
+    model = SGDClassifier(loss="log_loss", random_state=0)
+
+    results_df = best_classification_models_incremental(
+        csv_path,
+        "target",
+        chunksize=250,
+        random_state=0,
+        scale_data=False,
+        models={"SGD": model},
+    )
+
+    # Rebuild the same validation rows and score them in memory
+    y_true, y_pred, y_proba = [], [], []
+    for i, chunk in enumerate(pd.read_csv(csv_path, chunksize=250)):
+        is_val = np.random.default_rng([0, i]).random(len(chunk)) < 0.2
+        X_val = chunk.drop(columns="target").to_numpy()[is_val]
+        y_true.extend(chunk["target"].to_numpy()[is_val])
+        y_pred.extend(model.predict(X_val))
+        y_proba.extend(model.predict_proba(X_val)[:, 1])
+
+    row = results_df.iloc[0]
+    assert row["Accuracy"] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert row["F1 Score"] == pytest.approx(f1_score(y_true, y_pred))
+    assert row["ROC-AUC"] == pytest.approx(roc_auc_score(y_true, y_proba), abs=0.01)
+
+
+def test_histogram_roc_auc():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 5000)
+    scores = 1 / (1 + np.exp(-(2 * y - 1 + rng.normal(0, 1.5, 5000))))
+
+    bins = _score_bins(np.c_[1 - scores, scores])[:, 1]
+    auc = _roc_auc_from_histograms(
+        np.bincount(bins[y == 1], minlength=N_AUC_BINS),
+        np.bincount(bins[y == 0], minlength=N_AUC_BINS),
+    )
+
+    assert auc == pytest.approx(roc_auc_score(y, scores), abs=1e-4)
+
+
+def test_incremental_zoo_on_parquet(classification_files):
+    _, parquet_path = classification_files
+
+    results_df = best_classification_models_incremental(
+        parquet_path, "target", chunksize=400, random_state=0, n_epochs=2
+    )
+
+    assert len(results_df) == 5
+    assert results_df["Accuracy"].iloc[0] > 0.8
+
+
+def test_regression_incremental_with_validation_file(tmp_path):
+    X, y = make_regression(n_samples=1500, n_features=4, noise=1, random_state=0)
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(4)])
+    df["target"] = y
+    df.iloc[:1200].to_csv(tmp_path / "train.csv", index=False)
+    df.iloc[1200:].to_csv(tmp_path / "val.csv", index=False)
+
+    results_df = best_regression_models_incremental(
+        str(tmp_path / "train.csv"),
+        "target",
+        chunksize=200,
+        validation_path=str(tmp_path / "val.csv"),
+        n_epochs=3,
+    )
+
+    assert list(results_df.columns) == ["Model", "R² Score", "MSE", "RMSE", "MAE"]
+    best = results_df.iloc[0]
+    assert best["Model"] == "SGD Regressor" or best["R² Score"] > 0.99
+    assert best["RMSE"] == pytest.approx(np.sqrt(best["MSE"]))
+
+
+def test_validation_file_is_read_separately_and_may_hold_unseen_classes(
+    tmp_path, monkeypatch
+):
+    X, y = make_classification(
+        n_samples=900,
+        n_features=4,
+        n_informative=3,
+        n_redundant=0,
+        n_classes=3,
+        random_state=0,
+    )
+    df = pd.DataFrame(X, columns=[f"f{i}" for i in range(4)])
+    df["target"] = y
+    train, val = df.iloc[:600], df.iloc[600:]
+    train[train["target"] != 2].to_csv(tmp_path / "train.csv", index=False)
+    val.to_csv(tmp_path / "val.csv", index=False)
+
+    reads = []
+    iter_chunks_ = incremental.iter_chunks
+
+    def counting_iter_chunks(path, chunksize=100_000, columns=None):
+        reads.append((path.rsplit("/", 1)[-1], columns))
+        return iter_chunks_(path, chunksize, columns)
+
+    monkeypatch.setattr(incremental, "iter_chunks", counting_iter_chunks)
+    results_df = best_classification_models_incremental(
+        str(tmp_path / "train.csv"),
+        "target",
+        chunksize=200,
+        validation_path=str(tmp_path / "val.csv"),
+        n_epochs=2,
+        models={"SGD Classifier": SGDClassifier(loss="log_loss", random_state=0)},
+    )
+
+    # Scaler pass, target-only class pass, two epochs, one validation pass
+    assert reads == [
+        ("train.csv", None),
+        ("val.csv", ["target"]),
+        ("train.csv", None),
+        ("train.csv", None),
+        ("val.csv", None),
+    ]
+    assert 0 < results_df.loc[0, "Accuracy"] < 0.8
+
+    with pytest.warns(UserWarning, match="Skipped"):
+        best_classification_models_incremental(
+            str(tmp_path / "train.csv"),
+            "target",
+            chunksize=200,
+            validation_path=str(tmp_path / "val.csv"),
+            classes=[0, 1],
+        )
+
+
+def test_empty_validation_stream_raises(tmp_path):
+    df = pd.DataFrame({"f0": [0.0, 1.0, 2.0], "target": [0.0, 1.0, 2.0]})
+    df.to_csv(tmp_path / "train.csv", index=False)
+    df.iloc[:0].to_csv(tmp_path / "val.csv", index=False)
+
+    with pytest.raises(ValueError, match="no rows"):
+        best_regression_models_incremental(
+            str(tmp_path / "train.csv"),
+            "target",
+            validation_path=str(tmp_path / "val.csv"),
+        )
@@ -0,0 +1,257 @@
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import torch
+
+from machine_learning.kan import KAN, KANLUT, KANLinear, KANLinearLUT
+from machine_learning.kan_benchmarks import (
+    benchmark_b_splines,
+    measure_peak_memory,
+    reference_b_splines,
+)
+
+
+@pytest.fixture
+def layer():
+    torch.manual_seed(0)
+    return KANLinear(6, 3)
+
+
+@pytest.mark.parametrize("spline_order", [1, 2, 3])
+def test_b_splines_match_reference(spline_order):
+    torch.manual_seed(0)
+    layer = KANLinear(6, 3, spline_order=spline_order)
+    x = torch.rand(50, 6) * 2 - 1
+
+    torch.testing.assert_close(layer.b_splines(x), reference_b_splines(layer, x))
+
+
+def test_b_splines_gradient_matches_reference(layer):
+    x = torch.rand(50, 6) * 2 - 1
+    weights = torch.randn(50, 6, layer.grid_size + layer.spline_order)
+    x_cached = x.clone().requires_grad_(True)
+    x_reference = x.clone().requires_grad_(True)
+
+    (layer.b_splines(x_cached) * weights).sum().backward()
+    (reference_b_splines(layer, x_reference) * weights).sum().backward()
+
+    torch.testing.assert_close(x_cached.grad, x_reference.grad)
+
+
+def test_grid_cache_refreshed_after_update_grid(layer):
+    layer.update_grid(torch.randn(200, 6) * 0.5)
+    x = torch.randn(50, 6) * 0.5
+
+    torch.testing.assert_close(layer.b_splines(x), reference_b_splines(layer, x))
+    torch.testing.assert_close(
+        layer.grid_inverse_1, 1 / (layer.grid[:, 1:] - layer.grid[:, :-1])
+    )
+
+
+def test_grid_cache_refreshed_after_load_state_dict(layer):
+    source = KANLinear(6, 3)
+    source.update_grid(torch.randn(200, 6) * 0.5)
+
+    layer.load_state_dict(source.state_dict())
+
+    assert "grid_inverse_1" not in source.state_dict()
+    x = torch.randn(50, 6) * 0.5
+    torch.testing.assert_close(layer.b_splines(x), source.b_splines(x))
+
+
+def test_b_splines_thread_safe(layer):
+    inputs = [torch.rand(400, 6) * 2 - 1 for _ in range(80)]
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(layer.b_splines, inputs))
+
+    for x, bases in zip(inputs, results):
+        torch.testing.assert_close(bases, reference_b_splines(layer, x))
+
+
+def test_workspace_left_out_of_pickles_and_copies(layer):
+    layer.b_splines(torch.rand(20000, 6))
+    size = len(pickle.dumps(layer))
+
+    layer.release_workspace()
+    assert size == len(pickle.dumps(layer))
+    restored = copy.deepcopy(pickle.loads(pickle.dumps(layer)))
+    x = torch.rand(50, 6)
+    torch.testing.assert_close(restored.b_splines(x), layer.b_splines(x))
+
+
+def test_workspace_capped_at_chunk_size(layer):
+    x = torch.rand(5000, 6) * 2 - 1
+    layer.release_workspace()
+    layer.b_splines(x)
+    assert "alpha" not in layer._workspace.__dict__
+
+    layer.set_chunking(batch_chunk_size=100)
+    layer(x)
+    assert layer._workspace.alpha.size(0) == 100
+    torch.testing.assert_close(layer.b_splines(x), reference_b_splines(layer, x))
+
+    layer.release_workspace()
+    assert "alpha" not in layer._workspace.__dict__
+
+
+def test_kan_forward_backward_runs():
+    torch.manual_seed(0)
+    model = KAN([4, 8, 2])
+    x = torch.rand(32, 4) * 2 - 1
+
+    model(x).sum().backward()
+
+    assert model.layers[0].base_weight.grad is not None
+
+
+def test_benchmark_b_splines_returns_rows():
+    results = benchmark_b_splines(batch_sizes=(8,), widths=(4,), n_repeats=1)
+
+    assert len(results) == 2
+    assert (results["Speedup"] > 0).all()
+
+
+@pytest.mark.parametrize(
+    "chunking",
+    [
+        {"batch_chunk_size": 16},
+        {"feature_chunk_size": 3},
+        {"batch_chunk_size": 10, "feature_chunk_size": 4, "checkpoint": True},
+    ],
+)
+def test_chunked_forward_matches_full_batch(chunking):
+    torch.manual_seed(0)
+    model = KAN([10, 8, 2])
+    x = torch.rand(50, 10) * 2 - 1
+    x_full = x.clone().requires_grad_(True)
+    x_chunked = x.clone().requires_grad_(True)
+
+    expected = model(x_full)
+    expected.sum().backward()
+    expected_grads = [p.grad.clone() for p in model.parameters()]
+    model.zero_grad()
+    model.set_chunking(**chunking)
+    output = model(x_chunked)
+    output.sum().backward()
+
+    torch.testing.assert_close(output, expected)
+    torch.testing.assert_close(x_chunked.grad, x_full.grad)
+    for param, expected_grad in zip(model.parameters(), expected_grads):
+        torch.testing.assert_close(param.grad, expected_grad)
+
+
+def test_estimate_peak_memory_shrinks_with_chunks():
+    model = KAN([64, 128, 1])
+    full = model.estimate_peak_memory(4096)
+    full_training = model.estimate_peak_memory(4096, training=True)
+
+    model.set_chunking(batch_chunk_size=256, checkpoint=True)
+
+    assert model.estimate_peak_memory(4096) < full / 4
+    assert model.estimate_peak_memory(4096, training=True) < full_training / 2
+
+
+def test_set_chunking_respects_memory_budget():
+    model = KAN([64, 128, 1])
+
+    model.set_chunking(max_memory_mb=32, batch_size=8192)
+
+    assert all(layer.batch_chunk_size < 8192 for layer in model.layers)
+    assert model.estimate_peak_memory(8192) <= 32 * 2**20
+
+
+def test_measure_peak_memory_counts_allocations():
+    peak_mb = measure_peak_memory(lambda: torch.ones(1024, 1024) * 2)
+
+    assert peak_mb >= 8
+
+
+def test_lut_layer_matches_layer_within_tolerance(layer):
+    layer.update_grid(torch.randn(200, 6) * 0.5)
+    x = torch.randn(100, 6)
+
+    lut = KANLinearLUT.from_layer(layer, tolerance=1e-4)
+
+    with torch.no_grad():
+        expected = layer(x)
+    assert (lut(x) - expected).abs().max() <= 1e-4
+
+
+def test_lut_table_size_never_exceeds_max_table_size(layer, capsys):
+    lut = KANLinearLUT.from_layer(layer, tolerance=1e-12, max_table_size=1024)
+
+    assert lut.table_size == 1024
+    assert "above tolerance" in capsys.readouterr().out
+
+
+def test_compile_for_inference_reports_deviation_and_speedup():
+    torch.manual_seed(0)
+    model = KAN([6, 8, 1])
+    x = torch.rand(64, 6) * 2 - 1
+
+    compiled, report = model.compile_for_inference(tolerance=1e-3, x=x)
+
+    assert isinstance(compiled, KANLUT)
+    assert report["max_abs_deviation"] <= 1e-3
+    assert report["speedup"] > 0
+    assert len(report["table_sizes"]) == 2
+    torch.testing.assert_close(compiled(x), model(x).detach(), atol=1e-3, rtol=0)
+
+
+def test_bfloat16_autocast_inference_close_to_float32():
+    torch.manual_seed(0)
+    model = KAN([8, 16, 2]).eval()
+    x = torch.rand(256, 8) * 2 - 1
+
+    with torch.no_grad():
+        expected = model(x)
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            output = model(x)
+
+    assert output.dtype == torch.bfloat16
+    torch.testing.assert_close(output.float(), expected, atol=1e-2, rtol=2e-2)
+
+
+def test_bfloat16_autocast_training_keeps_float32_gradients():
+    torch.manual_seed(0)
+    model = KAN([8, 16, 2])
+    x = torch.rand(256, 8) * 2 - 1
+
+    with torch.autocast("cpu", dtype=torch.bfloat16):
+        output = model(x)
+    output.float().pow(2).mean().backward()
+
+    assert model.layers[0].spline_weight.grad.dtype == torch.float32
+    assert model.layers[0].spline_weight.grad.abs().sum() > 0
+
+
+@pytest.mark.parametrize("spline", [False, True])
+def test_quantize_dynamic_close_to_float32(spline):
+    torch.manual_seed(0)
+    model = KAN([8, 16, 2]).eval()
+    x = torch.rand(256, 8) * 2 - 1
+
+    quantized = model.quantize_dynamic(spline=spline)
+
+    with torch.no_grad():
+        torch.testing.assert_close(quantized(x), model(x), atol=2e-2, rtol=5e-2)
+    assert model.layers[0].base_linear is None
+    assert quantized.layers[0].base_linear is not None
+
+
+def test_update_grid_keeps_model_dtype():
+    torch.manual_seed(0)
+    layer = KANLinear(4, 3)
+    x = torch.randn(200, 4)
+    layer_64 = KANLinear(4, 3).double()
+    layer_64.load_state_dict(layer.double().state_dict())
+    layer.float()
+
+    layer.update_grid(x)
+    layer_64.update_grid(x.double())
+
+    assert layer_64.grid.dtype == torch.float64
+    torch.testing.assert_close(layer_64.grid.float(), layer.grid)
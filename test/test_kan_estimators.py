@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+import torch
+from sklearn.base import clone
+from sklearn.datasets import make_classification, make_regression
+from sklearn.linear_model import LinearRegression
+
+from data_preprocessing.eda import classification_models, regression_models
+from machine_learning.kan_estimators import (
+    KANClassifier,
+    KANRegressor,
+    _BaseKAN,
+    benchmark_throughput,
+)
+
+
+@pytest.fixture
+def classification_data():
+    X, y = make_classification(
+        n_samples=600, n_features=6, n_informative=4, n_classes=3, random_state=0
+    )
+    return X, np.array(["a", "b", "c"])[y]
+
+
+def test_kan_classifier_learns_and_reports_throughput(classification_data):
+    X, y = classification_data
+
+    model = KANClassifier(hidden_layers=(8,), max_epochs=15, random_state=0)
+    model.fit(X[:500], y[:500])
+
+    assert model.score(X[500:], y[500:]) > 0.6
+    assert set(model.predict(X[:20])) <= {"a", "b", "c"}
+    np.testing.assert_allclose(model.predict_proba(X[:5]).sum(axis=1), 1, rtol=1e-5)
+    assert model.samples_per_second_ > 0
+    assert 1 <= model.best_epoch_ <= model.n_epochs_ <= 15
+
+
+def test_kan_regressor_learns_without_early_stopping():
+    X, y = make_regression(n_samples=600, n_features=5, noise=1.0, random_state=0)
+    y = y * 100 + 1000
+
+    model = KANRegressor(
+        hidden_layers=(8,),
+        max_epochs=20,
+        early_stopping=False,
+        grid_update_freq=5,
+        random_state=0,
+    )
+    model.fit(X[:500], y[:500])
+
+    assert model.n_epochs_ == 20
+    assert model.score(X[500:], y[500:]) > 0.8
+
+
+def test_kan_estimators_clone_and_restore_threads(classification_data):
+    X, y = classification_data
+    n_threads = torch.get_num_threads()
+
+    model = clone(KANClassifier(max_epochs=2, n_threads=1, hidden_layers=(4,)))
+    model.fit(X, y)
+
+    assert model.get_params()["hidden_layers"] == (4,)
+    assert torch.get_num_threads() == n_threads
+
+
+def test_model_factories_include_kan():
+    assert isinstance(
+        classification_models(include_kan=True)["KAN Classifier"], KANClassifier
+    )
+    assert isinstance(
+        regression_models(include_kan=True)["KAN Regressor"], KANRegressor
+    )
+    assert "KAN Classifier" not in classification_models()
+
+
+def test_benchmark_throughput_reports_samples_per_second():
+    X, y = make_regression(n_samples=300, n_features=4, random_state=0)
+    models = {
+        "Linear Regression": LinearRegression(),
+        "KAN Regressor": KANRegressor(max_epochs=2, hidden_layers=(4,)),
+    }
+
+    results = benchmark_throughput(models, X, y, X)
+
+    assert list(results["Model"]) == list(models)
+    assert (results["Predict Samples/s"] > 0).all()
+    assert results["Training Samples/s"].notna().tolist() == [False, True]
+
+
+def test_kan_classifier_bfloat16_precision(classification_data):
+    X, y = classification_data
+
+    model = KANClassifier(
+        hidden_layers=(8,), max_epochs=10, precision="bfloat16", random_state=0
+    )
+    model.fit(X[:500], y[:500])
+
+    assert model.score(X[500:], y[500:]) > 0.6
+    assert model.predict_proba(X[:5]).dtype == np.float32
+
+
+def test_base_estimator_is_abstract_and_zero_epochs_is_safe(classification_data):
+    with pytest.raises(TypeError):
+        _BaseKAN()
+
+    X, y = classification_data
+    model = KANClassifier(max_epochs=0).fit(X, y)
+    assert model.n_epochs_ == 0
+    assert model.samples_per_second_ == 0.0
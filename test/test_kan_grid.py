@@ -0,0 +1,83 @@
+import copy
+
+import torch
+
+from machine_learning.kan import KAN, KANLinear
+from machine_learning.kan_grid import QuantileSketch, Reservoir, StreamingGridUpdater
+
+
+def test_streaming_update_matches_update_grid_when_exact():
+    torch.manual_seed(0)
+    layer = KANLinear(5, 3)
+    x = torch.randn(900, 5) * 0.7
+    expected = copy.deepcopy(layer)
+    expected.update_grid(x)
+
+    updater = StreamingGridUpdater(layer, sketch_size=1000, reservoir_size=1000)
+    for batch in x.split(128):
+        updater.update(batch)
+    updater.apply()
+
+    torch.testing.assert_close(layer.grid, expected.grid)
+    torch.testing.assert_close(layer.spline_weight, expected.spline_weight)
+
+
+def test_quantile_sketch_approximates_quantiles():
+    torch.manual_seed(0)
+    x = torch.randn(100_000, 3) * torch.tensor([0.5, 1.0, 2.0])
+    sketch = QuantileSketch(3, size=1024)
+    for batch in x.split(2000):
+        sketch.add(batch)
+    q = torch.tensor([0.0, 0.1, 0.5, 0.9, 1.0])
+
+    estimate = sketch.quantiles(q)
+
+    torch.testing.assert_close(
+        estimate[[0, -1]], torch.stack([x.min(0)[0], x.max(0)[0]])
+    )
+    assert (estimate - torch.quantile(x, q, dim=0)).abs().max() < 0.05
+
+
+def test_quantile_sketch_merge_matches_single_sketch():
+    x = torch.randn(5000, 2)
+    merged, other, single = (
+        QuantileSketch(2, 256),
+        QuantileSketch(2, 256),
+        QuantileSketch(2, 256),
+    )
+    merged.add(x[:2500])
+    other.add(x[2500:])
+    single.add(x)
+
+    merged.merge(other)
+
+    q = torch.linspace(0, 1, 11)
+    assert merged.count == 5000
+    assert (merged.quantiles(q) - single.quantiles(q)).abs().max() < 0.1
+
+
+def test_reservoir_is_bounded_and_uniform():
+    reservoir = Reservoir(size=1000, seed=0)
+    for batch in torch.arange(100_000.0).unsqueeze(1).split(777):
+        reservoir.add(batch)
+
+    assert reservoir.rows.shape == (1000, 1)
+    assert reservoir.rows.unique().numel() == 1000
+    assert abs(reservoir.rows.mean().item() - 50_000) < 3000
+
+
+def test_update_grid_streaming_preserves_function():
+    torch.manual_seed(0)
+    model = KAN([4, 6, 2])
+    x = torch.randn(50_000, 4) * 0.5
+    with torch.no_grad():
+        before = model(x[:1000])
+
+    model.update_grid_streaming(
+        [(batch, None) for batch in x.split(4096)], reservoir_size=4000, seed=0
+    )
+
+    with torch.no_grad():
+        assert (model(x[:1000]) - before).abs().max() < 0.05
+    # The outer knots now follow the data range instead of the default [-1, 1]
+    assert model.layers[0].grid[:, 3].max() < -1.5
@@ -0,0 +1,91 @@
+import copy
+import pickle
+
+import pytest
+import torch
+
+from machine_learning.kan import KAN
+from machine_learning.kan_pruning import PrunedKANLinear
+
+
+@pytest.fixture
+def sparse_model():
+    torch.manual_seed(0)
+    model = KAN([8, 12, 2])
+    with torch.no_grad():
+        for layer in model.layers:
+            keep = (torch.rand(layer.out_features, layer.in_features) < 0.3).float()
+            layer.base_weight.mul_(keep)
+            layer.spline_weight.mul_(keep.unsqueeze(-1))
+        # Inputs 6 and 7 are unused
+        model.layers[0].base_weight[:, 6:] = 0
+        model.layers[0].spline_weight[:, 6:] = 0
+    return model
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_prune_removes_dead_edges_without_changing_output(sparse_model, sparse):
+    x = torch.rand(256, 8) * 2 - 1
+
+    pruned, report = sparse_model.prune(x, threshold=1e-6, sparse=sparse)
+
+    with torch.no_grad():
+        torch.testing.assert_close(pruned(x), sparse_model(x), atol=1e-5, rtol=1e-4)
+    assert all(isinstance(layer, PrunedKANLinear) for layer in pruned.layers)
+    assert report["parameters_after"] < report["parameters_before"]
+    assert report["flop_reduction"] > 1
+    assert report["speedup"] > 0
+    assert report["layers"][0]["shape_after"][0] <= 6
+    assert {layer["representation"] for layer in report["layers"]} == {
+        "sparse" if sparse else "dense"
+    }
+
+
+def test_prune_removes_neurons_without_outgoing_edges(sparse_model):
+    with torch.no_grad():
+        sparse_model.layers[1].base_weight[:, :4] = 0
+        sparse_model.layers[1].spline_weight[:, :4] = 0
+    x = torch.rand(256, 8) * 2 - 1
+
+    pruned, report = sparse_model.prune(x, threshold=1e-6, benchmark=False)
+
+    assert report["layers"][0]["shape_after"][1] <= 8
+    assert pruned.layers[0].out_features == pruned.layers[1].in_features
+    assert pruned.layers[-1].out_features == 2
+
+
+def test_prune_threshold_removing_everything_raises(sparse_model):
+    with pytest.raises(ValueError):
+        sparse_model.prune(torch.rand(64, 8), threshold=1e6)
+
+
+def test_pruned_model_is_inference_only(sparse_model):
+    x = torch.rand(256, 8) * 2 - 1
+    pruned, _ = sparse_model.prune(x, threshold=1e-6, sparse=True, benchmark=False)
+
+    assert not any(p.requires_grad for p in pruned.parameters())
+    with torch.no_grad():
+        expected = pruned(x)
+    pruned.set_chunking(max_memory_mb=0.01, batch_size=256)
+    assert pruned.layers[0].batch_chunk_size < 256
+    assert pruned.estimate_peak_memory(256) > 0
+    with torch.no_grad():
+        torch.testing.assert_close(pruned(x), expected)
+
+    with pytest.raises(RuntimeError, match="inference-only"):
+        pruned(x, update_grid=True)
+    with pytest.raises(RuntimeError, match="inference-only"):
+        pruned.quantize_dynamic()
+    with pytest.raises(TypeError, match="before pruning"):
+        pruned.compile_for_inference(x=x, benchmark=False)
+
+
+def test_sparse_pruned_model_can_be_copied(sparse_model):
+    x = torch.rand(64, 8) * 2 - 1
+    pruned, _ = sparse_model.prune(x, threshold=1e-6, sparse=True, benchmark=False)
+
+    restored = pickle.loads(pickle.dumps(copy.deepcopy(pruned)))
+
+    assert restored.layers[0].sparse
+    with torch.no_grad():
+        torch.testing.assert_close(restored(x), pruned(x))
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_classification, make_regression
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxruntime")
+
+from serving.model_server import MicroBatcher, load_pipeline
+from serving.onnx_export import (
+    OnnxPredictor,
+    benchmark_inference,
+    check_parity,
+    export_onnx,
+)
+
+
+@pytest.fixture
+def classification_data():
+    X, y = make_classification(n_samples=1000, n_features=8, random_state=0)
+    X = pd.DataFrame(X, columns=[f"f{i}" for i in range(8)])
+    return X.iloc[:800], X.iloc[800:], y[:800]
+
+
+@pytest.mark.parametrize(
+    "model",
+    [LogisticRegression(), RandomForestClassifier(n_estimators=20, random_state=0)],
+)
+def test_classifier_pipeline_parity(tmp_path, classification_data, model):
+    X_train, X_test, y_train = classification_data
+    native = Pipeline([("scaler", StandardScaler()), ("model", model)])
+    native.fit(X_train, y_train)
+
+    compiled = OnnxPredictor(export_onnx(native, 8, tmp_path / "model.onnx"))
+    report = check_parity(native, compiled, X_test)
+
+    assert report["passed"]
+    assert report["label_agreement"] == 1.0
+
+
+def test_xgboost_parity(tmp_path, classification_data):
+    pytest.importorskip("onnxmltools")
+    import xgboost as xgb
+
+    X_train, X_test, y_train = classification_data
+    native = xgb.XGBClassifier(n_estimators=20).fit(X_train, y_train)
+
+    compiled = OnnxPredictor(export_onnx(native, 8, tmp_path / "xgb.onnx"))
+
+    assert check_parity(native, compiled, X_test)["passed"]
+
+
+def test_regressor_parity_and_benchmark(tmp_path):
+    X, y = make_regression(n_samples=600, n_features=5, random_state=0)
+    native = Pipeline(
+        [("scaler", StandardScaler()), ("model", GradientBoostingRegressor())]
+    ).fit(X[:500], y[:500])
+
+    compiled = OnnxPredictor(export_onnx(native, 5, tmp_path / "gbr.onnx"))
+    assert check_parity(native, compiled, X[500:])["passed"]
+    with pytest.raises(AttributeError):
+        compiled.predict_proba(X[:2])
+
+    results_df = benchmark_inference(
+        {"native": native, "onnx": compiled}, X, batch_sizes=(1, 64), n_batches=5
+    )
+    assert len(results_df) == 4
+    assert (results_df["Throughput (rows/s)"] > 0).all()
+
+
+def test_onnx_file_served_by_batcher(tmp_path, classification_data):
+    X_train, X_test, y_train = classification_data
+    native = LogisticRegression().fit(X_train, y_train)
+    path = export_onnx(native, 8, tmp_path / "model.onnx")
+
+    with MicroBatcher(load_pipeline(path), max_latency_ms=1) as batcher:
+        assert batcher.submit(X_test.iloc[:5].to_numpy().tolist()) == list(
+            native.predict(X_test.iloc[:5])
+        )
@@ -0,0 +1,117 @@
+import pytest
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from serving.model_server import (
+    InvalidInstances,
+    MicroBatcher,
+    create_app,
+    load_pipeline,
+    save_pipeline,
+)
+
+
+@pytest.fixture
+def pipeline_path(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=4, random_state=0)
+    X = pd.DataFrame(X, columns=["a", "b", "c", "d"])
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression().fit(scaler.transform(X), y)
+    path = tmp_path / "model.joblib"
+    save_pipeline(model, path, scaler=scaler)
+    return path, X
+
+
+def test_micro_batches_match_direct_predictions(pipeline_path):
+    path, X = pipeline_path
+    pipeline = load_pipeline(path)
+    batcher = MicroBatcher(pipeline, max_batch_size=32, max_latency_ms=20)
+
+    rows = X.to_numpy().tolist()
+    with ThreadPoolExecutor(16) as executor:
+        predictions = list(executor.map(lambda row: batcher.submit([row])[0], rows))
+
+    assert predictions == pipeline.predict(X).tolist()
+    metrics = batcher.metrics()
+    assert metrics["requests"] == len(rows)
+    assert metrics["mean_batch_size"] > 1
+    assert metrics["p50_ms"] <= metrics["p99_ms"]
+    batcher.close()
+
+
+def test_app_endpoints(pipeline_path):
+    path, X = pipeline_path
+    app = create_app(path, max_latency_ms=1)
+    client = app.test_client()
+
+    response = client.post(
+        "/predict", json={"instances": X.iloc[:3].to_dict(orient="records")}
+    )
+    assert response.status_code == 200
+    assert len(response.get_json()["predictions"]) == 3
+
+    assert client.post("/predict", json={"instances": []}).status_code == 400
+    assert client.post("/predict", json={"instances": [[1.0]]}).status_code == 400
+    assert client.post("/predict", json={"rows": [[1.0]]}).status_code == 400
+    assert client.get("/metrics").get_json()["requests"] == 1
+    app.config["batcher"].close()
+
+
+def test_mixed_formats_and_bad_requests_do_not_fail_a_batch(pipeline_path):
+    path, X = pipeline_path
+    pipeline = load_pipeline(path)
+    first_batcher = batcher = MicroBatcher(
+        pipeline, max_batch_size=64, max_latency_ms=50
+    )
+    expected = pipeline.predict(X.iloc[:2]).tolist()
+    requests = [
+        X.iloc[:1].to_numpy().tolist(),
+        X.iloc[1:2].to_dict(orient="records"),
+    ] * 4
+
+    with ThreadPoolExecutor(8) as executor:
+        predictions = list(executor.map(batcher.submit, requests))
+    assert predictions == [expected[:1], expected[1:]] * 4
+
+    with pytest.raises(InvalidInstances):
+        batcher.submit([[1.0]])
+    with pytest.raises(InvalidInstances):
+        batcher.submit([{"a": 1.0}])
+
+    class FailsOnNaN:
+        feature_names_in_ = pipeline.feature_names_in_
+        n_features_in_ = 4
+
+        def predict(self, X):
+            if np.isnan(np.asarray(X)).any():
+                raise ValueError("NaN")
+            return pipeline.predict(X)
+
+    batcher = MicroBatcher(FailsOnNaN(), max_latency_ms=50)
+    with ThreadPoolExecutor(4) as executor:
+        futures = [
+            executor.submit(batcher.submit, [[np.nan] * 4]),
+            executor.submit(batcher.submit, X.iloc[:2].to_numpy().tolist()),
+            executor.submit(batcher.submit, X.iloc[:2].to_numpy().tolist()),
+        ]
+    with pytest.raises(ValueError):
+        futures[0].result()
+    assert [f.result() for f in futures[1:]] == [expected, expected]
+    assert batcher.metrics()["requests"] == 2
+    first_batcher.close()
+    batcher.close()
+
+
+def test_close_stops_the_worker(pipeline_path):
+    path, X = pipeline_path
+    with MicroBatcher(load_pipeline(path), max_latency_ms=1) as batcher:
+        assert len(batcher.submit(X.iloc[:2].to_numpy().tolist())) == 2
+
+    assert not batcher._worker.is_alive()
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(X.iloc[:2].to_numpy().tolist())
+    batcher.close()
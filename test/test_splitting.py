@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from data_preprocessing.eda import train_val_test_split
+from data_preprocessing.splitting import (
+    RowView,
+    fold_indices,
+    load_split_indices,
+    save_memmap,
+    save_split_indices,
+    split_indices,
+)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    y = pd.Series(rng.integers(0, 2, 200), name="target")
+    return X, y
+
+
+def test_train_val_test_split_matches_double_train_test_split(data):
+    X, y = data
+
+    X_train, X_val, X_test, y_train, y_val, y_test = train_val_test_split(X, y)
+
+    # The previous implementation: two train_test_split calls on X itself
+    X_train_val, X_test_ref, y_train_val, _ = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+    X_train_ref, X_val_ref, _, _ = train_test_split(
+        X_train_val, y_train_val, train_size=1 - 0.2 / 0.8, random_state=42
+    )
+    pd.testing.assert_frame_equal(X_train, X_train_ref)
+    pd.testing.assert_frame_equal(X_val, X_val_ref)
+    pd.testing.assert_frame_equal(X_test, X_test_ref)
+
+
+def test_split_indices_stratified_and_grouped(data):
+    X, y = data
+    groups = np.arange(len(X)) // 4
+
+    stratified = split_indices(y, test_size=0.25, val_size=0.25, stratify=y)
+    grouped = split_indices(len(X), test_size=0.25, val_size=0.25, groups=groups)
+
+    for splits in (stratified, grouped):
+        assert sorted(np.concatenate(list(splits.values()))) == list(range(len(X)))
+    assert abs(y.iloc[stratified["test"]].mean() - y.mean()) < 0.03
+    assert not set(groups[grouped["train"]]) & set(groups[grouped["test"]])
+    assert not set(groups[grouped["val"]]) & set(groups[grouped["test"]])
+
+
+def test_split_indices_stratified_by_group():
+    rng = np.random.default_rng(0)
+    groups = np.repeat(np.arange(100), 4)
+    # Labels are constant within a group and 20% positive
+    y = (rng.random(100) < 0.2).astype(int)[groups]
+
+    splits = split_indices(
+        len(y), test_size=0.2, val_size=0.2, stratify=y, groups=groups
+    )
+
+    assert sorted(np.concatenate(list(splits.values()))) == list(range(len(y)))
+    assert not set(groups[splits["train"]]) & set(groups[splits["test"]])
+    assert not set(groups[splits["train"]]) & set(groups[splits["val"]])
+    for subset in ("train", "val", "test"):
+        assert abs(y[splits[subset]].mean() - y.mean()) < 0.05
+    assert len(splits["test"]) == pytest.approx(0.2 * len(y), abs=8)
+
+
+def test_split_indices_round_trip(tmp_path, data):
+    X, y = data
+    splits = split_indices(X, val_size=0.2)
+    folds = fold_indices(y, n_splits=3, stratify=y, random_state=0)
+
+    save_split_indices(tmp_path / "splits.npz", splits)
+    save_split_indices(tmp_path / "folds.npz", folds)
+
+    loaded = load_split_indices(tmp_path / "splits.npz")
+    assert set(loaded) == {"train", "val", "test"}
+    np.testing.assert_array_equal(loaded["val"], splits["val"])
+    loaded_folds = load_split_indices(tmp_path / "folds.npz")
+    assert len(loaded_folds) == 3
+    np.testing.assert_array_equal(loaded_folds[2][1], folds[2][1])
+
+
+def test_row_view_is_lazy_and_fits(tmp_path, data):
+    X, y = data
+    X_mm = save_memmap(X, tmp_path / "X.npy")
+    splits = split_indices(X, random_state=0)
+
+    X_train = RowView(X_mm, splits["train"])
+    head = X_train[:10]
+
+    assert X_train.shape == (160, 3)
+    assert head.base is X_mm
+    np.testing.assert_array_equal(np.asarray(head), X.to_numpy()[splits["train"][:10]])
+    assert sum(len(b) for b in X_train.iter_batches(50)) == 160
+
+    model = LogisticRegression().fit(X_train, y.iloc[splits["train"]])
+    assert model.predict(RowView(X_mm, splits["test"])).shape == (40,)
@@ -0,0 +1,64 @@
+import numpy as np
+from scipy.spatial.distance import cdist
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from rag.scripts.retriever import TFIDFRetriever
+
+DOCS = [
+    "the cat sat on the mat",
+    "dogs and cats living together",
+    "a quick brown fox",
+    "the dog chased the cat",
+    "stock markets fell sharply",
+    "cats purr and dogs bark",
+]
+
+
+class Rows(list):
+    @property
+    def rows(self):
+        return self
+
+
+def make_data():
+    return Rows(
+        {"cleaned_content": text, "metadata": {"source": str(i)}}
+        for i, text in enumerate(DOCS)
+    )
+
+
+def test_sparse_scores_match_dense_cosine():
+    retriever = TFIDFRetriever(vectorizer=TfidfVectorizer())
+    retriever.index_data(make_data())
+    query = "cat and dog"
+    dense = (
+        1
+        - cdist(
+            retriever.vectorizer.transform([query]).toarray(),
+            retriever.index.toarray(),
+            metric="cosine",
+        )[0]
+    )
+    results = retriever.search(query, k=3)
+    assert [r["source"] for r in results] == [str(i) for i in np.argsort(-dense)[:3]]
+    np.testing.assert_allclose(
+        [r["score"] for r in results], np.sort(dense)[::-1][:3], rtol=1e-5
+    )
+
+
+def test_inverted_index_and_batches_agree_with_single_queries():
+    queries = ["cat and dog", "markets", "fox", "zebra"]
+    retriever = TFIDFRetriever(vectorizer=TfidfVectorizer())
+    retriever.index_data(make_data())
+    inverted = TFIDFRetriever(vectorizer=TfidfVectorizer(), use_inverted_index=True)
+    inverted.index_data(make_data())
+
+    batched = retriever.search_batch(queries, k=3, batch_size=3)
+    assert batched == [retriever.search(query, k=3) for query in queries]
+    for query, results in zip(queries, inverted.search_batch(queries, k=3)):
+        # The inverted index only returns documents that share a term with the query
+        matching = [r for r in retriever.search(query, k=3) if r["score"] > 0]
+        assert {r["source"]: round(r["score"], 5) for r in results} == {
+            r["source"]: round(r["score"], 5) for r in matching
+        }
+    assert inverted.search("zebra", k=3) == []
@@ -0,0 +1,85 @@
+import pytest
+import pandas as pd
+from sklearn.datasets import make_classification
+
+from data_preprocessing.eda import best_classification_models
+from data_preprocessing.tuning import _n_rungs, tune_model, tune_models
+
+
+@pytest.fixture
+def classification_data():
+    X, y = make_classification(n_samples=300, n_features=6, random_state=0)
+    return pd.DataFrame(X), pd.Series(y)
+
+
+def test_tune_model_successive_halving(classification_data):
+    X, y = classification_data
+
+    best_estimator, best_params, results_df = tune_model(
+        "Decision Tree", X, y, n_trials=9, eta=3, random_state=0, n_jobs=1
+    )
+
+    # 9 candidates -> 3 -> 1 over three rungs
+    assert list(results_df.groupby("Rung").size()) == [9, 3, 1]
+    assert set(best_params) == {"max_depth", "min_samples_leaf", "criterion"}
+    assert best_estimator.predict(X).shape == (len(X),)
+
+
+def test_tune_model_warm_start_grows_trees(classification_data):
+    X, y = classification_data
+
+    best_estimator, _, results_df = tune_model(
+        "Random Forest", X, y, n_trials=3, random_state=0, n_jobs=1
+    )
+
+    # Warm-startable ensembles are raced on the number of trees
+    assert results_df["Resource"].max() == 100
+    assert best_estimator.n_estimators == 100
+
+
+def test_tune_model_invalid_name(classification_data):
+    X, y = classification_data
+
+    with pytest.raises(ValueError, match="Unknown model"):
+        tune_model("Nonexistent", X, y)
+
+
+def test_tuned_params_feed_best_models(classification_data):
+    X, y = classification_data
+
+    tuned_params = tune_models(
+        X, y, models=["Logistic Regression"], n_trials=3, random_state=0, n_jobs=1
+    )
+    results_df = best_classification_models(
+        X, y, random_state=0, tuned_params=tuned_params
+    )
+
+    tuned = results_df.set_index("Model")["Tuned"]
+    assert tuned["Logistic Regression"]
+    assert not tuned["Decision Tree"]
+
+
+def test_unknown_tuned_params_name_raises(classification_data):
+    X, y = classification_data
+
+    with pytest.raises(ValueError, match="Logistic Regresion.*valid names"):
+        best_classification_models(
+            X, y, tuned_params={"Logistic Regresion": {"C": 0.5}}
+        )
+
+
+@pytest.mark.parametrize(
+    "n_candidates, eta, n_rungs",
+    [
+        (0, 3, 1),
+        (1, 3, 1),
+        (2, 3, 1),
+        (3, 3, 2),
+        (26, 3, 3),
+        (27, 3, 4),
+        (243, 3, 6),
+        (1000, 10, 4),
+    ],
+)
+def test_n_rungs_exact_at_powers_of_eta(n_candidates, eta, n_rungs):
+    assert _n_rungs(n_candidates, eta) == n_rungs
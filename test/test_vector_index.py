@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from scipy.spatial.distance import cdist
+
+from rag.scripts.retriever import DenseRetriever
+from rag.scripts.retrieval_benchmarks import clustered_vectors, recall_at_k
+from rag.scripts.vector_index import (
+    FlatIndex,
+    IVFIndex,
+    load_index,
+    make_index,
+    normalize,
+    top_k,
+)
+
+
+def test_flat_index_matches_cdist_ranking():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 16))
+    queries = rng.normal(size=(7, 16))
+    index = FlatIndex(vectors[:300], query_batch_size=3)
+    index.add(vectors[300:])
+    assert index.vectors.dtype == np.float32 and index.vectors.flags.c_contiguous
+    np.testing.assert_allclose(np.linalg.norm(index.vectors, axis=1), 1, rtol=1e-6)
+
+    ids, scores = index.search_batch(queries, k=10)
+    distances = cdist(queries, vectors, metric="cosine")
+    np.testing.assert_array_equal(ids, distances.argsort(axis=1)[:, :10])
+    np.testing.assert_allclose(
+        scores, 1 - np.take_along_axis(distances, ids, axis=1), atol=1e-5
+    )
+    single_ids, single_scores = index.search(queries[2], k=10)
+    np.testing.assert_array_equal(single_ids, ids[2])
+
+
+def test_top_k_edge_cases():
+    scores = np.array([[0.1, 0.9, 0.5]], dtype=np.float32)
+    assert top_k(scores, 10)[0].tolist() == [[1, 2, 0]]
+    assert top_k(scores, 0)[0].shape == (1, 0)
+    assert normalize([0.0, 0.0]).tolist() == [[0.0, 0.0]]
+    assert FlatIndex().search_batch([[1.0, 0.0]], k=3)[0].shape == (1, 0)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf", "hnsw"])
+def test_indexes_reach_high_recall_and_round_trip(index_type, tmp_path):
+    if index_type == "hnsw":
+        pytest.importorskip("hnswlib")
+    vectors = clustered_vectors(3000, 32, n_clusters=50)
+    queries = vectors[::75] + np.random.default_rng(1).normal(size=(40, 32)) * 0.1
+    exact_ids = FlatIndex(vectors).search_batch(queries, 10)[0]
+
+    index = make_index(index_type)
+    index.add(vectors[:2000])
+    index.add(vectors[2000:])
+    ids, scores = index.search_batch(queries, 10)
+    assert recall_at_k(ids, exact_ids) > 0.9
+    assert (np.diff(scores, axis=1) <= 1e-6).all()
+
+    index.save(str(tmp_path / "index"))
+    loaded = load_index(str(tmp_path / "index"), mmap=True)
+    assert type(loaded) is type(index) and len(loaded) == 3000
+    np.testing.assert_array_equal(loaded.search_batch(queries, 10)[0], ids)
+
+
+def test_ivf_n_probe_trades_recall():
+    vectors = clustered_vectors(4000, 16, n_clusters=200, noise=2.0)
+    queries = vectors[::80] + np.random.default_rng(1).normal(size=(50, 16)) * 0.3
+    exact_ids = FlatIndex(vectors).search_batch(queries, 10)[0]
+    index = IVFIndex(n_lists=64, n_probe=1)
+    index.add(vectors)
+    low = recall_at_k(index.search_batch(queries, 10)[0], exact_ids)
+    index.n_probe = 64
+    assert low < recall_at_k(index.search_batch(queries, 10)[0], exact_ids) == 1.0
+
+
+class Rows(list):
+    """A list of documents with the .rows accessor of a weave Dataset."""
+
+    @property
+    def rows(self):
+        return self
+
+
+def test_dense_retriever_search_batch():
+    def vectorizer(texts, input_type="search_document"):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    docs = ["a", "abcd", "abcdefgh"]
+    retriever = DenseRetriever(vectorizer=vectorizer)
+    retriever.index_data(
+        Rows({"cleaned_content": d, "metadata": {"source": d}} for d in docs)
+    )
+    results = retriever.search_batch(["abcdefghij", "a"], k=2)
+    assert [r["source"] for r in results[0]] == ["abcdefgh", "abcd"]
+    assert results[1][0]["source"] == "a"
+    assert results[0][0]["score"] > results[0][1]["score"]
+
+
+def test_dense_retriever_with_ivf_index_saves_and_loads(tmp_path):
+    def vectorizer(texts, input_type="search_document"):
+        return [[float(len(text)), 1.0, float(text.count("b"))] for text in texts]
+
+    docs = Rows(
+        {"cleaned_content": "ab" * i, "metadata": {"source": str(i)}} for i in range(50)
+    )
+    retriever = DenseRetriever(
+        vectorizer=vectorizer, index_type="ivf", index_params={"n_probe": 4}
+    )
+    retriever.index_data(docs)
+    expected = retriever.search("abab", k=3)
+    retriever.save_index(str(tmp_path / "dense"))
+
+    restored = DenseRetriever(vectorizer=vectorizer)
+    restored.load_index(str(tmp_path / "dense"), docs)
+    assert restored.index_type == "ivf"
+    assert restored.search("abab", k=3) == expected
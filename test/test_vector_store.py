@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from rag.scripts.retriever import DenseRetriever
+from rag.scripts.vector_index import FlatIndex
+from rag.scripts.vector_store import VectorStore
+
+
+def test_add_delete_compact_match_exact_search(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(300, 8))
+    queries = rng.normal(size=(5, 8))
+    store = VectorStore(str(tmp_path / "store"))
+    for start in range(0, 300, 100):
+        store.add(
+            vectors[start : start + 100],
+            [{"row": i} for i in range(start, start + 100)],
+        )
+    assert len(store.segments) == 3 and len(store) == 300
+
+    deleted = np.arange(0, 300, 3)
+    store.delete(deleted)
+    live = np.setdiff1d(np.arange(300), deleted)
+    expected = live[FlatIndex(vectors[live]).search_batch(queries, 10)[0]]
+    np.testing.assert_array_equal(store.search_batch(queries, 10)[0], expected)
+    assert store.get_metadata([0, 1]) == [None, {"row": 1}]
+
+    store.compact()
+    assert len(store.segments) == 1 and len(store) == 200
+    np.testing.assert_array_equal(store.search_batch(queries, 10)[0], expected)
+    files = sorted(p.name for p in (tmp_path / "store").iterdir())
+    assert len(files) == 5 and files[0] == "manifest.json"  # one segment, no tombstones
+
+
+def test_read_only_reader_shares_files_and_follows_writer(tmp_path):
+    path = str(tmp_path / "store")
+    writer = VectorStore(path)
+    writer.add(np.eye(4)[:2], [{"name": "x"}, {"name": "y"}])
+    reader = VectorStore(path, read_only=True)
+    assert isinstance(reader.segments[0].vectors, np.memmap)
+    with pytest.raises(PermissionError):
+        reader.add(np.eye(4))
+
+    writer.add(np.eye(4)[2:], [{"name": "z"}, {"name": "w"}])
+    writer.delete([0])
+    thread = writer.compact_in_background()
+    writer.add(np.ones((1, 4)), [{"name": "ones"}])
+    thread.join()
+    reader.refresh()
+    assert len(reader) == 4
+    assert reader.search([0, 0, 1, 0], k=1)[0].tolist() == [2]
+    assert reader.get_metadata([4, 0]) == [{"name": "ones"}, None]
+    assert reader.search([1, 0, 0, 0], k=10)[0].tolist().count(-1) == 6
+
+
+class Rows(list):
+    @property
+    def rows(self):
+        return self
+
+
+def test_dense_retriever_store_survives_restart_without_embedding(tmp_path):
+    calls = []
+
+    def vectorizer(texts, input_type="search_document"):
+        calls.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    docs = Rows(
+        {"cleaned_content": "a" * n, "metadata": {"source": f"doc{n}"}}
+        for n in range(1, 6)
+    )
+    retriever = DenseRetriever(vectorizer=vectorizer)
+    retriever.open_store(str(tmp_path / "dense"))
+    retriever.index_data(docs)
+    ids = retriever.add_documents(
+        [{"cleaned_content": "a" * 40, "metadata": {"source": "long"}}]
+    )
+    retriever.delete_documents(ids)
+
+    restarted = DenseRetriever(vectorizer=vectorizer)
+    restarted.open_store(str(tmp_path / "dense"), read_only=True)
+    calls.clear()
+    results = restarted.search("a" * 30, k=2)
+    assert calls == [1]  # only the query is embedded
+    assert [r["source"] for r in results] == ["doc5", "doc4"]
+    assert results[0]["text"] == "aaaaa" and 0 < results[0]["score"] <= 1